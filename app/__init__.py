@@ -1,5 +1,6 @@
 from flask import Flask, session
 from dotenv import load_dotenv
+import logging
 import os
 
 # .env 파일 로드
@@ -12,9 +13,28 @@ def create_app():
     app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'fallback-secret-key')
     app.config['PERMANENT_SESSION_LIFETIME'] = 1800  # 30분 (초 단위)
     
+    # 앱 로거 (app.logger = 'app', 하위 모듈은 logging.getLogger(__name__)로 같은 핸들러를 사용)
+    if app.logger.level == logging.NOTSET:
+        app.logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO').upper())
+    
     # 라우트 등록
     from app import routes
     
+    # 요청 계측 (Server-Timing, /metrics, 요청별 샘플링 프로파일러)
+    from app import metrics
+    metrics.init_app(app)
+    
+    # 기존 DB에 이후 추가된 테이블/컬럼 반영 (여러 번 실행해도 안전)
+    from app import db
+    db.ensure_schema()
+    
+    # 렌더링 결과 캐시 (데이터 변경 시 무효화 리스너 등록)
+    from app import output_cache
+    
+    # 오래된 기업 데이터 백그라운드 갱신 (REFRESHER_ENABLED, 진행 상황은 /metrics)
+    from app import refresher
+    refresher.init_app(app)
+    
     # 기업 코드 캐시 초기화 (백그라운드에서 로드)
     from app.cache import init_cache
     init_cache()
@@ -3,68 +3,213 @@ DART API 관련 서비스 모듈
 기업 코드 조회, 재무제표 데이터 조회 등의 API 호출 담당
 """
 import requests
-import xml.etree.ElementTree as ET
 import zipfile
 import io
+import json
 import os
-import pandas as pd
+import threading
+import time
+from contextlib import contextmanager
 from dotenv import load_dotenv
 from pathlib import Path
-from datetime import datetime
-
-# .env 파일 로드
-base_dir = Path(__file__).parent.parent
-env_paths = [
-    base_dir / '.env',
-    Path.cwd() / '.env',
-    Path('.env')
-]
+from datetime import datetime, timedelta
+from app import corp_directory, metrics
 
-env_loaded = False
-for env_path in env_paths:
-    if env_path.exists():
-        load_dotenv(dotenv_path=env_path, override=True)
-        env_loaded = True
-        break
+# 환경변수 (import 시점이 아닌 첫 DART 호출 때 _load_config()에서 .env를 읽어 채움)
+API_KEY = None
+BASE_URL = None
+_config_loaded = False
 
-if not env_loaded:
-    load_dotenv(override=True)
 
-# 환경변수 로드
-API_KEY = os.environ.get('API_KEY', '').strip()
-BASE_URL = os.environ.get('BASE_URL', 'https://opendart.fss.or.kr/api').strip()
+def _load_config():
+    """
+    .env 파일을 찾아 API_KEY, BASE_URL을 설정합니다. (처음 한 번만)
+    이미 값이 지정되어 있으면(벤치마크 등에서 직접 설정) 덮어쓰지 않습니다.
+    """
+    global API_KEY, BASE_URL, _config_loaded
+    if _config_loaded:
+        return
+    
+    base_dir = Path(__file__).parent.parent
+    env_paths = [
+        base_dir / '.env',
+        Path.cwd() / '.env',
+        Path('.env')
+    ]
+    
+    env_loaded = False
+    for env_path in env_paths:
+        if env_path.exists():
+            load_dotenv(dotenv_path=env_path, override=True)
+            env_loaded = True
+            break
+    
+    if not env_loaded:
+        load_dotenv(override=True)
+    
+    if API_KEY is None:
+        API_KEY = os.environ.get('API_KEY', '').strip()
+    if BASE_URL is None:
+        BASE_URL = os.environ.get('BASE_URL', 'https://opendart.fss.or.kr/api').strip()
+    _config_loaded = True
+
 
 # 기업 코드 캐시 (메모리 캐싱)
-_corp_code_cache = {}
-_corp_list_cache = []
-_cache_loaded = False
+# 현재 기업 코드 목록 (CorpDirectory, 갱신 시 새 객체로 참조만 교체하며 조회는 잠금 없이 읽음)
+_directory = None
+# 마지막 갱신에서 바뀐 기업 (corp_directory.diff_directories 결과)
+_last_diff = None
+
+# 캐시 상태
+#   loading: 아직 사용할 수 있는 목록이 없음 (첫 로딩 중)
+#   ready  : DART에서 받은 최신 목록 사용 중
+#   stale  : 디스크 스냅샷 또는 오래된 목록 사용 중 (DART 갱신 중이거나 갱신 실패)
+#   failed : DART 로딩이 실패했고 대신 쓸 목록도 없음
+CACHE_LOADING = 'loading'
+CACHE_READY = 'ready'
+CACHE_STALE = 'stale'
+CACHE_FAILED = 'failed'
+
+# DART 목록을 받을 때마다 저장하는 디스크 스냅샷 (재시작 직후 DART 응답 전까지 사용)
+SNAPSHOT_PATH = os.environ.get(
+    'CORP_CODE_SNAPSHOT',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'instance', 'corp_codes.json')
+)
+# 이 시간(초)이 지난 목록은 stale로 보고
+CACHE_MAX_AGE = float(os.environ.get('CORP_CODE_MAX_AGE', 24 * 3600))
+
+_cache_state = CACHE_LOADING
+_cache_error = None
+# 스냅샷 설치와 DART 목록 설치가 서로 덮어쓰지 않도록 하는 잠금 (조회에는 사용하지 않음)
+_cache_lock = threading.Lock()
+
+
+def get_directory():
+    """현재 기업 코드 목록(CorpDirectory)을 반환합니다. 아직 없으면 None"""
+    return _directory
+
+
+def get_last_diff():
+    """마지막 갱신에서 바뀐 기업 목록을 반환합니다. (corp_directory.diff_directories 결과, 없으면 None)"""
+    return _last_diff
+
+
+def get_directory_changes(limit=100):
+    """마지막 갱신에서 바뀐 기업 목록을 API 응답 형식으로 반환합니다. (갱신 전이면 None)"""
+    diff = _last_diff
+    if diff is None:
+        return None
+    return corp_directory.diff_to_json(diff, limit)
+
+
+def _install_directory(directory):
+    """새 기업 코드 목록을 참조 하나로 교체합니다. 이전 목록과의 차이를 기록합니다."""
+    global _directory, _last_diff, _cache_state, _cache_error
+    
+    previous = _directory
+    if previous is not None:
+        _last_diff = corp_directory.diff_directories(previous, directory)
+    _directory = directory
+    _cache_error = None
+    _cache_state = CACHE_READY if directory.source == 'dart' else CACHE_STALE
+    return previous
+
+
+def _mark_failed(message):
+    """DART 로딩 실패를 기록합니다. 이미 쓰고 있는 목록이 있으면 stale로 두고 계속 사용합니다."""
+    global _cache_state, _cache_error
+    _cache_error = message
+    _cache_state = CACHE_STALE if _directory is not None else CACHE_FAILED
+
+
+def _save_snapshot(directory):
+    """기업 목록을 디스크 스냅샷으로 저장합니다. (임시 파일에 쓴 뒤 교체)"""
+    try:
+        os.makedirs(os.path.dirname(SNAPSHOT_PATH) or '.', exist_ok=True)
+        temp_path = f"{SNAPSHOT_PATH}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(directory.to_snapshot(directory.loaded_at), f, ensure_ascii=False)
+        os.replace(temp_path, SNAPSHOT_PATH)
+    except OSError as e:
+        print(f"경고: 기업 코드 스냅샷 저장 실패: {e}")
+
+
+def load_snapshot():
+    """
+    아직 사용할 목록이 없으면 디스크 스냅샷을 읽어 stale 상태로 사용합니다.
+    
+    Returns:
+        bool: 스냅샷을 읽었는지 여부
+    """
+    if _directory is not None:
+        return False
+    
+    with _cache_lock:
+        if _directory is not None:
+            return False
+        try:
+            with open(SNAPSHOT_PATH, encoding='utf-8') as f:
+                directory = corp_directory.CorpDirectory.from_snapshot(json.load(f))
+        except (OSError, ValueError, TypeError) as e:
+            if not isinstance(e, FileNotFoundError):
+                print(f"경고: 기업 코드 스냅샷을 읽을 수 없습니다: {e}")
+            return False
+        _install_directory(directory)
+    
+    print(f"기업 코드 스냅샷 사용: {len(directory)}개 기업 (DART 갱신 전까지 stale)")
+    return True
+
+
+def get_cache_status():
+    """
+    기업 코드 캐시 상태를 반환합니다. (/readyz 등에서 사용)
+    
+    Returns:
+        dict: {'state', 'ready'(조회 가능 여부), 'source', 'count', 'listed'(상장 기업 수), 'age'(초), 'error',
+               'changes'(마지막 갱신의 항목별 변경 수)}
+    """
+    directory = _directory
+    state = _cache_state
+    age = time.time() - directory.loaded_at if directory is not None and directory.loaded_at else None
+    if state == CACHE_READY and age is not None and age > CACHE_MAX_AGE:
+        state = CACHE_STALE
+    return {
+        'state': state,
+        'ready': state in (CACHE_READY, CACHE_STALE),
+        'source': directory.source if directory is not None else None,
+        'count': len(directory) if directory is not None else 0,
+        'listed': len(directory.listed) if directory is not None else 0,
+        'age': round(age, 1) if age is not None else None,
+        'error': _cache_error,
+        'changes': corp_directory.summarize_diff(_last_diff) if _last_diff is not None else None,
+    }
 
 
 def load_corp_code_cache():
     """
     DART API에서 전체 기업 코드 목록을 다운로드하여 메모리에 캐싱합니다.
-    Flask 앱 시작 시 백그라운드에서 호출됩니다.
+    Flask 앱 시작 시 백그라운드에서 호출되고, 이후 cache 모듈의 스케줄에 따라 다시 호출됩니다.
+    새 목록을 따로 다 만든 뒤 참조만 교체하므로 갱신 중이나 실패 시에도 이전 목록(또는 스냅샷)으로 계속 조회할 수 있습니다.
     """
-    global _corp_code_cache, _corp_list_cache, _cache_loaded
-    
+    _load_config()
     if not API_KEY:
         print("경고: API_KEY가 설정되지 않아 기업 코드 캐시를 로드할 수 없습니다.")
+        _mark_failed("API_KEY가 설정되지 않았습니다.")
         return False
     
     try:
         print("기업 코드 캐시 로딩 시작...")
         url = f'{BASE_URL}/corpCode.xml?crtfc_key={API_KEY}'
         
-        response = requests.get(url, timeout=60)
+        with metrics.span('dart.corpCode'):
+            response = requests.get(url, timeout=60)
         response.raise_for_status()
         
         if not response.content.startswith(b'PK'):
             print("경고: 다운로드한 파일이 ZIP 형식이 아닙니다.")
+            _mark_failed("다운로드한 파일이 ZIP 형식이 아닙니다.")
             return False
         
-        _corp_code_cache = {}
-        _corp_list_cache = []
-        
         with zipfile.ZipFile(io.BytesIO(response.content)) as z:
             xml_file = None
             for fname in z.namelist():
@@ -74,98 +219,207 @@ def load_corp_code_cache():
             
             if not xml_file:
                 print("경고: ZIP 파일에 CORPCODE.xml이 없습니다.")
+                _mark_failed("ZIP 파일에 CORPCODE.xml이 없습니다.")
                 return False
             
             with z.open(xml_file) as f:
-                tree = ET.parse(f)
-                root = tree.getroot()
-                
-                for child in root:
-                    corp_name_elem = child.find('corp_name')
-                    corp_code_elem = child.find('corp_code')
-                    
-                    if corp_name_elem is not None and corp_code_elem is not None:
-                        corp_name = corp_name_elem.text
-                        corp_code = corp_code_elem.text
-                        
-                        if corp_name and corp_code:
-                            _corp_code_cache[corp_name] = corp_code
-                            _corp_list_cache.append({
-                                'corp_name': corp_name,
-                                'corp_code': corp_code
-                            })
+                directory = corp_directory.CorpDirectory.from_xml(f, 'dart', time.time())
         
-        _cache_loaded = True
-        print(f"기업 코드 캐시 로딩 완료: {len(_corp_list_cache)}개 기업")
+        with _cache_lock:
+            previous = _install_directory(directory)
+        _save_snapshot(directory)
+        print(f"기업 코드 캐시 로딩 완료: {len(directory)}개 기업")
+        if previous is not None:
+            counts = corp_directory.summarize_diff(_last_diff)
+            print(f"기업 코드 목록 변경: 추가 {counts['added']}, 삭제 {counts['removed']}, 이름 변경 {counts['renamed']}, "
+                  f"상장폐지 {counts['delisted']}, 신규 상장 {counts['listed']}")
         return True
         
     except Exception as e:
         print(f"기업 코드 캐시 로딩 실패: {str(e)}")
+        _mark_failed(str(e))
         return False
 
 
 def get_corp_code(corp_name):
     """
     기업 이름으로 DART 기업 코드를 조회합니다.
+    기업코드, 종목코드, 영문명으로도 찾을 수 있고, 이름은 공백과 (주) 같은 표기를 무시하고 비교합니다.
+    같은 이름의 기업이 여러 개면 상장 기업, 최근 변경된 기업 순으로 하나를 고릅니다. (모두 보려면 find_corps)
+    캐시가 아직 준비되지 않았으면 디스크 스냅샷, 저장된 기업 목록(DB) 순서로 찾습니다.
     
     Args:
-        corp_name (str): 검색할 기업 이름
+        corp_name (str): 검색할 기업 이름 (또는 기업코드, 종목코드, 영문명)
         
     Returns:
         str: 기업 코드 (corp_code), 찾지 못한 경우 None
     """
-    if _cache_loaded and corp_name in _corp_code_cache:
-        return _corp_code_cache[corp_name]
+    if _directory is None:
+        load_snapshot()
+    
+    directory = _directory
+    if directory is not None:
+        return directory.get_code(corp_name)
+    
+    from app import db
+    corp_code = db.find_corp_code(corp_name)
+    if corp_code:
+        return corp_code
+    
+    raise Exception(
+        "기업 코드 캐시가 아직 로드되지 않았습니다. "
+        "잠시 후 다시 시도해주세요. (서버 시작 중일 수 있습니다)"
+    )
+
+
+def get_canonical_corp_name(corp_code, default=None):
+    """
+    기업 코드에 해당하는 DART 등록 기업 이름을 반환합니다.
+    저장하는 행에는 사용자가 입력한 문자열(기업코드, 종목코드, 영문명 등) 대신 이 이름을 씁니다.
     
-    if not _cache_loaded:
-        raise Exception(
-            "기업 코드 캐시가 아직 로드되지 않았습니다. "
-            "잠시 후 다시 시도해주세요. (서버 시작 중일 수 있습니다)"
-        )
+    Returns:
+        str: 기업 이름 (캐시가 없거나 목록에 없으면 default)
+    """
+    directory = _directory
+    corp = directory.by_code.get(corp_code) if directory is not None else None
+    return corp.corp_name if corp is not None else default
+
+
+def find_corps(query):
+    """
+    기업코드, 종목코드, 기업명, 영문명이 정확히 일치하는 기업을 모두 조회합니다. (같은 이름의 기업 구분용)
     
-    return None
+    Args:
+        query (str): 기업코드, 종목코드, 기업명 또는 영문명
+        
+    Returns:
+        list: [{'corp_code', 'corp_name', 'corp_eng_name', 'stock_code', 'modify_date'}, ...]
+              (캐시가 준비되지 않았으면 빈 리스트)
+    """
+    if _directory is None:
+        load_snapshot()
+    
+    directory = _directory
+    if directory is None:
+        return []
+    
+    return [corp._asdict() for corp in directory.find(query)]
 
 
-def search_corps(search_term, limit=50):
+def search_corps(search_term, limit=50, listed_only=False):
     """
     검색어가 포함된 기업 목록을 조회합니다.
     
     Args:
         search_term (str): 검색할 기업 이름 (부분 일치)
         limit (int): 최대 반환 개수 (기본값: 50)
+        listed_only (bool): 상장 기업만 조회할지 여부
         
     Returns:
-        list: 기업 정보 리스트 [{'corp_name': '기업명', 'corp_code': '기업코드'}, ...]
+        list: 기업 정보 리스트 [{'corp_name': '기업명', 'corp_code': '기업코드', 'stock_code': '종목코드'}, ...]
+              (캐시가 준비되지 않았으면 빈 리스트, get_cache_status()로 상태 확인)
     """
     if not search_term or len(search_term.strip()) < 1:
         return []
     
-    if not _cache_loaded:
+    if _directory is None:
+        load_snapshot()
+    
+    directory = _directory
+    if directory is None:
         return []
     
-    search_term = search_term.strip().lower()
-    results = []
+    return directory.search(search_term.strip().lower(), limit, listed_only)
+
+
+# 보고서 기간 -> DART 보고서 코드 (사업보고서, 반기보고서, 1분기보고서, 3분기보고서)
+REPORT_CODES = {'FY': '11011', 'H1': '11012', 'Q1': '11013', 'Q3': '11014'}
+# 연결재무제표(CFS), 별도재무제표(OFS)
+FS_DIVS = ('CFS', 'OFS')
+# 재무제표 구분: 재무상태표, 손익계산서, 포괄손익계산서, 현금흐름표, 자본변동표
+SJ_DIVS = ('BS', 'IS', 'CIS', 'CF', 'SCE')
+# 사업보고서 재무상태표를 보관하는 연도 수, 사업보고서가 당기와 함께 다시 싣는 이전 연도 수 (전기, 전전기)
+FINANCE_YEARS = 10
+RESTATED_YEARS = 2
+# 공시 상세 유형 (list.json의 pblntf_detail_ty): 사업보고서, 반기보고서, 분기보고서
+FILING_TYPES = {'FY': 'A001', 'H1': 'A002', 'Q': 'A003'}
+# 기업 코드 없이 공시 목록을 조회할 때 DART가 허용하는 최대 기간 (3개월)
+FILING_WINDOW_DAYS = 90
+
+
+class RateLimiter:
+    """
+    분당 요청 수를 제한하는 토큰 버킷 (여러 스레드에서 공유 가능)
+    DART 인증키별 호출 한도를 백그라운드 작업이 다 쓰지 않도록, 작업별로 만들어 rate_limited()로 적용합니다.
+    """
     
-    for corp in _corp_list_cache:
-        if search_term in corp['corp_name'].lower():
-            results.append(corp)
-            if len(results) >= limit:
-                break
+    def __init__(self, per_minute, burst=None):
+        self.per_minute = float(per_minute)
+        self.burst = float(burst if burst is not None else max(1.0, min(self.per_minute, 10.0)))
+        self.requests = 0
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """요청 하나를 보낼 수 있을 때까지 기다립니다. (per_minute가 0 이하면 제한 없음)"""
+        while True:
+            with self._lock:
+                if self.per_minute <= 0:
+                    self.requests += 1
+                    return
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.per_minute / 60)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    self.requests += 1
+                    return
+                wait = (1 - self._tokens) * 60 / self.per_minute
+            time.sleep(wait)
+
+
+# 현재 스레드의 DART 요청에 적용할 RateLimiter (rate_limited()로 지정)
+_rate_limit = threading.local()
+
+
+@contextmanager
+def rate_limited(limiter):
+    """
+    이 블록 안에서 현재 스레드가 보내는 DART 요청을 limiter로 제한합니다.
     
-    return results
+        with api_service.rate_limited(RateLimiter(100)):
+            get_finance_dataframe_10years(...)
+    """
+    previous = getattr(_rate_limit, 'limiter', None)
+    _rate_limit.limiter = limiter
+    try:
+        yield limiter
+    finally:
+        _rate_limit.limiter = previous
 
 
-def get_finance_data(corp_code, bsns_year='2024'):
+def _acquire_rate_limit():
+    limiter = getattr(_rate_limit, 'limiter', None)
+    if limiter is not None:
+        limiter.acquire()
+
+
+def get_finance_data(corp_code, bsns_year='2024', reprt_code='11011', fs_div='CFS'):
     """
     기업 코드를 이용하여 재무제표 데이터를 조회합니다.
+    응답에는 모든 재무제표 구분(sj_div)이 함께 들어 있으므로 필요한 구분은 받은 뒤 거릅니다.
     
     Args:
         corp_code (str): 기업 코드
         bsns_year (str): 사업년도 (기본값: '2024')
+        reprt_code (str): 보고서 코드 (기본값: '11011' 사업보고서, REPORT_CODES 참고)
+        fs_div (str): 'CFS' 연결재무제표 또는 'OFS' 별도재무제표
         
     Returns:
         dict: 재무제표 데이터 (JSON 응답)
     """
+    _load_config()
     if not API_KEY:
         raise ValueError("API_KEY 환경변수가 설정되지 않았습니다.")
     
@@ -178,13 +432,14 @@ def get_finance_data(corp_code, bsns_year='2024'):
         'crtfc_key': API_KEY,
         'corp_code': corp_code,
         'bsns_year': str(bsns_year),
-        'reprt_code': '11011',  # 사업보고서
-        'fs_div': 'CFS',  # 연결재무제표
-        'sj_div': 'BS'  # 재무상태표만 조회
+        'reprt_code': reprt_code,
+        'fs_div': fs_div
     }
     
+    _acquire_rate_limit()
     try:
-        response = requests.get(url, params=params, timeout=30)
+        with metrics.span('dart.fnlttSinglAcntAll'):
+            response = requests.get(url, params=params, timeout=30)
         response.raise_for_status()
         
         data = response.json()
@@ -201,6 +456,81 @@ def get_finance_data(corp_code, bsns_year='2024'):
         raise Exception(f"JSON 파싱 중 오류 발생: {str(e)}")
 
 
+def get_disclosure_list(bgn_de, end_de, pblntf_detail_ty='A001', page_no=1, page_count=100):
+    """
+    공시검색(list.json)으로 기간 안에 접수된 공시 목록 한 페이지를 조회합니다.
+    
+    Args:
+        bgn_de (str): 시작 접수일자 (YYYYMMDD)
+        end_de (str): 종료 접수일자 (YYYYMMDD, 기업 코드 없이 조회하면 시작일로부터 3개월 이내)
+        pblntf_detail_ty (str): 공시 상세 유형 (FILING_TYPES 참고, 기본값: 사업보고서)
+        page_no (int): 페이지 번호
+        page_count (int): 페이지당 건수 (최대 100)
+        
+    Returns:
+        dict: DART 응답 (list, total_page 등, 조회된 공시가 없으면 빈 list)
+    """
+    _load_config()
+    if not API_KEY:
+        raise ValueError("API_KEY 환경변수가 설정되지 않았습니다.")
+    
+    params = {
+        'crtfc_key': API_KEY,
+        'bgn_de': bgn_de,
+        'end_de': end_de,
+        'pblntf_detail_ty': pblntf_detail_ty,
+        'sort': 'date',
+        'sort_mth': 'asc',
+        'page_no': page_no,
+        'page_count': page_count,
+    }
+    
+    _acquire_rate_limit()
+    try:
+        with metrics.span('dart.list'):
+            response = requests.get(f'{BASE_URL}/list.json', params=params, timeout=30)
+        response.raise_for_status()
+        data = response.json()
+    except requests.exceptions.RequestException as e:
+        raise Exception(f"공시 목록 조회 중 오류 발생: {str(e)}")
+    except ValueError as e:
+        raise Exception(f"JSON 파싱 중 오류 발생: {str(e)}")
+    
+    if data.get('status') == '013':
+        return {'status': '013', 'list': [], 'total_page': 0}
+    if data.get('status') != '000':
+        raise Exception(f"DART API 오류: {data.get('message', '알 수 없는 오류')}")
+    return data
+
+
+def get_filings(bgn_de, end_de, pblntf_detail_ty='A001'):
+    """
+    기간 안의 공시를 모두 조회합니다. DART 기간 제한에 맞춰 FILING_WINDOW_DAYS씩 나누고 모든 페이지를 읽습니다.
+    
+    Args:
+        bgn_de (str): 시작 접수일자 (YYYYMMDD)
+        end_de (str): 종료 접수일자 (YYYYMMDD)
+        
+    Returns:
+        list: 공시 목록 (corp_code, corp_name, report_nm, rcept_no, rcept_dt 등, 접수 순)
+    """
+    start = datetime.strptime(bgn_de, '%Y%m%d')
+    end = datetime.strptime(end_de, '%Y%m%d')
+    filings = []
+    while start <= end:
+        window_end = min(end, start + timedelta(days=FILING_WINDOW_DAYS - 1))
+        page_no = 1
+        while True:
+            data = get_disclosure_list(start.strftime('%Y%m%d'), window_end.strftime('%Y%m%d'),
+                                       pblntf_detail_ty, page_no)
+            filings.extend(data.get('list') or [])
+            if page_no >= int(data.get('total_page') or 0):
+                break
+            page_no += 1
+        start = window_end + timedelta(days=1)
+    return filings
+
+
 def get_finance_dataframe(corp_name):
     """
     기업 이름을 입력받아 재무제표 데이터를 조회하고 DataFrame으로 반환합니다.
@@ -211,6 +541,7 @@ def get_finance_dataframe(corp_name):
     Returns:
         pd.DataFrame: 추출된 재무제표 데이터
     """
+    import pandas as pd
     if not corp_name:
         raise ValueError("기업 이름이 제공되지 않았습니다.")
     
@@ -244,30 +575,42 @@ def get_finance_dataframe(corp_name):
     return df
 
 
-def get_finance_dataframe_10years(corp_name):
+def get_finance_dataframe_10years(corp_name, after_year=None, corp_code=None, bsns_year=None):
     """
     기업 이름을 입력받아 최근 10년치 재무제표 데이터를 조회하고 DataFrame으로 반환합니다.
+    after_year를 주면 그 이후 연도와, 가장 최근 사업보고서에 전기/전전기 금액으로 다시 실린 연도만 조회합니다.
+    (증분 동기화, 보통 요청 1회, 이전 연도의 정정 금액도 함께 반영)
     
     Args:
         corp_name (str): 기업 이름
+        after_year (int): DB에 저장된 최근 연도 (None이면 10년치 전체)
+        corp_code (str): 기업 코드 (이미 알고 있으면 이름으로 다시 찾지 않음)
+        bsns_year (int): 가장 최근 사업연도 (공시 목록에서 제출된 사업보고서를 알고 있으면 이 연도부터 조회)
         
     Returns:
-        pd.DataFrame: 추출된 재무제표 데이터
+        pd.DataFrame: 추출된 재무제표 데이터 (after_year 이후 연도가 아직 없으면 None)
     """
     if not corp_name:
         raise ValueError("기업 이름이 제공되지 않았습니다.")
     
-    corp_code = get_corp_code(corp_name)
+    corp_code = corp_code or get_corp_code(corp_name)
     if not corp_code:
         raise ValueError(f"기업 '{corp_name}'을 찾을 수 없습니다.")
+    corp_name = get_canonical_corp_name(corp_code, corp_name)
     
     current_year = datetime.now().year
     
-    # 첫 번째 결과가 나올 때까지 start_year를 감소시키며 반복
+    # 첫 번째 결과가 나올 때까지 start_year를 감소시키며 반복 (current_year - 1, current_year - 2까지 시도)
+    start_years = [int(bsns_year)] if bsns_year else [current_year - offset for offset in range(1, 3)]
     result_df = None
-    for offset in range(1, 3):  # current_year - 1, current_year - 2까지 시도
-        start_year = current_year - offset
-        end_year = start_year - 9
+    for start_year in start_years:
+        end_year = start_year - (FINANCE_YEARS - 1)
+        if after_year is not None:
+            if start_year <= after_year:
+                # 저장된 연도보다 새로운 사업보고서가 아직 없음
+                break
+            # 새 사업보고서가 다시 싣는 전기/전전기 금액(정정 반영)은 추가 요청 없이 함께 받아 교체
+            end_year = max(end_year, min(after_year + 1, start_year - RESTATED_YEARS))
         result_df = _fetch_finance_dataframe(corp_code, corp_name, start_year, end_year)
         
         # 결과가 있고 start_year 데이터가 있으면 성공
@@ -275,12 +618,88 @@ def get_finance_dataframe_10years(corp_name):
             break
     
     if result_df is None or result_df.empty:
+        if after_year is not None:
+            return None
         raise Exception("조회된 재무제표 데이터가 없습니다.")
     
     return result_df
 
 
-def _fetch_finance_dataframe(corp_code, corp_name, start_year, end_year):
+def get_report_dataframe(corp_name, period='FY', fs_div='CFS', sj_divs=SJ_DIVS, after_year=None, years=10):
+    """
+    보고서 기간(사업/반기/분기), 연결/별도, 재무제표 구분별 데이터를 조회합니다.
+    사업보고서는 당기/전기/전전기 금액이 있어 3년마다 조회하고, 반기/분기보고서는 당기 금액만 사용하므로 연도마다 조회합니다.
+    
+    Args:
+        corp_name (str): 기업 이름
+        period (str): 'FY', 'H1', 'Q1', 'Q3' (REPORT_CODES)
+        fs_div (str): 'CFS' 또는 'OFS'
+        sj_divs (tuple): 가져올 재무제표 구분 (SJ_DIVS 중)
+        after_year (int): 이 연도 이후만 조회 (증분 동기화, None이면 years년치 전체)
+        years (int): 전체 조회 시 연도 수
+        
+    Returns:
+        pd.DataFrame: corp_name, corp_code, account_id, account_nm, amount, year, period, fs_div, sj_div 열
+                      (조회된 데이터가 없으면 None)
+    """
+    if period not in REPORT_CODES:
+        raise ValueError(f"알 수 없는 보고서 기간입니다: {period} ({', '.join(REPORT_CODES)})")
+    if fs_div not in FS_DIVS:
+        raise ValueError(f"알 수 없는 재무제표 종류입니다: {fs_div} ({', '.join(FS_DIVS)})")
+    unknown = [sj_div for sj_div in sj_divs if sj_div not in SJ_DIVS]
+    if unknown:
+        raise ValueError(f"알 수 없는 재무제표 구분입니다: {', '.join(unknown)} ({', '.join(SJ_DIVS)})")
+    
+    corp_code = get_corp_code(corp_name)
+    if not corp_code:
+        raise ValueError(f"기업 '{corp_name}'을 찾을 수 없습니다.")
+    corp_name = get_canonical_corp_name(corp_code, corp_name)
+    
+    current_year = datetime.now().year
+    # 사업보고서는 이듬해 3월에 제출되므로 작년부터, 반기/분기보고서는 올해부터 조회
+    start_year = current_year - 1 if period == 'FY' else current_year
+    end_year = start_year - (years - 1)
+    if after_year is not None:
+        end_year = max(end_year, after_year + 1)
+    if start_year < end_year:
+        return None
+    
+    result_df = _fetch_finance_dataframe(corp_code, corp_name, start_year, end_year,
+                                         REPORT_CODES[period], fs_div, tuple(sj_divs))
+    if period == 'FY' and (result_df is None or result_df[result_df['year'] == start_year].empty) \
+            and start_year - 1 >= end_year:
+        # 작년 사업보고서가 아직 없으면 재작년부터 다시 조회 (get_finance_dataframe_10years와 같은 방식)
+        result_df = _fetch_finance_dataframe(corp_code, corp_name, start_year - 1, end_year,
+                                             REPORT_CODES[period], fs_div, tuple(sj_divs))
+    if result_df is None or result_df.empty:
+        return None
+    
+    result_df['period'] = period
+    result_df['fs_div'] = fs_div
+    return result_df[['corp_name', 'corp_code', 'account_id', 'account_nm', 'amount', 'year', 'period', 'fs_div', 'sj_div']]
+
+
+# 재무제표 응답(list 항목)에서 읽는 필드
+_FINANCE_ID_FIELDS = ['corp_code', 'account_id', 'account_nm']
+# (금액 필드, 사업연도와의 차이, 이 사업연도보다 큰 응답에서만 사용)
+# 2015년 이전 보고서의 전기/전전기 금액은 기준이 달라 당기 금액만 사용
+_FINANCE_AMOUNT_FIELDS = [
+    ('thstrm_amount', 0, 0),
+    ('frmtrm_amount', 1, 2015),
+    ('bfefrmtrm_amount', 2, 2016),
+]
+
+
+def _covered_from(query_year):
+    """사업보고서 한 건으로 얻을 수 있는 가장 오래된 연도 (전기/전전기 금액 포함)"""
+    for field, offset, min_year in reversed(_FINANCE_AMOUNT_FIELDS):
+        if query_year > min_year:
+            return query_year - offset
+    return query_year
+
+
+def _fetch_finance_dataframe(corp_code, corp_name, start_year, end_year, reprt_code='11011', fs_div='CFS',
+                             sj_divs=None):
     """
     지정된 연도 범위로 재무제표 데이터를 조회하는 내부 함수
     
@@ -289,90 +708,128 @@ def _fetch_finance_dataframe(corp_code, corp_name, start_year, end_year):
         corp_name (str): 기업 이름
         start_year (int): 시작 연도
         end_year (int): 종료 연도
+        reprt_code (str): 보고서 코드 (사업보고서가 아니면 연도마다 조회)
+        fs_div (str): 'CFS' 또는 'OFS'
+        sj_divs (tuple): 재무제표 구분 (None이면 재무상태표만, sj_div 열 없음)
         
     Returns:
         pd.DataFrame: 추출된 재무제표 데이터 (실패 시 None)
     """
-    query_years = []
-    year = start_year
-    while year >= end_year:
-        query_years.append(year)
-        year -= 3
-    
-    if query_years[-1] > end_year:
-        query_years.append(end_year)
+    annual = reprt_code == REPORT_CODES['FY']
+    if annual:
+        query_years = []
+        year = start_year
+        while year >= end_year:
+            query_years.append(year)
+            year -= 3
+        
+        # 마지막 보고서의 전기/전전기 금액으로 종료 연도까지 채우지 못하면 종료 연도를 추가로 조회
+        if _covered_from(query_years[-1]) > end_year:
+            query_years.append(end_year)
+    else:
+        query_years = list(range(start_year, end_year - 1, -1))
     
     query_years.sort(reverse=True)
-    all_dataframes = []
+    responses = []
     
     for query_year in query_years:
         try:
-            finance_data = get_finance_data(corp_code, str(query_year))
-            
-            if 'list' not in finance_data or not finance_data['list']:
-                continue
-            
-            df = pd.DataFrame(finance_data['list'])
-            
-            if 'sj_div' in df.columns:
-                df = df[df['sj_div'] == 'BS'].copy()
-            
-            required_cols = ['corp_code', 'account_id', 'account_nm']
-            if not all(col in df.columns for col in required_cols):
-                continue
-            
-            dfs_for_year = []
-            
-            if 'thstrm_amount' in df.columns:
-                df_thstrm = df[df['thstrm_amount'].notna()].copy()
-                if not df_thstrm.empty:
-                    df_thstrm['amount'] = pd.to_numeric(df_thstrm['thstrm_amount'], errors='coerce')
-                    df_thstrm['year'] = query_year
-                    dfs_for_year.append(df_thstrm[required_cols + ['amount', 'year']])
-            
-            if query_year > 2015 and 'frmtrm_amount' in df.columns:
-                df_frmtrm = df[df['frmtrm_amount'].notna()].copy()
-                if not df_frmtrm.empty:
-                    df_frmtrm['amount'] = pd.to_numeric(df_frmtrm['frmtrm_amount'], errors='coerce')
-                    df_frmtrm['year'] = query_year - 1
-                    dfs_for_year.append(df_frmtrm[required_cols + ['amount', 'year']])
-            
-            if query_year > 2016 and 'bfefrmtrm_amount' in df.columns:
-                df_bfefrm = df[df['bfefrmtrm_amount'].notna()].copy()
-                if not df_bfefrm.empty:
-                    df_bfefrm['amount'] = pd.to_numeric(df_bfefrm['bfefrmtrm_amount'], errors='coerce')
-                    df_bfefrm['year'] = query_year - 2
-                    dfs_for_year.append(df_bfefrm[required_cols + ['amount', 'year']])
-            
-            if dfs_for_year:
-                year_df = pd.concat(dfs_for_year, ignore_index=True)
-                year_df = year_df[year_df['year'] >= end_year]
-                all_dataframes.append(year_df)
-        
+            responses.append((query_year, get_finance_data(corp_code, str(query_year), reprt_code, fs_div)))
         except Exception as e:
             print(f"경고: {query_year}년 데이터 조회 실패 - {str(e)}")
             continue
     
-    if not all_dataframes:
-        return None
+    return build_finance_dataframe(responses, corp_name, start_year, end_year, sj_divs, annual)
+
+
+def _parse_amounts(values):
+    """DART 금액 문자열 열을 숫자로 변환합니다. (천 단위 쉼표 제거, '(123)' 표기는 음수, 변환할 수 없으면 NaN)"""
+    import pandas as pd
+    text = values.astype(str).str.replace(',', '', regex=False).str.strip()
+    negative = text.str.startswith('(') & text.str.endswith(')')
+    amounts = pd.to_numeric(text.str.strip('()'), errors='coerce')
+    return amounts.mask(negative, -amounts)
+
+
+def build_finance_dataframe(responses, corp_name, start_year, end_year, sj_divs=None, annual=True):
+    """
+    여러 사업연도의 재무제표 응답을 연도별 긴 형식 DataFrame 하나로 만듭니다.
+    응답마다 DataFrame을 만들지 않고 필요한 필드만 열 단위로 모은 뒤,
+    당기/전기/전전기 금액 열을 한 번에 행으로 펼쳐(melt) 연도를 붙입니다.
     
-    result_df = pd.concat(all_dataframes, ignore_index=True)
-    result_df['corp_name'] = corp_name
+    Args:
+        responses (list): [(사업연도, get_finance_data 응답), ...] (최근 연도부터)
+        corp_name (str): 기업 이름
+        start_year (int): 시작 연도 (계정 순서 기준)
+        end_year (int): 종료 연도 (이보다 이전 연도는 제외)
+        sj_divs (tuple): 가져올 재무제표 구분 (None이면 재무상태표만 가져오고 sj_div 열을 만들지 않음)
+        annual (bool): 사업보고서 여부 (반기/분기보고서는 전기 금액의 기준 시점이 달라 당기 금액만 사용)
+        
+    Returns:
+        pd.DataFrame: corp_name, corp_code, account_id, account_nm, amount, year (+ sj_div) 열 (데이터가 없으면 None)
+    """
+    import numpy as np
+    import pandas as pd
+    amount_specs = _FINANCE_AMOUNT_FIELDS if annual else _FINANCE_AMOUNT_FIELDS[:1]
+    amount_fields = [field for field, _, _ in amount_specs]
+    statements = tuple(dict.fromkeys(sj_divs)) if sj_divs else ('BS',)
+    id_fields = _FINANCE_ID_FIELDS + (['sj_div'] if sj_divs else [])
+    columns = {field: [] for field in id_fields + amount_fields + ['query_year']}
+    
+    for query_year, finance_data in responses:
+        items = finance_data.get('list') or []
+        if not items or not all(field in items[0] for field in _FINANCE_ID_FIELDS):
+            continue
+        for item in items:
+            if item.get('sj_div', 'BS') not in statements:
+                continue
+            for field in id_fields + amount_fields:
+                columns[field].append(item.get(field, 'BS') if field == 'sj_div' else item.get(field))
+            columns['query_year'].append(query_year)
     
-    result_df = result_df.drop_duplicates(subset=['corp_code', 'account_id', 'account_nm', 'year'], keep='first')
+    if not columns['query_year']:
+        return None
     
-    column_order = ['corp_name', 'corp_code', 'account_id', 'account_nm', 'amount', 'year']
-    result_df = result_df[column_order]
+    # 응답 순서(연도 내림차순) -> 당기/전기/전전기 순서로 행을 펼침 (drop_duplicates의 keep='first' 기준)
+    frame = pd.DataFrame(columns)
+    long_df = frame.melt(id_vars=id_fields + ['query_year'], value_vars=amount_fields,
+                         var_name='period', value_name='raw_amount')
+    offsets = {field: offset for field, offset, _ in amount_specs}
+    min_years = {field: min_year for field, _, min_year in amount_specs}
+    period = long_df['period']
+    long_df['year'] = long_df['query_year'] - period.map(offsets).astype('int64')
+    keep = (long_df['raw_amount'].notna()
+            & (long_df['query_year'] > period.map(min_years).astype('int64'))
+            & (long_df['year'] >= end_year))
+    long_df = long_df.loc[keep, id_fields + ['raw_amount', 'year']]
+    if long_df.empty:
+        return None
     
-    latest_year_df = result_df[result_df['year'] == start_year].copy()
-    if not latest_year_df.empty:
-        account_order = {account: idx for idx, account in enumerate(latest_year_df['account_nm'].unique())}
-        max_order = len(account_order)
-        result_df['account_order'] = result_df['account_nm'].map(lambda x: account_order.get(x, max_order))
-        result_df = result_df.sort_values(['year', 'account_order'], ascending=[False, True])
-        result_df = result_df.drop(columns=['account_order'])
+    long_df = long_df.drop_duplicates(subset=id_fields + ['year'], keep='first')
+    result_df = pd.DataFrame({
+        'corp_name': corp_name,
+        'corp_code': long_df['corp_code'].to_numpy(),
+        'account_id': long_df['account_id'].to_numpy(),
+        'account_nm': long_df['account_nm'].to_numpy(),
+        'amount': _parse_amounts(long_df['raw_amount']).to_numpy(),
+        'year': long_df['year'].to_numpy(),
+    })
+    if sj_divs:
+        result_df['sj_div'] = long_df['sj_div'].to_numpy()
+    
+    # 최근 연도의 계정 순서를 범주 순서로 사용 (최근 연도에 없는 계정은 맨 뒤)
+    years = result_df['year'].to_numpy()
+    latest_accounts = result_df.loc[years == start_year, 'account_nm'].dropna().unique()
+    if len(latest_accounts):
+        codes = pd.Categorical(result_df['account_nm'], categories=latest_accounts).codes.astype('int64')
+        account_order = np.where(codes < 0, len(latest_accounts), codes)
+    else:
+        account_order = np.zeros(len(years), dtype='int64')
+    if sj_divs:
+        # 재무제표 구분은 요청한 순서대로 (연도 안에서 재무상태표, 손익계산서, ... 순)
+        statement_order = pd.Categorical(result_df['sj_div'], categories=statements).codes
+        order = np.lexsort((account_order, statement_order, -years))
     else:
-        result_df = result_df.sort_values('year', ascending=False)
+        order = np.lexsort((account_order, -years))
     
-    return result_df
-
+    return result_df.take(order).reset_index(drop=True)
@@ -0,0 +1,232 @@
+"""
+여러 기업 PDF 보고서 일괄 생성 모듈
+모든 기업/연도 데이터를 한 번의 쿼리로 가져오고, 차트는 별도 프로세스에서 병렬로 렌더링한 뒤
+하나로 합친 PDF 또는 기업별 PDF를 묶은 ZIP을 스트림으로 내보냅니다.
+
+명령줄 사용 예:
+    python -m app.batch_report --corps 삼성전자,LG전자 --years 2023,2024 --format zip -o report.zip
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from app import db, output_cache, renderer
+from app.data_version import get_data_version
+from app.pdf_service import generate_pdf_chart_image, draw_report_pages
+
+
+BATCH_REPORT_WORKERS = int(os.environ.get('BATCH_REPORT_WORKERS', 0)) or os.cpu_count() or 1
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class BatchReportStats:
+    """일괄 생성 처리량 통계"""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.reports = 0
+        self.pages = 0
+        self.elapsed = 0.0
+
+    def finish(self):
+        self.elapsed = time.perf_counter() - self.started_at
+
+    @property
+    def pages_per_second(self):
+        return self.pages / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self):
+        return (f"PDF 일괄 생성 완료: 보고서 {self.reports}개, {self.pages}페이지, "
+                f"{self.elapsed:.2f}초 ({self.pages_per_second:.1f} pages/s)")
+
+
+def fetch_report_rows(corp_names, years):
+    """
+    요청한 기업/연도 조합의 계정 데이터를 한 번의 쿼리로 조회합니다.
+
+    Returns:
+        list: [(corp_name, year, rows), ...] 요청 순서대로, 데이터가 없는 조합은 제외
+    """
+    years = [str(year) for year in years]
+    grouped = {}
+    for corp_name, year, account_id, account_nm, amount in db.get_account_data_for_corps(corp_names, years):
+        grouped.setdefault((corp_name, str(year)), []).append((account_id, account_nm, amount))
+
+    return [
+        (corp_name, year, grouped[(corp_name, year)])
+        for corp_name in corp_names
+        for year in years
+        if (corp_name, year) in grouped
+    ]
+
+
+def _render_chart_job(job):
+    """워커 프로세스에서 실행되는 차트 렌더링 작업"""
+    rows, corp_name, year = job
+    return generate_pdf_chart_image(rows, corp_name, year).getvalue()
+
+
+def render_charts(reports):
+    """
+    보고서별 차트 PNG를 준비합니다.
+    렌더링 결과 캐시에 있는 차트는 재사용하고, 나머지만 워커 프로세스에서 병렬로 렌더링합니다.
+
+    Returns:
+        list: reports와 같은 순서의 PNG 바이트 리스트
+    """
+    charts = [None] * len(reports)
+    pending = []
+
+    for i, (corp_name, year, rows) in enumerate(reports):
+        chart_file = output_cache.get('png', corp_name, year, get_data_version(corp_name))
+        if chart_file:
+            with chart_file:
+                charts[i] = chart_file.read()
+        else:
+            pending.append(i)
+
+    if not pending:
+        return charts
+
+    jobs = [(reports[i][2], reports[i][0], reports[i][1]) for i in pending]
+    workers = min(BATCH_REPORT_WORKERS, len(jobs))
+
+    if workers <= 1:
+        results = [_render_chart_job(job) for job in jobs]
+    else:
+        # 멀티스레드 웹 서버에서 fork하지 않도록 spawn 방식 사용, 워커마다 폰트는 한 번만 등록
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=renderer.init_fonts) as pool:
+            results = list(pool.map(_render_chart_job, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+
+    # 한글 폰트 없이 대체 폰트로 그린 차트는 캐시하지 않음
+    cacheable = renderer.has_chart_font()
+    for i, png in zip(pending, results):
+        corp_name, year, _ = reports[i]
+        if cacheable:
+            output_cache.put('png', corp_name, year, get_data_version(corp_name), png)
+        charts[i] = png
+
+    return charts
+
+
+class _ChunkWriter:
+    """zipfile이 쓰는 데이터를 모아 두었다가 조각 단위로 내보내는 쓰기 전용 스트림"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        chunks, self.chunks = self.chunks, []
+        return chunks
+
+
+def _stream_merged_pdf(reports, charts, stats):
+    """모든 보고서를 한 PDF로 합쳐 임시 파일에 쓰고 조각 단위로 내보냅니다."""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    with tempfile.TemporaryFile() as tmp:
+        c = canvas.Canvas(tmp, pagesize=A4)
+        for (corp_name, year, rows), png in zip(reports, charts):
+            stats.pages += draw_report_pages(c, rows, corp_name, year, BytesIO(png))
+            stats.reports += 1
+        c.save()
+
+        tmp.seek(0)
+        while True:
+            chunk = tmp.read(STREAM_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+
+def _stream_zip(reports, charts, stats):
+    """기업/연도별 PDF를 하나씩 생성하여 ZIP 항목으로 바로 내보냅니다."""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    writer = _ChunkWriter()
+    with zipfile.ZipFile(writer, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        for (corp_name, year, rows), png in zip(reports, charts):
+            buffer = BytesIO()
+            c = canvas.Canvas(buffer, pagesize=A4)
+            stats.pages += draw_report_pages(c, rows, corp_name, year, BytesIO(png))
+            c.save()
+            stats.reports += 1
+
+            zf.writestr(f"{corp_name}_{year}_재무상태표.pdf", buffer.getvalue())
+            yield from writer.drain()
+    yield from writer.drain()
+
+
+def generate_batch_report(corp_names, years, output_format='pdf', stats=None):
+    """
+    여러 기업/연도의 보고서를 생성하여 바이트 조각을 순서대로 반환하는 제너레이터를 만듭니다.
+
+    Args:
+        corp_names (list): 기업 이름 리스트
+        years (list): 연도 리스트 (각 기업마다 모든 연도를 생성)
+        output_format (str): 'pdf'(하나로 합친 PDF) 또는 'zip'(기업별 PDF 묶음)
+        stats (BatchReportStats): 처리량을 기록할 통계 객체 (선택)
+
+    Returns:
+        tuple: (보고서 수, 바이트 조각 제너레이터), 데이터가 없으면 (0, None)
+    """
+    if output_format not in ('pdf', 'zip'):
+        raise ValueError("지원하지 않는 형식입니다. 'pdf' 또는 'zip'을 선택해주세요.")
+
+    stats = stats or BatchReportStats()
+    reports = fetch_report_rows(corp_names, years)
+    if not reports:
+        return 0, None
+
+    charts = render_charts(reports)
+
+    def stream():
+        if output_format == 'zip':
+            yield from _stream_zip(reports, charts, stats)
+        else:
+            yield from _stream_merged_pdf(reports, charts, stats)
+        stats.finish()
+        print(stats.summary())
+
+    return len(reports), stream()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="여러 기업의 재무상태표 PDF 보고서를 일괄 생성합니다.")
+    parser.add_argument('--corps', required=True, help="쉼표로 구분한 기업 이름 목록")
+    parser.add_argument('--years', required=True, help="쉼표로 구분한 연도 목록")
+    parser.add_argument('--format', choices=['pdf', 'zip'], default='pdf')
+    parser.add_argument('-o', '--output', required=True, help="출력 파일 경로")
+    args = parser.parse_args()
+
+    corp_names = [c.strip() for c in args.corps.split(',') if c.strip()]
+    years = [y.strip() for y in args.years.split(',') if y.strip()]
+
+    stats = BatchReportStats()
+    count, stream = generate_batch_report(corp_names, years, args.format, stats)
+    if not count:
+        print("생성할 보고서 데이터가 없습니다.")
+        return
+
+    with open(args.output, 'wb') as f:
+        for chunk in stream:
+            f.write(chunk)
+
+
+if __name__ == '__main__':
+    main()
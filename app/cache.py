@@ -1,21 +1,110 @@
 """
 기업 코드 캐시 관리 모듈
-Flask 앱 시작 시 백그라운드에서 기업 코드 목록을 로드합니다.
+Flask 앱 시작 시 백그라운드에서 기업 코드 목록을 로드하고, 이후 정해진 주기로 다시 받아 교체합니다.
 """
+import os
 import threading
+from app import api_service
 from app.api_service import load_corp_code_cache
 
+# 기업 코드 목록 갱신 주기 (초, 0이면 시작 시 한 번만 로드)
+REFRESH_INTERVAL = float(os.environ.get('CORP_CODE_REFRESH_INTERVAL', 24 * 3600))
+# 마지막 로딩이 실패했을 때 다시 시도하는 주기 (초)
+RETRY_INTERVAL = float(os.environ.get('CORP_CODE_RETRY_INTERVAL', 300))
+
+_cache_thread = None
+_refresh_thread = None
+_refresh_stop = None
+
 
 def init_cache():
     """
-    Flask 앱 시작 시 기업 코드 캐시를 백그라운드에서 로드합니다.
+    Flask 앱 시작 시 기업 코드 캐시를 백그라운드에서 로드하고 주기적 갱신을 시작합니다.
     이 함수는 create_app()에서 호출됩니다.
     """
     def load_cache_background():
-        """백그라운드 스레드에서 캐시 로드"""
+        """백그라운드 스레드에서 캐시 로드 (디스크 스냅샷이 있으면 먼저 사용하고 DART 목록으로 교체)"""
+        api_service.load_snapshot()
         load_corp_code_cache()
-    
+
+    global _cache_thread
+
     # 백그라운드 스레드 시작 (데몬 스레드로 설정하여 메인 프로세스 종료 시 함께 종료)
-    cache_thread = threading.Thread(target=load_cache_background, daemon=True)
-    cache_thread.start()
+    _cache_thread = threading.Thread(target=load_cache_background, name='corp-code-cache', daemon=True)
+    _cache_thread.start()
+    start_refresh_schedule()
+
+
+def start_refresh_schedule(interval=None):
+    """
+    기업 코드 목록을 주기적으로 다시 받는 백그라운드 스레드를 시작합니다. (이미 실행 중이면 아무 작업도 하지 않음)
+    마지막 로딩이 실패했으면 RETRY_INTERVAL 주기로 더 자주 시도합니다.
+    """
+    global _refresh_thread, _refresh_stop
+
+    interval = REFRESH_INTERVAL if interval is None else interval
+    if interval <= 0 or (_refresh_thread is not None and _refresh_thread.is_alive()):
+        return
+
+    stop = threading.Event()
+
+    def refresh_loop():
+        while True:
+            status = api_service.get_cache_status()
+            wait = interval if status['state'] == api_service.CACHE_READY else min(interval, RETRY_INTERVAL)
+            if stop.wait(wait):
+                return
+            load_corp_code_cache()
+
+    _refresh_stop = stop
+    _refresh_thread = threading.Thread(target=refresh_loop, name='corp-code-refresh', daemon=True)
+    _refresh_thread.start()
+
+
+def stop_refresh_schedule(wait=False):
+    """
+    주기적 갱신 스레드를 멈춥니다. (prefork 마스터처럼 요청을 처리하지 않는 프로세스)
+    wait이면 진행 중인 갱신이 끝나 스레드가 종료될 때까지 기다립니다.
+    """
+    if _refresh_stop is not None:
+        _refresh_stop.set()
+    if wait and _refresh_thread is not None:
+        _refresh_thread.join()
+
+
+def is_loading():
+    """시작 시 캐시 로딩 스레드가 아직 실행 중인지 반환합니다. (스냅샷으로 먼저 조회할 수 있어도 DART 목록을 받는 중이면 True)"""
+    return _cache_thread is not None and _cache_thread.is_alive()
+
+
+def wait_for_cache(timeout=None):
+    """
+    백그라운드 캐시 로딩이 끝날 때까지 기다립니다. (prefork 서버의 마스터에서 fork 전에 호출)
+
+    Returns:
+        bool: 캐시 로드 완료 여부 (스냅샷으로 조회 가능한 경우 포함)
+    """
+    if _cache_thread is not None:
+        _cache_thread.join(timeout)
+    return api_service.get_directory() is not None
+
+
+def restart_after_fork():
+    """
+    fork된 워커 프로세스에서 호출합니다. (부모의 스레드는 fork 후 자식에 없음)
+    부모에서 DART 목록을 다 읽었으면 copy-on-write로 공유된 캐시를 그대로 쓰면서 갱신 스케줄만 다시 시작하고,
+    아직이면 워커에서 로딩 스레드를 다시 시작합니다.
+    스냅샷으로 stale 상태인 경우에도 그 목록으로 조회하면서 DART 목록을 다시 받습니다.
+
+    Returns:
+        bool: 로딩 스레드를 다시 시작했는지 여부
+    """
+    global _refresh_thread
 
+    # 부모에서 만든 스레드 객체는 자식에서 실행 중이 아니므로 새로 시작하도록 비움
+    _refresh_thread = None
+    if api_service.get_cache_status()['state'] == api_service.CACHE_READY:
+        start_refresh_schedule()
+        return False
+    init_cache()
+    return True
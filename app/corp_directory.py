@@ -0,0 +1,225 @@
+"""
+DART 기업 코드 목록(corpCode.xml) 모듈
+목록은 한 번 만들면 바뀌지 않는 CorpDirectory 객체로 만들고, 갱신할 때는 새 객체를 따로 만든 뒤
+api_service가 참조 하나만 교체합니다. 조회하는 요청 스레드는 잠금 없이 그 시점의 객체를 끝까지 사용합니다.
+
+기본 키는 corp_code이고, 정규화한 기업명/종목코드/영문명/최종변경일자 보조 인덱스를 목록을 만들 때 함께 계산합니다.
+corpCode.xml에는 같은 이름의 기업이 여러 개 있으므로 보조 인덱스는 일치하는 기업을 모두(튜플) 반환합니다.
+"""
+import bisect
+import re
+import unicodedata
+import xml.etree.ElementTree as ET
+from collections import namedtuple
+from types import MappingProxyType
+
+
+# corpCode.xml의 <list> 항목 (stock_code는 비상장이면 빈 문자열, modify_date는 YYYYMMDD)
+Corp = namedtuple('Corp', ['corp_code', 'corp_name', 'corp_eng_name', 'stock_code', 'modify_date'])
+
+# 이름 비교에서 무시하는 법인 형태 표기
+_LEGAL_FORM_PATTERN = re.compile(r'\((주|유|합|재|사)\)')
+_LEGAL_FORM_WORDS = {'주식회사', '유한회사', '유한책임회사', '합자회사', '합명회사',
+                     'co', 'ltd', 'inc', 'corp', 'corporation', 'company', 'limited', 'plc', 'llc'}
+_WORD_PATTERN = re.compile(r'\w+')
+
+
+def normalize_name(name):
+    """
+    기업명(한글/영문)을 비교용 키로 정규화합니다.
+    전각/반각과 ㈜ 같은 기호를 통일(NFKC)하고, 대소문자, 공백, 문장부호, 법인 형태 표기((주), 주식회사, Co., Ltd. 등)를 무시합니다.
+    """
+    if not name:
+        return ''
+    text = _LEGAL_FORM_PATTERN.sub(' ', unicodedata.normalize('NFKC', name).casefold())
+    words = _WORD_PATTERN.findall(text)
+    key = ''.join(word for word in words if word not in _LEGAL_FORM_WORDS)
+    # 법인 형태 표기만으로 된 이름은 그대로 사용
+    return key or ''.join(words)
+
+
+def _group(corps, key):
+    """key(corp) 값이 같은 기업을 묶은 읽기 전용 인덱스를 만듭니다. (빈 키는 제외)"""
+    index = {}
+    for corp in corps:
+        value = key(corp)
+        if value:
+            index.setdefault(value, []).append(corp)
+    return MappingProxyType({value: tuple(items) for value, items in index.items()})
+
+
+def _preferred(candidates):
+    """같은 이름의 후보 중 하나를 고릅니다. (상장 기업, 최근 변경된 기업 순)"""
+    return max(candidates, key=lambda corp: (bool(corp.stock_code), corp.modify_date))
+
+
+class CorpDirectory:
+    """
+    변경할 수 없는 기업 코드 목록
+
+    Attributes:
+        corps (tuple): Corp 목록 (corpCode.xml 순서)
+        listed (tuple): 종목코드가 있는 상장 기업만 모은 Corp 목록
+        by_code (Mapping): corp_code -> Corp (기본 키)
+        by_name (Mapping): normalize_name(corp_name) -> (Corp, ...)
+        by_stock_code (Mapping): stock_code -> (Corp, ...)
+        by_eng_name (Mapping): normalize_name(corp_eng_name) -> (Corp, ...)
+        by_modify_date (Mapping): modify_date(YYYYMMDD) -> (Corp, ...)
+        source (str): 'dart' 또는 'snapshot'
+        loaded_at (float): 목록을 받은 시각 (스냅샷이면 저장 시각)
+    """
+    __slots__ = ('corps', 'listed', 'by_code', 'by_name', 'by_stock_code', 'by_eng_name', 'by_modify_date',
+                 '_modify_dates', '_names_lower', '_listed_names_lower', 'source', 'loaded_at')
+
+    def __init__(self, corps, source, loaded_at):
+        corps = tuple(corps)
+        listed = tuple(corp for corp in corps if corp.stock_code)
+        by_modify_date = _group(corps, lambda corp: corp.modify_date)
+        set_attr = object.__setattr__
+        set_attr(self, 'corps', corps)
+        set_attr(self, 'listed', listed)
+        set_attr(self, 'by_code', MappingProxyType({corp.corp_code: corp for corp in corps}))
+        set_attr(self, 'by_name', _group(corps, lambda corp: normalize_name(corp.corp_name)))
+        set_attr(self, 'by_stock_code', _group(listed, lambda corp: corp.stock_code))
+        set_attr(self, 'by_eng_name', _group(corps, lambda corp: normalize_name(corp.corp_eng_name)))
+        set_attr(self, 'by_modify_date', by_modify_date)
+        # modified_since()의 범위 조회용 정렬된 변경일자
+        set_attr(self, '_modify_dates', tuple(sorted(by_modify_date)))
+        # 부분 일치 검색용 소문자 이름 (검색마다 lower()를 반복하지 않도록 미리 계산)
+        set_attr(self, '_names_lower', tuple(corp.corp_name.lower() for corp in corps))
+        set_attr(self, '_listed_names_lower', tuple(corp.corp_name.lower() for corp in listed))
+        set_attr(self, 'source', source)
+        set_attr(self, 'loaded_at', loaded_at)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CorpDirectory는 변경할 수 없습니다. 새 객체를 만들어 교체하세요.")
+
+    def __len__(self):
+        return len(self.corps)
+
+    @classmethod
+    def from_xml(cls, fileobj, source, loaded_at):
+        """corpCode.xml 파일 객체를 읽어 목록을 만듭니다. (이름이나 코드가 없는 항목은 제외)"""
+        corps = []
+        for item in ET.parse(fileobj).getroot():
+            corp_code = (item.findtext('corp_code') or '').strip()
+            corp_name = item.findtext('corp_name')
+            if corp_name and corp_code:
+                corps.append(Corp(corp_code, corp_name,
+                                  (item.findtext('corp_eng_name') or '').strip(),
+                                  (item.findtext('stock_code') or '').strip(),
+                                  _parse_modify_date(item.findtext('modify_date'))))
+        return cls(corps, source, loaded_at)
+
+    def to_snapshot(self, saved_at):
+        """디스크 스냅샷용 JSON 직렬화 가능 객체를 만듭니다."""
+        return {'saved_at': saved_at, 'fields': list(Corp._fields), 'corps': [list(corp) for corp in self.corps]}
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """to_snapshot() 결과로 목록을 만듭니다. (fields가 없는 이전 형식은 [기업명, 기업코드] 항목)"""
+        fields = snapshot.get('fields') or ['corp_name', 'corp_code']
+        corps = []
+        for values in snapshot.get('corps', []):
+            record = dict(zip(fields, values))
+            corps.append(Corp(**{field: record.get(field) or '' for field in Corp._fields}))
+        return cls(corps, 'snapshot', snapshot.get('saved_at'))
+
+    def find(self, query):
+        """
+        기업코드, 종목코드, 기업명, 영문명 순서로 정확히 일치하는 기업을 찾습니다.
+        처음 일치한 인덱스의 기업을 모두 반환하며(같은 이름이 여러 개일 수 있음), 없으면 빈 튜플을 반환합니다.
+        """
+        query = (query or '').strip()
+        if not query:
+            return ()
+        corp = self.by_code.get(query)
+        if corp is not None:
+            return (corp,)
+        matches = self.by_stock_code.get(query)
+        if matches:
+            return matches
+        key = normalize_name(query)
+        return self.by_name.get(key) or self.by_eng_name.get(key) or ()
+
+    def get_code(self, query):
+        """find() 결과 중 하나의 corp_code를 반환합니다. (여러 개면 상장 기업, 최근 변경된 기업 순)"""
+        candidates = self.find(query)
+        return _preferred(candidates).corp_code if candidates else None
+
+    def modified_since(self, modify_date):
+        """최종변경일자가 modify_date(YYYYMMDD) 이후인 기업을 반환합니다."""
+        start = bisect.bisect_left(self._modify_dates, _parse_modify_date(modify_date))
+        return tuple(corp for date in self._modify_dates[start:] for corp in self.by_modify_date[date])
+
+    def search(self, search_term, limit=50, listed_only=False):
+        """이름에 검색어(소문자)가 포함된 기업을 목록 순서대로 최대 limit개 반환합니다. (listed_only면 상장 기업만)"""
+        corps, names = (self.listed, self._listed_names_lower) if listed_only else (self.corps, self._names_lower)
+        results = []
+        for index, name in enumerate(names):
+            if search_term in name:
+                corp = corps[index]
+                results.append({'corp_name': corp.corp_name, 'corp_code': corp.corp_code, 'stock_code': corp.stock_code})
+                if len(results) >= limit:
+                    break
+        return results
+
+
+def _parse_modify_date(value):
+    """modify_date를 YYYYMMDD 문자열로 맞춥니다. (datetime.date, 'YYYY-MM-DD' 허용, 형식이 다르면 빈 문자열)"""
+    if hasattr(value, 'strftime'):
+        return value.strftime('%Y%m%d')
+    digits = ''.join(ch for ch in (value or '') if ch.isdigit())
+    return digits if len(digits) == 8 else ''
+
+
+def diff_directories(old, new):
+    """
+    두 목록의 차이를 corp_code 기준으로 계산합니다.
+
+    Returns:
+        dict: {'added': [Corp], 'removed': [Corp], 'renamed': [(이전 Corp, 새 Corp)],
+               'delisted': [(이전 Corp, 새 Corp)], 'listed': [(이전 Corp, 새 Corp)]}
+              delisted/listed는 stock_code가 사라지거나 새로 생긴 기업
+    """
+    old_codes = old.by_code if old is not None else {}
+    new_codes = new.by_code
+    diff = {'added': [], 'removed': [], 'renamed': [], 'delisted': [], 'listed': []}
+
+    for corp_code, corp in new_codes.items():
+        before = old_codes.get(corp_code)
+        if before is None:
+            diff['added'].append(corp)
+            continue
+        if before.corp_name != corp.corp_name:
+            diff['renamed'].append((before, corp))
+        if before.stock_code and not corp.stock_code:
+            diff['delisted'].append((before, corp))
+        elif corp.stock_code and not before.stock_code:
+            diff['listed'].append((before, corp))
+
+    diff['removed'] = [corp for corp_code, corp in old_codes.items() if corp_code not in new_codes]
+    return diff
+
+
+def summarize_diff(diff):
+    """diff_directories 결과를 항목별 개수로 요약합니다."""
+    return {kind: len(items) for kind, items in diff.items()}
+
+
+def diff_to_json(diff, limit=100):
+    """diff_directories 결과를 API 응답용으로 변환합니다. (항목별 최대 limit개)"""
+    def corp_json(corp):
+        return corp._asdict()
+
+    return {
+        'counts': summarize_diff(diff),
+        'added': [corp_json(corp) for corp in diff['added'][:limit]],
+        'removed': [corp_json(corp) for corp in diff['removed'][:limit]],
+        'renamed': [{'corp_code': new.corp_code, 'before': old.corp_name, 'after': new.corp_name}
+                    for old, new in diff['renamed'][:limit]],
+        'delisted': [{'corp_code': new.corp_code, 'corp_name': new.corp_name, 'stock_code': old.stock_code}
+                     for old, new in diff['delisted'][:limit]],
+        'listed': [{'corp_code': new.corp_code, 'corp_name': new.corp_name, 'stock_code': new.stock_code}
+                   for old, new in diff['listed'][:limit]],
+    }
@@ -0,0 +1,79 @@
+"""
+저장된 기업/연도 목록 캐시 모듈
+corp_directory 테이블을 한 번 읽어 메모리에 보관하고, 데이터 버전이 바뀌면 다시 읽습니다.
+페이지 렌더링마다 corp_finance 테이블을 DISTINCT 조회하지 않도록 합니다.
+"""
+import threading
+
+from app import db
+from app.data_version import get_latest_version, add_invalidation_listener
+
+
+_snapshot = None  # (데이터 버전, 기업 목록, 기업별 연도 목록)
+_lock = threading.Lock()
+
+
+def _load():
+    """현재 데이터 버전의 기업 목록을 읽어 캐시에 저장합니다."""
+    global _snapshot
+
+    version = get_latest_version()
+    snapshot = _snapshot
+    if snapshot is not None and snapshot[0] == version:
+        return snapshot
+
+    with _lock:
+        snapshot = _snapshot
+        if snapshot is not None and snapshot[0] == version:
+            return snapshot
+
+        rows = db.get_corp_directory()
+        if rows is None:
+            # 기업 목록 테이블이 없는 DB: 캐시하지 않고 기존 방식으로 조회
+            return None
+
+        corp_list = [(corp_name,) for _, corp_name, _, _ in rows]
+        year_map = {}
+        for _, corp_name, years, _ in rows:
+            # 같은 이름의 기업이 여럿이면 연도를 합침
+            merged = set(year_map.get(corp_name, [])) | set(years)
+            year_map[corp_name] = sorted(merged, reverse=True)
+
+        snapshot = (version, list(dict.fromkeys(corp_list)), year_map)
+        _snapshot = snapshot
+        return snapshot
+
+
+def get_corp_list():
+    """
+    저장된 기업 리스트를 반환합니다. (db.get_corp_list와 같은 형식)
+
+    Returns:
+        list: [(corp_name,), ...] 기업 이름 오름차순
+    """
+    snapshot = _load()
+    if snapshot is None:
+        return db.get_corp_list()
+    return snapshot[1]
+
+
+def get_year_list(corp_name):
+    """
+    기업의 연도 목록을 반환합니다. (db.get_year_list와 같은 형식)
+
+    Returns:
+        list: [(year,), ...] 연도 내림차순
+    """
+    snapshot = _load()
+    if snapshot is None:
+        return db.get_year_list(corp_name)
+    return [(year,) for year in snapshot[2].get(corp_name, [])]
+
+
+def invalidate(corp_name=None, version=None):
+    """캐시를 비웁니다. 다음 조회 시 DB에서 다시 읽습니다."""
+    global _snapshot
+    _snapshot = None
+
+
+add_invalidation_listener(invalidate)
@@ -0,0 +1,163 @@
+"""
+기업별 데이터 버전 관리 모듈 (캐시 무효화 버스)
+DB의 data_versions 테이블이 기업별 최신 버전을 기록하고, 모든 쓰기 경로(db.insert_data,
+db.delete_data_by_corp_code)가 같은 트랜잭션에서 버전을 올립니다.
+
+버전은 전체 기업에 걸쳐 단조 증가하는 번호이므로 "버전 N 이후 변경된 기업"을 바로 조회할 수 있습니다.
+다른 워커 프로세스는 신호 파일(최신 버전 번호)을 주기적으로 읽어 변경을 감지하고,
+변경이 있을 때만 DB에서 차이분을 읽어 등록된 무효화 리스너를 호출합니다.
+"""
+import os
+import threading
+import time
+
+
+SIGNAL_FILE = os.environ.get(
+    'DATA_VERSION_SIGNAL_FILE',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'instance', 'data_version')
+)
+POLL_INTERVAL = float(os.environ.get('DATA_VERSION_POLL_INTERVAL', 1.0))
+
+_started_at = time.time()
+
+_versions = {}       # corp_name -> 버전
+_modified_at = {}    # corp_name -> 마지막 변경 시각
+_latest_version = None  # 이 프로세스가 반영한 최신 버전 (None이면 아직 DB에서 읽지 않음)
+_listeners = []
+_lock = threading.Lock()
+_sync_lock = threading.Lock()
+_last_poll = None
+
+
+def get_data_version(corp_name):
+    """기업의 현재 데이터 버전을 반환합니다. (한 번도 변경되지 않았으면 0)"""
+    _maybe_sync()
+    return _versions.get(corp_name, 0)
+
+
+def get_last_modified(corp_name):
+    """기업 데이터가 마지막으로 변경된 시각(epoch 초)을 반환합니다. 변경 기록이 없으면 프로세스 시작 시각"""
+    _maybe_sync()
+    return _modified_at.get(corp_name, _started_at)
+
+
+def get_latest_version():
+    """이 프로세스가 반영한 전체 최신 버전 번호를 반환합니다."""
+    _maybe_sync()
+    return _latest_version or 0
+
+
+def changed_since(version):
+    """
+    주어진 버전 이후 데이터가 변경된 기업 목록을 반환합니다. (DB 조회 없이 메모리에서 계산)
+
+    Returns:
+        list: [(corp_name, version), ...] 버전 오름차순
+    """
+    _maybe_sync()
+    with _lock:
+        changed = [(corp_name, v) for corp_name, v in _versions.items() if v > version]
+    return sorted(changed, key=lambda item: item[1])
+
+
+def add_invalidation_listener(listener):
+    """데이터 변경 시 호출될 리스너 listener(corp_name, version)를 등록합니다."""
+    with _lock:
+        _listeners.append(listener)
+
+
+def publish_changes(changes):
+    """
+    DB 쓰기 경로에서 커밋 직후 호출합니다.
+    현재 프로세스에 변경을 즉시 반영하고, 신호 파일을 갱신하여 다른 워커에 알립니다.
+
+    Args:
+        changes (list): [(corp_name, version, updated_at_epoch), ...]
+    """
+    if not changes:
+        return
+    _apply_changes(changes)
+    _write_signal(max(version for _, version, _ in changes))
+
+
+def _apply_changes(changes, notify=True):
+    """
+    변경 내역을 메모리에 반영하고 리스너를 호출합니다.
+    _latest_version은 DB에서 빠짐없이 읽은 경우(sync)에만 올려, 다른 워커의 변경을 건너뛰지 않도록 합니다.
+    """
+    fired = []
+    with _lock:
+        for corp_name, version, updated_at in changes:
+            if version > _versions.get(corp_name, 0):
+                _versions[corp_name] = version
+                _modified_at[corp_name] = updated_at or time.time()
+                if notify:
+                    fired.append((corp_name, version))
+        listeners = list(_listeners)
+
+    for corp_name, version in fired:
+        for listener in listeners:
+            try:
+                listener(corp_name, version)
+            except Exception as e:
+                print(f"캐시 무효화 실패: {str(e)}")
+
+
+def _write_signal(version):
+    """신호 파일에 최신 버전을 기록합니다."""
+    try:
+        os.makedirs(os.path.dirname(SIGNAL_FILE), exist_ok=True)
+        tmp_path = f"{SIGNAL_FILE}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(str(version))
+        os.replace(tmp_path, SIGNAL_FILE)
+    except OSError as e:
+        print(f"데이터 버전 신호 파일 갱신 실패: {str(e)}")
+
+
+def _read_signal():
+    """신호 파일에 기록된 최신 버전을 읽습니다. (파일이 없으면 None)"""
+    try:
+        with open(SIGNAL_FILE) as f:
+            return int(f.read().strip() or 0)
+    except (OSError, ValueError):
+        return None
+
+
+def _maybe_sync():
+    """
+    POLL_INTERVAL마다 한 번 신호 파일을 확인하여, 다른 프로세스가 더 새 버전을 기록했으면
+    DB에서 그 이후의 변경분만 읽어 반영합니다. 요청마다 DB를 조회하지 않습니다.
+    """
+    global _last_poll
+
+    now = time.monotonic()
+    if _last_poll is not None and now - _last_poll < POLL_INTERVAL:
+        return
+    if not _sync_lock.acquire(blocking=False):
+        return
+    try:
+        _last_poll = now
+        signal_version = _read_signal()
+        if _latest_version is not None and (signal_version is None or signal_version <= _latest_version):
+            return
+        sync()
+    finally:
+        _sync_lock.release()
+
+
+def sync():
+    """DB에서 현재 프로세스가 반영한 버전 이후의 변경분을 읽어 반영합니다."""
+    global _latest_version
+
+    from app import db
+
+    since = _latest_version or 0
+    rows = db.get_data_versions_since(since)
+    if rows is None:
+        # 테이블이 없거나 DB 오류: 다음 주기에 다시 시도
+        return
+    # 처음 읽을 때는 캐시된 내용이 없으므로 리스너를 호출하지 않음
+    initial = _latest_version is None
+    _apply_changes(rows, notify=not initial)
+    _latest_version = max([since] + [version for _, version, _ in rows])
@@ -1,117 +1,404 @@
-import mysql.connector
 import os
+import json
+import time
 from dotenv import load_dotenv
+from app import data_version, metrics, storage
 
 # .env 파일 로드
 load_dotenv()
 
-base_config = {
-    "host": os.environ.get('DB_HOST', 'localhost'),
-    "user": os.environ.get('DB_USER', 'root'),
-    "password": os.environ.get('DB_PASSWORD'),
-}
-
 DB_NAME = os.environ.get('DB_NAME', 'default_db')
 
 TABLE_NAME = os.environ.get('TABLE_NAME', 'corp_finance')
 
+VERSION_TABLE_NAME = 'data_versions'
+
+DIRECTORY_TABLE_NAME = 'corp_directory'
+
+# 보고서별 재무제표 (반기/분기보고서, 별도재무제표, 손익계산서/현금흐름표 등)
+# 화면에서 쓰는 사업보고서 연결 재무상태표는 TABLE_NAME에 저장하고, 나머지를 기간/재무제표 구분 컬럼과 함께 저장
+REPORT_TABLE_NAME = 'corp_finance_report'
+REPORT_COLUMNS = ['corp_name', 'corp_code', 'account_id', 'account_nm', 'amount', 'year', 'period', 'fs_div', 'sj_div']
+
+# 저장 방식: 'flat'(corp_finance 단일 테이블) 또는 'normalized'(차원/팩트 테이블 + 호환 뷰)
+SCHEMA_LAYOUT = os.environ.get('SCHEMA_LAYOUT', 'flat').strip().lower()
+
+CORP_DIM_TABLE_NAME = 'corp_dim'
+ACCOUNT_DIM_TABLE_NAME = 'account_dim'
+FACT_TABLE_NAME = 'finance_fact'
+
+# 저장소 백엔드 (DB_BACKEND: mysql, sqlite, duckdb)
+backend = storage.create_backend()
+DBError = backend.Error
+
+def configure(backend_name=None, schema_layout=None, **options):
+    """
+    저장소 백엔드를 바꿉니다. (백엔드 적합성 검사, 벤치마크 등에서 사용)
+    
+    Args:
+        backend_name (str): 'mysql', 'sqlite', 'duckdb'
+        schema_layout (str): 'flat' 또는 'normalized' (없으면 기존 설정 유지)
+        **options: 백엔드 생성 옵션 (예: sqlite/duckdb의 path)
+    """
+    global backend, DBError, SCHEMA_LAYOUT
+    backend = storage.create_backend(backend_name, **options)
+    DBError = backend.Error
+    if schema_layout:
+        SCHEMA_LAYOUT = schema_layout
+    return backend
+
 def get_conn():
     """커넥션과 커서 반환하는 함수"""
-    return mysql.connector.connect(**base_config, database=DB_NAME)
+    return backend.connect()
 
+@metrics.timed('db.create_database')
 def create_database():
     """데이터베이스를 생성하고 성공 여부를 반환합니다."""
+    try:
+        backend.create_database()
+        return True
+    except (DBError, OSError) as err:
+        print(f"Database creation failed: {err}")
+        return False
+
+@metrics.timed('db.drop_table')
+def drop_table():
+    """테이블을 삭제하고 성공 여부를 반환합니다."""
     conn = None
     cursor = None
     try:
-        conn = mysql.connector.connect(**base_config)
+        conn = get_conn()
         cursor = conn.cursor()
-        cursor.execute(f"CREATE DATABASE IF NOT EXISTS {DB_NAME} CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci")
+        if backend.name == 'mysql':
+            # 외래키 체크를 일시적으로 비활성화하여 어떤 순서로든 삭제 가능하도록 함
+            cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+        cursor.execute("DROP TABLE IF EXISTS students")
+        # 보고서 테이블 시퀀스(seq_corp_finance_report_*)가 corp_finance 시퀀스 이름 패턴에도 걸리므로 먼저 삭제
+        cursor.execute(f"DROP TABLE IF EXISTS {REPORT_TABLE_NAME}")
+        backend.drop_auto_pk(cursor, REPORT_TABLE_NAME)
+        _drop_finance_relation(cursor)
+        for table in [FACT_TABLE_NAME, CORP_DIM_TABLE_NAME, ACCOUNT_DIM_TABLE_NAME, VERSION_TABLE_NAME, DIRECTORY_TABLE_NAME]:
+            cursor.execute(f"DROP TABLE IF EXISTS {table}")
+            backend.drop_auto_pk(cursor, table)
+        if backend.name == 'mysql':
+            cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
         conn.commit()
         return True
-    except mysql.connector.Error as err:
-        print(f"Database creation failed: {err}")
+    except DBError as err:
+        print(f"Table drop failed: {err}")
         if conn:
             conn.rollback()
         return False
     finally:
-        # 리소스 정리: 예외 발생 여부와 관계없이 항상 실행
         if cursor:
             cursor.close()
         if conn:
             conn.close()
 
-def drop_table():
-    """테이블을 삭제하고 성공 여부를 반환합니다."""
+@metrics.timed('db.create_table')
+def create_table():
+    """테이블을 생성하고 성공 여부를 반환합니다."""
     conn = None
     cursor = None
     try:
         conn = get_conn()
         cursor = conn.cursor()
-        # 외래키 체크를 일시적으로 비활성화하여 어떤 순서로든 삭제 가능하도록 함
-        cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
-        cursor.execute("DROP TABLE IF EXISTS students")
-        cursor.execute(f"DROP TABLE IF EXISTS {TABLE_NAME}")
-        cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+        
+        if SCHEMA_LAYOUT == 'normalized':
+            # 정규화 저장 구조: 기존 쿼리는 같은 이름의 호환 뷰를 통해 그대로 동작
+            _create_normalized_tables(cursor)
+            _create_compat_view(cursor)
+        else:
+            # students 테이블 생성 (먼저 생성해야 외래키 참조 가능)
+            cursor.execute(f"""
+                CREATE TABLE {TABLE_NAME} (
+                    {backend.auto_pk(cursor, TABLE_NAME)},
+                    corp_name varchar(100),
+                    corp_code varchar(20),
+                    account_id varchar(300),
+                    account_nm varchar(100),
+                    amount bigint,
+                    year int
+                );
+            """)
+            _create_corp_year_index(cursor)
+        
+        # 기업별 데이터 버전 (캐시 무효화용)
+        _create_version_table(cursor)
+        
+        # 저장된 기업 목록 (페이지 렌더링 시 DISTINCT 조회 대신 사용)
+        _create_directory_table(cursor)
+        
+        _create_report_table(cursor)
+        
         conn.commit()
         return True
-    except mysql.connector.Error as err:
-        print(f"Table drop failed: {err}")
+    except DBError as err:
+        print(f"Table creation failed: {err}")
         if conn:
             conn.rollback()
         return False
     finally:
+        # 리소스 정리: 예외 발생 여부와 관계없이 항상 실행
         if cursor:
             cursor.close()
         if conn:
             conn.close()
 
-def create_table():
-    """테이블을 생성하고 성공 여부를 반환합니다."""
+def _create_version_table(cursor):
+    """기업별 데이터 버전 테이블을 생성합니다. (updated_at: epoch 초)"""
+    cursor.execute(f"""
+        CREATE TABLE {VERSION_TABLE_NAME} (
+            corp_code varchar(20) primary key,
+            corp_name varchar(100),
+            version bigint not null,
+            updated_at double
+        );
+    """)
+    cursor.execute(f"CREATE INDEX idx_{VERSION_TABLE_NAME}_version ON {VERSION_TABLE_NAME} (version)")
+
+def _ensure_version_table(cursor):
+    """
+    데이터 버전 테이블이 없으면 만들고, updated_at이 초기 형식(MySQL timestamp)이면 epoch 초(double)로 바꿉니다.
+    (테이블 추가 이전 또는 updated_at 형식 변경 이전에 만든 DB용)
+    """
+    if backend.relation_type(cursor, VERSION_TABLE_NAME) is None:
+        _create_version_table(cursor)
+        return
+    
+    column_type = backend.column_type(cursor, VERSION_TABLE_NAME, 'updated_at')
+    if column_type in ('timestamp', 'datetime'):
+        # timestamp 컬럼은 MySQL 백엔드에서만 만들어졌음 (UNIX_TIMESTAMP로 기존 값 보존)
+        cursor.execute(f"ALTER TABLE {VERSION_TABLE_NAME} ADD COLUMN updated_at_epoch double")
+        cursor.execute(f"UPDATE {VERSION_TABLE_NAME} SET updated_at_epoch = UNIX_TIMESTAMP(updated_at)")
+        cursor.execute(f"ALTER TABLE {VERSION_TABLE_NAME} DROP COLUMN updated_at")
+        cursor.execute(f"ALTER TABLE {VERSION_TABLE_NAME} CHANGE updated_at_epoch updated_at double")
+        print(f"✓ {VERSION_TABLE_NAME}.updated_at을 epoch 초(double)로 변환했습니다.")
+    
+    if not backend.has_index(cursor, VERSION_TABLE_NAME, f"idx_{VERSION_TABLE_NAME}_version"):
+        cursor.execute(f"CREATE INDEX idx_{VERSION_TABLE_NAME}_version ON {VERSION_TABLE_NAME} (version)")
+
+def _create_directory_table(cursor):
+    """저장된 기업 목록 테이블을 생성합니다. (years: 내림차순 연도 JSON 배열)"""
+    cursor.execute(f"""
+        CREATE TABLE {DIRECTORY_TABLE_NAME} (
+            corp_code varchar(20) primary key,
+            corp_name varchar(100),
+            years {backend.json_type},
+            latest_year int
+        );
+    """)
+    cursor.execute(f"CREATE INDEX idx_{DIRECTORY_TABLE_NAME}_corp_name ON {DIRECTORY_TABLE_NAME} (corp_name)")
+
+def _ensure_directory_table(cursor):
+    """
+    기업 목록 테이블이 없으면 만들고 기존 데이터로 채웁니다. (테이블 추가 이전에 만든 DB용)
+    
+    Returns:
+        bool: 새로 만들었는지 여부
+    """
+    if backend.relation_type(cursor, DIRECTORY_TABLE_NAME) is not None:
+        return False
+    _create_directory_table(cursor)
+    cursor.execute(f"SELECT DISTINCT corp_code FROM {TABLE_NAME}")
+    corp_codes = [row[0] for row in cursor.fetchall()]
+    _refresh_corp_directory(cursor, corp_codes)
+    print(f"✓ {DIRECTORY_TABLE_NAME} 생성 ({len(corp_codes)}개 기업)")
+    return True
+
+def _create_corp_year_index(cursor):
+    """기업 이름 + 연도 조회용 인덱스를 만듭니다. (flat 저장 구조의 재무 테이블)"""
+    cursor.execute(f"CREATE INDEX idx_{TABLE_NAME}_corp_year ON {TABLE_NAME} (corp_name, year)")
+
+def _ensure_corp_year_index(cursor):
+    """flat 저장 구조에서 기업 이름 + 연도 인덱스가 없으면 만듭니다. (정규화 구조는 팩트 테이블에 이미 있음)"""
+    if backend.relation_type(cursor, TABLE_NAME) != 'table':
+        return
+    if not backend.has_index(cursor, TABLE_NAME, f"idx_{TABLE_NAME}_corp_year"):
+        _create_corp_year_index(cursor)
+
+@metrics.timed('db.ensure_schema')
+def ensure_schema():
+    """
+    이미 만든 DB에 이후 추가된 테이블과 컬럼 변경을 반영합니다. (여러 번 실행해도 안전)
+    앱 시작 시(create_app)와 migrate_schema.py에서 호출합니다. 재무 테이블이 아직 없으면 아무것도 하지 않습니다.
+    
+    Returns:
+        bool: 성공 여부
+    """
     conn = None
     cursor = None
     try:
         conn = get_conn()
         cursor = conn.cursor()
+        if backend.relation_type(cursor, TABLE_NAME) is None:
+            return True
         
-        # students 테이블 생성 (먼저 생성해야 외래키 참조 가능)
-        cursor.execute(f"""
-            CREATE TABLE {TABLE_NAME} (
-                id int primary key auto_increment,
-                corp_name varchar(100),
-                corp_code varchar(20),
-                account_id varchar(300),
-                account_nm varchar(100),
-                amount bigint,
-                year int
-            );
-        """)
+        _ensure_version_table(cursor)
+        _ensure_directory_table(cursor)
+        _ensure_corp_year_index(cursor)
+        _ensure_report_table(cursor)
         
         conn.commit()
         return True
-    except mysql.connector.Error as err:
-        print(f"Table creation failed: {err}")
+    except DBError as err:
+        print(f"Schema update failed: {err}")
         if conn:
             conn.rollback()
         return False
     finally:
-        # 리소스 정리: 예외 발생 여부와 관계없이 항상 실행
         if cursor:
             cursor.close()
         if conn:
             conn.close()
 
-def get_latest_year_by_corp_code(corp_code):
-    """기업 코드로 최근 연도를 조회합니다. 데이터가 없으면 None을 반환합니다."""
+def _create_report_table(cursor):
+    """보고서별 재무제표 테이블을 생성합니다. (period: FY/H1/Q1/Q3, fs_div: CFS/OFS, sj_div: BS/IS/CIS/CF/SCE)"""
+    cursor.execute(f"""
+        CREATE TABLE {REPORT_TABLE_NAME} (
+            {backend.auto_pk(cursor, REPORT_TABLE_NAME)},
+            corp_name varchar(100),
+            corp_code varchar(20) not null,
+            account_id varchar(300),
+            account_nm varchar(100),
+            amount bigint,
+            year int not null,
+            period varchar(2) not null,
+            fs_div varchar(3) not null,
+            sj_div varchar(3) not null
+        );
+    """)
+    cursor.execute(f"""
+        CREATE INDEX idx_{REPORT_TABLE_NAME}_report ON {REPORT_TABLE_NAME} (corp_code, period, fs_div, year)
+    """)
+
+def _ensure_report_table(cursor):
+    """보고서별 재무제표 테이블이 없으면 만듭니다. (테이블 추가 이전에 만든 DB용)"""
+    if backend.relation_type(cursor, REPORT_TABLE_NAME) is None:
+        _create_report_table(cursor)
+
+def _drop_finance_relation(cursor):
+    """TABLE_NAME이 테이블이든 호환 뷰든 삭제합니다."""
+    if backend.relation_type(cursor, TABLE_NAME) == 'view':
+        cursor.execute(f"DROP VIEW IF EXISTS {TABLE_NAME}")
+    else:
+        cursor.execute(f"DROP TABLE IF EXISTS {TABLE_NAME}")
+        backend.drop_auto_pk(cursor, TABLE_NAME)
+
+def _create_normalized_tables(cursor):
+    """기업/계정 차원 테이블과 정수 키만 가진 금액 팩트 테이블을 생성합니다."""
+    cursor.execute(f"""
+        CREATE TABLE {CORP_DIM_TABLE_NAME} (
+            {backend.auto_pk(cursor, CORP_DIM_TABLE_NAME, 'corp_key')},
+            corp_code varchar(20) not null unique,
+            corp_name varchar(100)
+        );
+    """)
+    cursor.execute(f"CREATE INDEX idx_{CORP_DIM_TABLE_NAME}_corp_name ON {CORP_DIM_TABLE_NAME} (corp_name)")
+    
+    # 계정 차원: (account_id, 기업별 계정명) 한 쌍이 한 행, canonical_nm은 account_id의 대표 이름
+    cursor.execute(f"""
+        CREATE TABLE {ACCOUNT_DIM_TABLE_NAME} (
+            {backend.auto_pk(cursor, ACCOUNT_DIM_TABLE_NAME, 'account_key')},
+            account_id varchar(300) not null default '',
+            account_nm varchar(100) not null default '',
+            canonical_nm varchar(100),
+            unique (account_id, account_nm)
+        );
+    """)
+    
+    cursor.execute(f"""
+        CREATE TABLE {FACT_TABLE_NAME} (
+            {backend.auto_pk(cursor, FACT_TABLE_NAME)},
+            corp_key int not null,
+            account_key int not null,
+            year smallint,
+            amount bigint
+        );
+    """)
+    cursor.execute(f"CREATE INDEX idx_{FACT_TABLE_NAME}_corp_year ON {FACT_TABLE_NAME} (corp_key, year)")
+    cursor.execute(f"CREATE INDEX idx_{FACT_TABLE_NAME}_account_year ON {FACT_TABLE_NAME} (account_key, year)")
+
+def _create_compat_view(cursor):
+    """기존 corp_finance 컬럼 구성을 그대로 제공하는 호환 뷰를 생성합니다."""
+    cursor.execute(f"DROP VIEW IF EXISTS {TABLE_NAME}")
+    cursor.execute(f"""
+        CREATE VIEW {TABLE_NAME} AS
+        SELECT f.id, c.corp_name, c.corp_code,
+               NULLIF(a.account_id, '') AS account_id, a.account_nm,
+               f.amount, f.year
+        FROM {FACT_TABLE_NAME} f
+        JOIN {CORP_DIM_TABLE_NAME} c ON c.corp_key = f.corp_key
+        JOIN {ACCOUNT_DIM_TABLE_NAME} a ON a.account_key = f.account_key
+    """)
+
+def _insert_normalized(cursor, data):
+    """(corp_name, corp_code, account_id, account_nm, amount, year) 행들을 차원/팩트 테이블에 저장합니다."""
+    corp_keys = {}
+    for corp_name, corp_code in dict.fromkeys((row[0], row[1]) for row in data):
+        cursor.execute(backend.upsert(CORP_DIM_TABLE_NAME, ['corp_code', 'corp_name'], ['corp_code']),
+                       (corp_code, corp_name))
+        cursor.execute(f"SELECT corp_key FROM {CORP_DIM_TABLE_NAME} WHERE corp_code = %s", (corp_code,))
+        corp_keys[corp_code] = cursor.fetchone()[0]
+    
+    pairs = list(dict.fromkeys((row[2] or '', row[3] or '') for row in data))
+    account_ids = list(dict.fromkeys(account_id for account_id, _ in pairs))
+    
+    def load_account_keys():
+        placeholders = ", ".join(["%s"] * len(account_ids))
+        cursor.execute(f"""
+            SELECT account_key, account_id, account_nm FROM {ACCOUNT_DIM_TABLE_NAME}
+            WHERE account_id IN ({placeholders}) ORDER BY account_key
+        """, account_ids)
+        return cursor.fetchall()
+    
+    existing = load_account_keys()
+    # account_id별 대표 이름: 가장 먼저 등록된 이름, 처음 보는 account_id는 이번 데이터의 첫 이름
+    canonical = {}
+    for _, account_id, account_nm in existing:
+        canonical.setdefault(account_id, account_nm)
+    for account_id, account_nm in pairs:
+        canonical.setdefault(account_id, account_nm)
+    
+    known = {(account_id, account_nm) for _, account_id, account_nm in existing}
+    new_pairs = [(account_id, account_nm, canonical[account_id] if account_id else account_nm)
+                 for account_id, account_nm in pairs if (account_id, account_nm) not in known]
+    if new_pairs:
+        cursor.executemany(backend.insert_ignore(ACCOUNT_DIM_TABLE_NAME, ['account_id', 'account_nm', 'canonical_nm']),
+                           new_pairs)
+        existing = load_account_keys()
+    
+    account_keys = {(account_id, account_nm): key for key, account_id, account_nm in existing}
+    
+    cursor.executemany(f"""
+        INSERT INTO {FACT_TABLE_NAME} (corp_key, account_key, year, amount) VALUES (%s, %s, %s, %s)
+    """, [
+        (corp_keys[row[1]], account_keys[(row[2] or '', row[3] or '')], row[5], row[4])
+        for row in data
+    ])
+
+@metrics.timed('db.get_latest_year_by_corp_code')
+def get_latest_year_by_corp_code(corp_code, period=None, fs_div=None):
+    """
+    기업 코드로 최근 연도를 조회합니다. 데이터가 없으면 None을 반환합니다.
+    period/fs_div를 주면 보고서별 재무제표 테이블에서 해당 보고서의 최근 연도를 조회합니다.
+    """
     conn = None
     cursor = None
     try:
         conn = get_conn()
         cursor = conn.cursor()
-        cursor.execute(f"SELECT MAX(year) FROM {TABLE_NAME} WHERE corp_code = %s", (corp_code,))
+        if period or fs_div:
+            if backend.relation_type(cursor, REPORT_TABLE_NAME) is None:
+                return None
+            cursor.execute(f"""
+                SELECT MAX(year) FROM {REPORT_TABLE_NAME} WHERE corp_code = %s AND period = %s AND fs_div = %s
+            """, (corp_code, period or 'FY', fs_div or 'CFS'))
+        else:
+            cursor.execute(f"SELECT MAX(year) FROM {TABLE_NAME} WHERE corp_code = %s", (corp_code,))
         result = cursor.fetchone()
         return result[0] if result and result[0] is not None else None
-    except mysql.connector.Error as err:
+    except DBError as err:
         print(f"Get latest year failed: {err}")
         return None
     finally:
@@ -120,6 +407,7 @@ def get_latest_year_by_corp_code(corp_code):
         if conn:
             conn.close()
 
+@metrics.timed('db.delete_data_by_corp_code')
 def delete_data_by_corp_code(corp_code):
     """기업 코드로 해당 기업의 모든 데이터를 삭제합니다."""
     conn = None
@@ -127,10 +415,15 @@ def delete_data_by_corp_code(corp_code):
     try:
         conn = get_conn()
         cursor = conn.cursor()
-        cursor.execute(f"DELETE FROM {TABLE_NAME} WHERE corp_code = %s", (corp_code,))
+        cursor.execute(f"SELECT corp_name FROM {TABLE_NAME} WHERE corp_code = %s LIMIT 1", (corp_code,))
+        row = cursor.fetchone()
+        _delete_corp_rows(cursor, corp_code)
+        _refresh_corp_directory(cursor, [corp_code])
+        changes = _bump_data_versions(cursor, [(corp_code, row[0])] if row else [])
         conn.commit()
+        data_version.publish_changes(changes)
         return True
-    except mysql.connector.Error as err:
+    except DBError as err:
         print(f"Data deletion failed: {err}")
         if conn:
             conn.rollback()
@@ -141,6 +434,80 @@ def delete_data_by_corp_code(corp_code):
         if conn:
             conn.close()
 
+def _stored_corp_name(cursor, corp_code):
+    """저장된 재무제표 행 또는 기업 목록 테이블에서 기업 이름을 찾습니다. (없으면 None)"""
+    for table in (TABLE_NAME, DIRECTORY_TABLE_NAME):
+        cursor.execute(f"SELECT corp_name FROM {table} WHERE corp_code = %s LIMIT 1", (corp_code,))
+        row = cursor.fetchone()
+        if row:
+            return row[0]
+    return None
+
+def _delete_corp_rows(cursor, corp_code, years=None, min_year=None):
+    """
+    쓰기 트랜잭션 안에서 기업의 재무제표 행을 삭제합니다.
+    years를 주면 해당 연도만, min_year를 함께 주면 그보다 이전 연도(보관 범위 밖)도 삭제합니다.
+    """
+    year_filter = ''
+    params = [corp_code]
+    if years:
+        conditions = [f"year IN ({', '.join(['%s'] * len(years))})"]
+        params.extend(years)
+        if min_year is not None:
+            conditions.append("year < %s")
+            params.append(min_year)
+        year_filter = f" AND ({' OR '.join(conditions)})"
+    if SCHEMA_LAYOUT == 'normalized':
+        cursor.execute(f"""
+            DELETE FROM {FACT_TABLE_NAME}
+            WHERE corp_key IN (SELECT corp_key FROM {CORP_DIM_TABLE_NAME} WHERE corp_code = %s){year_filter}
+        """, params)
+    else:
+        cursor.execute(f"DELETE FROM {TABLE_NAME} WHERE corp_code = %s{year_filter}", params)
+
+@metrics.timed('db.replace_data_by_corp_code')
+def replace_data_by_corp_code(corp_code, data, years=None, min_year=None):
+    """
+    기업의 재무제표 행을 한 트랜잭션 안에서 지우고 다시 넣습니다. (증분 갱신, 백그라운드 갱신용)
+    커밋 전까지 다른 요청은 이전 데이터를 그대로 보며, 실패하면 이전 데이터가 남습니다.
+    
+    Args:
+        corp_code (str): 기업 코드 (data의 행은 모두 이 기업이어야 함)
+        data (list): [(corp_name, corp_code, account_id, account_nm, amount, year), ...]
+        years (list): 교체할 연도 (None이면 기업의 모든 연도를 지우고 data로 교체)
+        min_year (int): 이보다 이전 연도의 행도 함께 삭제 (보관 범위, years를 줄 때만 사용)
+    """
+    conn = None
+    cursor = None
+    try:
+        conn = get_conn()
+        cursor = conn.cursor()
+        # 넣을 행이 없어도(해당 연도 데이터가 사라진 경우) 버전을 올려 캐시를 무효화하도록 기업 이름을 미리 확보
+        corp_name = data[0][0] if data else _stored_corp_name(cursor, corp_code)
+        _delete_corp_rows(cursor, corp_code, years, min_year)
+        if data:
+            if SCHEMA_LAYOUT == 'normalized':
+                _insert_normalized(cursor, data)
+            else:
+                cursor.executemany(f"INSERT INTO {TABLE_NAME} (corp_name, corp_code, account_id, account_nm, amount, year) VALUES (%s, %s, %s, %s, %s, %s)", data)
+        _refresh_corp_directory(cursor, [corp_code])
+        # 이름을 찾지 못했으면 저장된 적 없는 기업이므로 무효화할 캐시도 없음
+        changes = _bump_data_versions(cursor, [(corp_code, corp_name)] if corp_name else [])
+        conn.commit()
+        data_version.publish_changes(changes)
+        return True
+    except DBError as err:
+        print(f"Data replacement failed: {err}")
+        if conn:
+            conn.rollback()
+        return False
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            conn.close()
+
+@metrics.timed('db.insert_data')
 def insert_data(data):
     """데이터를 삽입하고 성공 여부를 반환합니다."""
     conn = None
@@ -148,10 +515,17 @@ def insert_data(data):
     try:
         conn = get_conn()
         cursor = conn.cursor()
-        cursor.executemany(f"INSERT INTO {TABLE_NAME} (corp_name, corp_code, account_id, account_nm, amount, year) VALUES (%s, %s, %s, %s, %s, %s)", data)
+        if SCHEMA_LAYOUT == 'normalized':
+            _insert_normalized(cursor, data)
+        else:
+            cursor.executemany(f"INSERT INTO {TABLE_NAME} (corp_name, corp_code, account_id, account_nm, amount, year) VALUES (%s, %s, %s, %s, %s, %s)", data)
+        corps = list(dict.fromkeys((row[1], row[0]) for row in data))
+        _refresh_corp_directory(cursor, [corp_code for corp_code, _ in corps])
+        changes = _bump_data_versions(cursor, corps)
         conn.commit()
+        data_version.publish_changes(changes)
         return True
-    except mysql.connector.Error as err:
+    except DBError as err:
         print(f"Data insertion failed: {err}")
         if conn:
             conn.rollback()
@@ -162,6 +536,230 @@ def insert_data(data):
         if conn:
             conn.close()
 
+@metrics.timed('db.insert_report_data')
+def insert_report_data(data):
+    """
+    보고서별 재무제표 행을 저장하고 성공 여부를 반환합니다.
+    같은 기업/기간/연결·별도/연도의 기존 행은 한 트랜잭션 안에서 지우고 다시 넣습니다. (다시 받아도 중복되지 않음)
+    
+    Args:
+        data (list): [(corp_name, corp_code, account_id, account_nm, amount, year, period, fs_div, sj_div), ...]
+    """
+    conn = None
+    cursor = None
+    try:
+        conn = get_conn()
+        cursor = conn.cursor()
+        _ensure_report_table(cursor)
+        for corp_code, period, fs_div, year in dict.fromkeys((row[1], row[6], row[7], row[5]) for row in data):
+            cursor.execute(f"""
+                DELETE FROM {REPORT_TABLE_NAME} WHERE corp_code = %s AND period = %s AND fs_div = %s AND year = %s
+            """, (corp_code, period, fs_div, year))
+        placeholders = ", ".join(["%s"] * len(REPORT_COLUMNS))
+        cursor.executemany(f"INSERT INTO {REPORT_TABLE_NAME} ({', '.join(REPORT_COLUMNS)}) VALUES ({placeholders})", data)
+        conn.commit()
+        return True
+    except DBError as err:
+        print(f"Report data insertion failed: {err}")
+        if conn:
+            conn.rollback()
+        return False
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            conn.close()
+
+@metrics.timed('db.get_report_data')
+def get_report_data(corp_code, period='FY', fs_div='CFS', sj_div=None, year=None):
+    """
+    보고서별 재무제표를 조회합니다.
+    
+    Returns:
+        list: [(year, sj_div, account_id, account_nm, amount), ...] 연도 내림차순, 테이블이 없거나 실패 시 빈 리스트
+    """
+    conn = None
+    cursor = None
+    try:
+        conn = get_conn()
+        cursor = conn.cursor()
+        if backend.relation_type(cursor, REPORT_TABLE_NAME) is None:
+            return []
+        query = f"""
+            SELECT year, sj_div, account_id, account_nm, amount FROM {REPORT_TABLE_NAME}
+            WHERE corp_code = %s AND period = %s AND fs_div = %s
+        """
+        params = [corp_code, period, fs_div]
+        if sj_div:
+            query += " AND sj_div = %s"
+            params.append(sj_div)
+        if year is not None:
+            query += " AND year = %s"
+            params.append(year)
+        cursor.execute(query + " ORDER BY year DESC, id", params)
+        return [tuple(row) for row in cursor.fetchall()]
+    except DBError as err:
+        print(f"Report data retrieval failed: {err}")
+        return []
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            conn.close()
+
+def _refresh_corp_directory(cursor, corp_codes):
+    """쓰기 트랜잭션 안에서 기업 목록 테이블의 연도 정보를 다시 계산합니다."""
+    for corp_code in corp_codes:
+        cursor.execute(f"""
+            SELECT corp_name, year FROM {TABLE_NAME}
+            WHERE corp_code = %s GROUP BY corp_name, year ORDER BY year DESC
+        """, (corp_code,))
+        rows = cursor.fetchall()
+        
+        if not rows:
+            cursor.execute(f"DELETE FROM {DIRECTORY_TABLE_NAME} WHERE corp_code = %s", (corp_code,))
+            continue
+        
+        years = list(dict.fromkeys(row[1] for row in rows if row[1] is not None))
+        cursor.execute(backend.upsert(DIRECTORY_TABLE_NAME, ['corp_code', 'corp_name', 'years', 'latest_year'], ['corp_code']),
+                       (corp_code, rows[0][0], json.dumps(years), years[0] if years else None))
+
+@metrics.timed('db.rebuild_corp_directory')
+def rebuild_corp_directory():
+    """기존 데이터로 기업 목록 테이블을 다시 만듭니다. (테이블 추가 이전에 저장된 데이터용)"""
+    conn = None
+    cursor = None
+    try:
+        conn = get_conn()
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT DISTINCT corp_code FROM {TABLE_NAME}")
+        corp_codes = [row[0] for row in cursor.fetchall()]
+        cursor.execute(f"DELETE FROM {DIRECTORY_TABLE_NAME}")
+        _refresh_corp_directory(cursor, corp_codes)
+        conn.commit()
+        return True
+    except DBError as err:
+        print(f"Corp directory rebuild failed: {err}")
+        if conn:
+            conn.rollback()
+        return False
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            conn.close()
+
+@metrics.timed('db.get_corp_directory')
+def get_corp_directory():
+    """
+    저장된 기업 목록을 조회합니다.
+    
+    Returns:
+        list: [(corp_code, corp_name, years, latest_year), ...] 기업 이름 오름차순 (years는 내림차순 리스트),
+              테이블이 없거나 실패 시 None
+    """
+    conn = None
+    cursor = None
+    try:
+        conn = get_conn()
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT corp_code, corp_name, years, latest_year FROM {DIRECTORY_TABLE_NAME}
+            ORDER BY corp_name ASC
+        """)
+        return [
+            (row[0], row[1], json.loads(row[2]) if row[2] else [], row[3])
+            for row in cursor.fetchall()
+        ]
+    except DBError as err:
+        print(f"Corp directory retrieval failed: {err}")
+        return None
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            conn.close()
+
+@metrics.timed('db.find_corp_code')
+def find_corp_code(corp_name):
+    """
+    저장된 기업 목록에서 기업 이름으로 기업 코드를 찾습니다. (기업 코드 캐시가 준비되기 전의 대체 조회)
+    
+    Returns:
+        str: 기업 코드, 없거나 실패 시 None
+    """
+    conn = None
+    cursor = None
+    try:
+        conn = get_conn()
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT corp_code FROM {DIRECTORY_TABLE_NAME} WHERE corp_name = %s", (corp_name,))
+        row = cursor.fetchone()
+        return row[0] if row else None
+    except DBError as err:
+        print(f"Corp code lookup failed: {err}")
+        return None
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            conn.close()
+
+def _bump_data_versions(cursor, corps):
+    """
+    쓰기 트랜잭션 안에서 기업들의 데이터 버전을 올립니다.
+    버전은 전체 기업에 걸쳐 단조 증가하는 번호입니다.
+    
+    Args:
+        corps (list): [(corp_code, corp_name), ...]
+        
+    Returns:
+        list: [(corp_name, version, updated_at_epoch), ...] (커밋 후 data_version.publish_changes에 전달)
+    """
+    if not corps:
+        return []
+    
+    # 동시에 쓰는 다른 트랜잭션과 같은 번호를 받지 않도록 잠금
+    cursor.execute(f"SELECT COALESCE(MAX(version), 0) FROM {VERSION_TABLE_NAME}{backend.lock_clause}")
+    version = cursor.fetchone()[0]
+    
+    changes = []
+    for corp_code, corp_name in corps:
+        version += 1
+        updated_at = time.time()
+        cursor.execute(backend.upsert(VERSION_TABLE_NAME, ['corp_code', 'corp_name', 'version', 'updated_at'], ['corp_code']),
+                       (corp_code, corp_name, version, updated_at))
+        changes.append((corp_name, version, updated_at))
+    return changes
+
+@metrics.timed('db.get_data_versions_since')
+def get_data_versions_since(version):
+    """
+    주어진 버전 이후 데이터가 변경된 기업을 조회합니다.
+    
+    Returns:
+        list: [(corp_name, version, updated_at_epoch), ...] 버전 오름차순, 실패 시 None
+    """
+    conn = None
+    cursor = None
+    try:
+        conn = get_conn()
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT corp_name, version, updated_at FROM {VERSION_TABLE_NAME}
+            WHERE version > %s ORDER BY version
+        """, (version,))
+        return [(row[0], int(row[1]), float(row[2]) if row[2] is not None else None) for row in cursor.fetchall()]
+    except DBError as err:
+        print(f"Data version retrieval failed: {err}")
+        return None
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            conn.close()
+
+@metrics.timed('db.get_corp_list')
 def get_corp_list():
     """기업 리스트를 조회합니다."""
     conn = None
@@ -172,7 +770,7 @@ def get_corp_list():
         cursor.execute(f"SELECT DISTINCT corp_name FROM {TABLE_NAME} order by corp_name asc")
         result = cursor.fetchall()
         return result
-    except mysql.connector.Error as err:
+    except DBError as err:
         print(f"Corp list retrieval failed: {err}")
         return []
     finally:
@@ -181,6 +779,7 @@ def get_corp_list():
         if conn:
             conn.close()
 
+@metrics.timed('db.get_year_list')
 def get_year_list(corp_name):
     """연도 목록을 조회합니다."""
     conn = None
@@ -191,7 +790,7 @@ def get_year_list(corp_name):
         cursor.execute(f"SELECT DISTINCT year FROM {TABLE_NAME} WHERE corp_name = %s order by year desc", (corp_name,))
         result = cursor.fetchall()
         return result
-    except mysql.connector.Error as err:
+    except DBError as err:
         print(f"Year list retrieval failed: {err}")
         return []
     finally:
@@ -200,6 +799,7 @@ def get_year_list(corp_name):
         if conn:
             conn.close()
 
+@metrics.timed('db.get_jasan_data')
 def get_jasan_data(corp_name):
     """자산 데이터를 조회합니다."""
     conn = None
@@ -213,7 +813,7 @@ def get_jasan_data(corp_name):
                         """, (corp_name,))
         result = cursor.fetchall()
         return result
-    except mysql.connector.Error as err:
+    except DBError as err:
         print(f"Jasan data retrieval failed: {err}")
         return []
     finally:
@@ -222,6 +822,7 @@ def get_jasan_data(corp_name):
         if conn:
             conn.close()
 
+@metrics.timed('db.get_account_data_by_year')
 def get_account_data_by_year(corp_name, year):
     """특정 기업의 특정 연도 계정과목 데이터를 조회합니다."""
     conn = None
@@ -235,7 +836,7 @@ def get_account_data_by_year(corp_name, year):
         """, (corp_name, year))
         result = cursor.fetchall()
         return result
-    except mysql.connector.Error as err:
+    except DBError as err:
         print(f"Account data retrieval failed: {err}")
         return []
     finally:
@@ -244,6 +845,74 @@ def get_account_data_by_year(corp_name, year):
         if conn:
             conn.close()
 
+@metrics.timed('db.get_account_matrix_rows')
+def get_account_matrix_rows(corp_name, account_ids=None):
+    """
+    기업의 전체 기간 계정과목 데이터를 한 번의 쿼리로 조회합니다. (계정 x 연도 행렬용)
+    
+    Args:
+        corp_name (str): 기업 이름
+        account_ids (list): 조회할 계정과목 코드 (없으면 전체)
+        
+    Returns:
+        list: [(account_id, account_nm, year, amount), ...] 저장 순서
+    """
+    conn = None
+    cursor = None
+    try:
+        conn = get_conn()
+        cursor = conn.cursor()
+        query = f"SELECT account_id, account_nm, year, amount FROM {TABLE_NAME} WHERE corp_name = %s"
+        params = [corp_name]
+        if account_ids:
+            query += f" AND account_id IN ({', '.join(['%s'] * len(account_ids))})"
+            params.extend(account_ids)
+        cursor.execute(query + " ORDER BY id", params)
+        return cursor.fetchall()
+    except DBError as err:
+        print(f"Account matrix retrieval failed: {err}")
+        return []
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            conn.close()
+
+@metrics.timed('db.get_account_data_for_corps')
+def get_account_data_for_corps(corp_names, years):
+    """
+    여러 기업/연도의 계정과목 데이터를 한 번의 쿼리로 조회합니다.
+    
+    Returns:
+        list: [(corp_name, year, account_id, account_nm, amount), ...]
+    """
+    if not corp_names or not years:
+        return []
+    
+    conn = None
+    cursor = None
+    try:
+        conn = get_conn()
+        cursor = conn.cursor()
+        corp_placeholders = ", ".join(["%s"] * len(corp_names))
+        year_placeholders = ", ".join(["%s"] * len(years))
+        cursor.execute(f"""
+            SELECT corp_name, year, account_id, account_nm, amount FROM {TABLE_NAME}
+            WHERE corp_name IN ({corp_placeholders}) AND year IN ({year_placeholders})
+            ORDER BY corp_name, year, id
+        """, (*corp_names, *years))
+        result = cursor.fetchall()
+        return result
+    except DBError as err:
+        print(f"Batch account data retrieval failed: {err}")
+        return []
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            conn.close()
+
+@metrics.timed('db.get_all_data')
 def get_all_data():
     """모든 기업의 전체 기간 재무상태표를 조회합니다."""
     conn = None
@@ -257,7 +926,7 @@ def get_all_data():
                         """)
         result = cursor.fetchall()
         return result
-    except mysql.connector.Error as err:
+    except DBError as err:
         print(f"All data retrieval failed: {err}")
         return []
     finally:
@@ -266,6 +935,105 @@ def get_all_data():
         if conn:
             conn.close()
 
+@metrics.timed('db.get_all_data_frame')
+def get_all_data_frame():
+    """
+    모든 기업의 전체 기간 재무상태표를 DataFrame으로 조회합니다. (내보내기용)
+    DuckDB 백엔드에서는 결과를 행 튜플로 만들지 않고 열 단위로 바로 변환합니다.
+    
+    Returns:
+        DataFrame: corp_name, account_id, account_nm, amount, year 컬럼, 실패 시 None
+    """
+    conn = None
+    cursor = None
+    try:
+        conn = get_conn()
+        cursor = conn.cursor()
+        cursor.execute(f"""
+                        SELECT corp_name, account_id, account_nm, amount, year FROM {TABLE_NAME}
+                        ORDER BY corp_name, year
+                        """)
+        return cursor.fetch_df()
+    except DBError as err:
+        print(f"All data retrieval failed: {err}")
+        return None
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            conn.close()
+
+@metrics.timed('db.get_account_frame')
+def get_account_frame(account_ids):
+    """
+    지정한 계정과목 코드의 데이터만 DataFrame으로 조회합니다.
+    
+    Returns:
+        DataFrame: corp_name, account_id, account_nm, amount, year 컬럼, 실패 시 None
+    """
+    conn = None
+    cursor = None
+    try:
+        conn = get_conn()
+        cursor = conn.cursor()
+        placeholders = ", ".join(["%s"] * len(account_ids))
+        cursor.execute(f"""
+            SELECT corp_name, account_id, account_nm, amount, year FROM {TABLE_NAME}
+            WHERE account_id IN ({placeholders})
+            ORDER BY corp_name, year
+        """, list(account_ids))
+        return cursor.fetch_df()
+    except DBError as err:
+        print(f"Account data retrieval failed: {err}")
+        return None
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            conn.close()
+
+@metrics.timed('db.get_account_pivot')
+def get_account_pivot(account_ids):
+    """
+    기업/연도별로 지정한 계정과목 금액을 한 행에 펼친 피벗을 DB에서 계산합니다.
+    지정한 계정이 하나도 없는 기업/연도와, 어느 기업에도 없는 계정 컬럼은 제외합니다.
+    
+    Returns:
+        DataFrame: corp_name, year, 계정과목 코드별 금액 컬럼 (없는 값은 NaN), 실패 시 None
+    """
+    conn = None
+    cursor = None
+    try:
+        conn = get_conn()
+        cursor = conn.cursor()
+        # 계정과목 코드에 '-' 등이 있어 별칭은 a0, a1...로 두고 조회 후 이름을 바꿈
+        columns = ", ".join(
+            f"SUM(CASE WHEN account_id = %s THEN amount END) AS a{i}" for i in range(len(account_ids))
+        )
+        placeholders = ", ".join(["%s"] * len(account_ids))
+        cursor.execute(f"""
+            SELECT corp_name, year, {columns} FROM {TABLE_NAME}
+            WHERE account_id IN ({placeholders})
+            GROUP BY corp_name, year
+            ORDER BY corp_name, year
+        """, list(account_ids) + list(account_ids))
+        df = cursor.fetch_df()
+    except DBError as err:
+        print(f"Account pivot retrieval failed: {err}")
+        return None
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            conn.close()
+    
+    df = df.rename(columns={f"a{i}": account_id for i, account_id in enumerate(account_ids)})
+    values = df.columns[2:]
+    df[values] = df[values].astype(float)
+    df = df.dropna(axis=1, how='all')
+    return df[["corp_name", "year"] + sorted(df.columns[2:])]
+
+@metrics.timed('db.get_data_for_compare')
 def get_data_for_compare(corp_name, year):
     """기업 비교 기능을 위한 데이터 조회"""
     conn = None
@@ -289,6 +1057,7 @@ def get_data_for_compare(corp_name, year):
         if conn:
             conn.close()
 
+@metrics.timed('db.get_pie_data')
 def get_pie_data(corp_name, year):
     """
     파이 차트용 자본총계와 부채총계 데이터를 조회합니다.
@@ -325,7 +1094,7 @@ def get_pie_data(corp_name, year):
                     'amount': amount
                 }
         return data
-    except mysql.connector.Error as err:
+    except DBError as err:
         print(f"Pie data retrieval failed: {err}")
         return {}
     finally:
@@ -2,116 +2,188 @@
 재무 데이터 처리 서비스 모듈
 데이터베이스 삽입, 내보내기, 비교, 재무지표 계산 등 담당
 """
-import pandas as pd
-import math
 from app import db
-from app.api_service import get_finance_dataframe_10years
+from app.api_service import (FINANCE_YEARS, REPORT_CODES, SJ_DIVS, get_corp_code, get_finance_dataframe_10years,
+                             get_report_dataframe)
 
 
 def prepare_data_for_insert(corp_name):
     """
     기업 이름을 받아서 데이터베이스 삽입을 위한 데이터를 준비합니다.
+    이미 저장된 기업이면 저장된 최근 연도 이후와 새 보고서에 다시 실린 이전 연도만 조회합니다. (증분 동기화, 보통 DART 요청 1회)
     
     Args:
         corp_name (str): 기업 이름
         
     Returns:
         tuple: (success: bool, message: str, insert_values: list, is_update: bool)
+               is_update이면 insert_values는 교체할 연도의 행만 포함 (save_finance_rows로 저장)
     """
     if not corp_name:
         return False, '기업 이름이 필요합니다.', None, False
     
     try:
-        df = get_finance_dataframe_10years(corp_name)
-        
-        if df.empty:
-            return False, '저장할 데이터가 없습니다.', None, False
-        
-        corp_code = df.iloc[0]['corp_code'] if not df.empty else None
+        corp_code = get_corp_code(corp_name)
         if not corp_code:
             return False, '기업 코드를 찾을 수 없습니다.', None, False
         
-        latest_year_to_insert = int(df['year'].max())
         db_latest_year = db.get_latest_year_by_corp_code(corp_code)
+        df = get_finance_dataframe_10years(corp_name, after_year=db_latest_year)
         
-        if db_latest_year is not None and db_latest_year == latest_year_to_insert:
-            return False, '이미 데이터가 등록된 기업입니다.', None, False
+        if df is None or df.empty:
+            if db_latest_year is not None:
+                return False, '이미 데이터가 등록된 기업입니다.', None, False
+            return False, '저장할 데이터가 없습니다.', None, False
         
-        is_update = False
-        if db_latest_year is not None and db_latest_year != latest_year_to_insert:
-            delete_success = db.delete_data_by_corp_code(corp_code)
-            if not delete_success:
-                return False, '기존 데이터 삭제 중 오류가 발생했습니다.', None, False
-            is_update = True
+        insert_values = make_insert_rows(df)
         
-        insert_values = []
-        for row in df.to_dict('records'):
-            amount = row.get('amount')
-            year = row.get('year')
-            
-            if amount is None or (isinstance(amount, float) and math.isnan(amount)):
-                amount_value = None
-            else:
-                try:
-                    amount_value = int(float(amount))
-                except (ValueError, TypeError):
-                    amount_value = None
-            
-            if year is None or (isinstance(year, float) and math.isnan(year)):
-                year_value = None
-            else:
-                try:
-                    year_value = int(float(year))
-                except (ValueError, TypeError):
-                    year_value = None
-            
-            account_id = row.get('account_id', '')
-            if account_id is None or (isinstance(account_id, float) and math.isnan(account_id)) or account_id == '':
-                account_id_value = None
-            else:
-                account_id_value = str(account_id)
-            
-            insert_values.append((
-                row.get('corp_name', ''),
-                row.get('corp_code', ''),
-                account_id_value,
-                row.get('account_nm', ''),
-                amount_value,
-                year_value
-            ))
+        return True, '', insert_values, db_latest_year is not None
+    
+    except Exception as e:
+        return False, f'데이터 준비 중 오류가 발생했습니다: {str(e)}', None, False
+
+
+def save_finance_rows(rows, is_update):
+    """
+    prepare_data_for_insert 결과를 저장합니다.
+    갱신이면 받은 연도의 행을 한 트랜잭션 안에서 교체하고, 보관 범위(FINANCE_YEARS)보다 오래된 연도는 지웁니다.
+    
+    Returns:
+        bool: 성공 여부
+    """
+    if not is_update:
+        return db.insert_data(rows)
+    years = sorted({row[5] for row in rows if row[5] is not None})
+    return db.replace_data_by_corp_code(rows[0][1], rows, years, min_year=years[-1] - (FINANCE_YEARS - 1))
+
+
+def prepare_report_data_for_insert(corp_name, period='FY', fs_div='CFS', sj_divs=None):
+    """
+    반기/분기보고서, 별도재무제표, 손익계산서/현금흐름표 등 보고서별 재무제표를 저장용으로 준비합니다.
+    prepare_data_for_insert와 같이 저장된 최근 연도 이후만 조회합니다.
+    
+    Args:
+        corp_name (str): 기업 이름
+        period (str): 'FY', 'H1', 'Q1', 'Q3'
+        fs_div (str): 'CFS' 또는 'OFS'
+        sj_divs (tuple): 재무제표 구분 (None이면 전체, 사업보고서 연결 재무상태표는 corp_finance에 저장되므로 제외)
+        
+    Returns:
+        tuple: (success: bool, message: str, insert_values: list, is_update: bool)
+    """
+    if not corp_name:
+        return False, '기업 이름이 필요합니다.', None, False
+    if period not in REPORT_CODES:
+        return False, f'알 수 없는 보고서 기간입니다: {period}', None, False
+    
+    if sj_divs is None:
+        sj_divs = tuple(sj_div for sj_div in SJ_DIVS if (period, fs_div, sj_div) != ('FY', 'CFS', 'BS'))
+    
+    try:
+        corp_code = get_corp_code(corp_name)
+        if not corp_code:
+            return False, '기업 코드를 찾을 수 없습니다.', None, False
         
-        return True, '', insert_values, is_update
+        db_latest_year = db.get_latest_year_by_corp_code(corp_code, period, fs_div)
+        df = get_report_dataframe(corp_name, period, fs_div, sj_divs, after_year=db_latest_year)
+        
+        if df is None or df.empty:
+            if db_latest_year is not None:
+                return False, '이미 최신 보고서가 등록된 기업입니다.', None, False
+            return False, '저장할 데이터가 없습니다.', None, False
+        
+        return True, '', make_insert_rows(df, REPORT_INSERT_COLUMNS), db_latest_year is not None
     
     except Exception as e:
         return False, f'데이터 준비 중 오류가 발생했습니다: {str(e)}', None, False
 
 
+# DB 삽입 행의 열 순서 (db.insert_data, db.insert_report_data)
+INSERT_COLUMNS = ['corp_name', 'corp_code', 'account_id', 'account_nm', 'amount', 'year']
+REPORT_INSERT_COLUMNS = db.REPORT_COLUMNS
+
+
+def _int_values(df, column):
+    """숫자 열을 정수 리스트로 변환합니다. (소수점 이하 버림, 숫자가 아니거나 비어 있으면 None)"""
+    import numpy as np
+    import pandas as pd
+    if column not in df.columns:
+        return [None] * len(df)
+    
+    values = pd.to_numeric(df[column], errors='coerce')
+    if values.dtype.kind == 'f':
+        # int(float(x))처럼 0 방향으로 버리고, 정수로 바꿀 수 없는 inf는 결측으로 처리
+        values = np.trunc(values.where(np.isfinite(values)))
+    # nullable Int64를 거쳐 결측은 None, 값은 파이썬 int로 꺼냄 (DB 드라이버가 numpy 정수를 받지 못함)
+    return values.astype('Int64').to_numpy(dtype=object, na_value=None).tolist()
+
+
+def _text_values(df, column, empty_as_none=False):
+    """문자열 열을 리스트로 변환합니다. (결측은 None, empty_as_none이면 빈 문자열도 None)"""
+    if column not in df.columns:
+        return [None if empty_as_none else ''] * len(df)
+    
+    values = df[column]
+    missing = values.isna()
+    if empty_as_none:
+        missing |= values.astype(str) == ''
+    return values.astype(str).astype(object).where(~missing, None).tolist()
+
+
+def make_insert_rows(df, columns=INSERT_COLUMNS):
+    """
+    재무제표 DataFrame을 db.insert_data(또는 insert_report_data)에 넘길 행 목록으로 변환합니다.
+    행마다 반복하지 않고 열 단위로 한 번에 변환한 뒤 묶습니다.
+    
+    Args:
+        df (pd.DataFrame): get_finance_dataframe_10years() 또는 get_report_dataframe() 결과
+        columns (list): 행의 열 순서 (INSERT_COLUMNS 또는 REPORT_INSERT_COLUMNS)
+        
+    Returns:
+        list: [(corp_name, corp_code, account_id, account_nm, amount, year, ...), ...]
+              amount, year는 int 또는 None, account_id는 빈 값이면 None
+    """
+    values = []
+    for column in columns:
+        if column in ('amount', 'year'):
+            values.append(_int_values(df, column))
+        else:
+            values.append(_text_values(df, column, empty_as_none=column == 'account_id'))
+    return list(zip(*values))
+
+
 def export_data_to_csv():
     """데이터베이스의 모든 데이터를 CSV 형식으로 내보냅니다."""
-    rows = db.get_all_data()
+    import pandas as pd
+    df = db.get_all_data_frame()
+    if df is None:
+        df = pd.DataFrame(columns=["corp_name", "account_id", "account_nm", "amount", "year"])
     
-    df = pd.DataFrame(rows, columns=[
+    df.columns = [
         "기업 이름",
         "계정과목 코드",
         "회계 항목명",
         "금액",
         "년도"
-    ])
+    ]
     
     return df
 
 
 def export_data_to_json():
     """데이터베이스의 모든 데이터를 JSON 형식으로 내보냅니다."""
-    rows = db.get_all_data()
+    import pandas as pd
+    df = db.get_all_data_frame()
+    if df is None:
+        df = pd.DataFrame(columns=["corp_name", "account_id", "account_nm", "amount", "year"])
     
-    df = pd.DataFrame(rows, columns=[
+    df.columns = [
         "기업 이름",
         "계정과목 코드",
         "회계 항목명",
         "금액",
         "년도"
-    ])
+    ]
     
     json_str = df.to_json(force_ascii=False, orient="records", indent=4)
     return json_str
@@ -197,6 +269,7 @@ def calculate_financial_indicators(rows):
 
 def make_compare_table(compare_list):
     """비교 테이블 생성 함수"""
+    import pandas as pd
     dfs = []
 
     for item in compare_list:
@@ -262,8 +335,51 @@ def make_compare_table(compare_list):
     return result[final_cols]
 
 
+def make_account_matrix(corp_name, account_ids=None):
+    """
+    기업의 계정과목 x 연도 금액 행렬을 만듭니다.
+    계정 순서는 최근 연도 재무상태표의 순서를 따르고, 최근 연도에 없는 계정은 뒤에 붙습니다.
+    
+    Args:
+        corp_name (str): 기업 이름
+        account_ids (list): 포함할 계정과목 코드 (없으면 전체)
+    
+    Returns:
+        dict: {'corp_name', 'years'(오름차순), 'account_ids', 'accounts'(계정명),
+               'amounts'(계정별로 연도 순서의 금액 리스트, 없는 값은 None)}, 데이터가 없으면 {}
+    """
+    import pandas as pd
+    rows = db.get_account_matrix_rows(corp_name, account_ids)
+    if not rows:
+        return {}
+    
+    df = pd.DataFrame([tuple(row) for row in rows], columns=["account_id", "account_nm", "year", "amount"])
+    # account_id가 없는 계정은 계정명으로 구분
+    df["key"] = df["account_id"].fillna("nm:" + df["account_nm"].fillna(""))
+    
+    years = sorted(df["year"].dropna().unique().tolist())
+    latest_first = df.sort_values("year", ascending=False, kind="mergesort")
+    accounts = latest_first.drop_duplicates("key")[["key", "account_id", "account_nm"]]
+    
+    matrix = (
+        df.drop_duplicates(["key", "year"])
+        .pivot(index="key", columns="year", values="amount")
+        .reindex(index=accounts["key"], columns=years)
+        .astype("Int64")
+    )
+    
+    return {
+        "corp_name": corp_name,
+        "years": [int(year) for year in years],
+        "account_ids": accounts["account_id"].astype(object).where(accounts["account_id"].notna(), None).tolist(),
+        "accounts": accounts["account_nm"].tolist(),
+        "amounts": matrix.to_numpy(dtype=object, na_value=None).tolist(),
+    }
+
+
 def make_chart_data(compare_list):
     """차트용 데이터 생성"""
+    import pandas as pd
     dfs = []
 
     for item in compare_list:
@@ -301,6 +417,26 @@ def make_chart_data(compare_list):
     return chart_data
 
 
+VIEW_COLUMNS = ['account_nm', 'amount']
+
+
+def paginate_view_rows(corp_name, rows, sort=None, order='asc', q='', cursor=None, limit=None):
+    """
+    view 페이지 재무상태표 행(account_id, account_nm, amount)을 한 페이지씩 잘라 반환합니다.
+    커서는 기업 데이터 버전에 묶여 있어 데이터가 갱신되면 처음부터 다시 불러와야 합니다.
+    
+    Returns:
+        dict: pagination.paginate 결과 (columns: 계정명, 금액)
+    """
+    import pandas as pd
+    from app import pagination
+    from app.data_version import get_data_version
+    
+    df = pd.DataFrame([tuple(row) for row in rows], columns=['account_id', 'account_nm', 'amount'])
+    return pagination.paginate(df, VIEW_COLUMNS, str(get_data_version(corp_name)), sort, order, q, cursor,
+                               limit or pagination.PAGE_SIZE, filter_columns=['account_nm', 'account_id'])
+
+
 def prepare_view_data(corp_name, selected_year, years):
     """
     view 페이지용 데이터 준비
@@ -0,0 +1,95 @@
+"""
+GA4 Measurement Protocol 스텁 수집기
+테스트/개발 시 실제 GA4 대신 이벤트를 받아 메모리에 보관합니다.
+
+사용 예:
+    python -m app.ga4_stub --port 8765
+    GA4_ENDPOINT=http://127.0.0.1:8765/mp/collect MEASUREMENT_ID=G-TEST API_SECRET=test python app.py
+"""
+import argparse
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubCollector:
+    """
+    로컬 GA4 수집기. with 문으로 사용하면 백그라운드에서 서버를 띄우고 종료 시 정리합니다.
+
+        with StubCollector() as collector:
+            os.environ['GA4_ENDPOINT'] = collector.endpoint
+            ...
+            collector.events  # 수신한 이벤트 목록
+    """
+
+    def __init__(self, host='127.0.0.1', port=0):
+        self.payloads = []
+        self._lock = threading.Lock()
+        collector = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                body = self.rfile.read(length)
+                try:
+                    payload = json.loads(body or b'{}')
+                except ValueError:
+                    payload = None
+                if payload is not None:
+                    with collector._lock:
+                        collector.payloads.append(payload)
+                # 실제 GA4와 마찬가지로 본문 없는 204 응답
+                self.send_response(204 if payload is not None else 400)
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self._thread = None
+
+    @property
+    def endpoint(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/mp/collect"
+
+    @property
+    def events(self):
+        with self._lock:
+            return [event for payload in self.payloads for event in payload.get('events', [])]
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 GA4 스텁 수집기를 실행합니다.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    collector = StubCollector(args.host, args.port)
+    print(f"GA4 스텁 수집기 실행 중: {collector.endpoint}")
+    try:
+        collector.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        collector.server.server_close()
+        print(f"수신한 이벤트: {len(collector.events)}개")
+
+
+if __name__ == '__main__':
+    main()
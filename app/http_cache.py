@@ -0,0 +1,94 @@
+"""
+HTTP 응답 캐시 모듈
+기업 데이터 버전으로 ETag를 만들어 304 Not Modified를 처리하고,
+같은 버전의 JSON 응답은 프로세스 메모리에서 바로 반환합니다.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from flask import current_app, request
+
+from app.data_version import get_data_version, get_last_modified, add_invalidation_listener
+
+
+RESPONSE_CACHE_MAX_ENTRIES = 1024
+
+# 요청 경로 -> (기업 이름, 데이터 버전, JSON 바이트)
+_response_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _make_etag(corp_name, version, key):
+    digest = hashlib.sha1(f"{corp_name}|{version}|{key}".encode('utf-8')).hexdigest()
+    return digest[:32]
+
+
+def _get_cached(key, version):
+    with _cache_lock:
+        entry = _response_cache.get(key)
+        if entry is None or entry[1] != version:
+            return None
+        _response_cache.move_to_end(key)
+        return entry[2]
+
+
+def _put_cached(key, corp_name, version, body):
+    with _cache_lock:
+        _response_cache[key] = (corp_name, version, body)
+        _response_cache.move_to_end(key)
+        while len(_response_cache) > RESPONSE_CACHE_MAX_ENTRIES:
+            _response_cache.popitem(last=False)
+
+
+def invalidate(corp_name, version=None):
+    """기업의 캐시된 응답을 모두 제거합니다."""
+    with _cache_lock:
+        for key in [k for k, entry in _response_cache.items() if entry[0] == corp_name]:
+            del _response_cache[key]
+
+
+def cached_json_response(corp_name, build, empty=None):
+    """
+    기업 데이터 버전 기반으로 캐싱되는 JSON 응답을 만듭니다.
+
+    Args:
+        corp_name (str): 응답 데이터가 속한 기업 이름 (버전 조회 키)
+        build (callable): 캐시에 없을 때 응답 데이터를 만드는 함수
+                          (결과가 없으면 None 또는 빈 dict/list를 반환, 빈 리스트만 담은 dict는 빈 결과로 보지 않음)
+        empty: build가 None을 반환했을 때 보낼 응답 데이터 (기본값 {})
+
+    Returns:
+        Response: ETag/Last-Modified/Cache-Control이 설정된 응답 (조건부 요청이면 304)
+    """
+    key = request.full_path
+    version = get_data_version(corp_name)
+    etag = _make_etag(corp_name, version, key)
+
+    body = None
+    # 클라이언트가 같은 ETag를 가지고 있으면 본문을 만들 필요 없이 304로 응답
+    if etag not in request.if_none_match:
+        body = _get_cached(key, version)
+        if body is None:
+            data = build()
+            if not data:
+                # 빈 결과는 DB 오류일 수도 있으므로 캐시하지 않고 ETag도 붙이지 않음
+                if data is None:
+                    data = {} if empty is None else empty
+                return current_app.response_class(json.dumps(data, ensure_ascii=False).encode('utf-8'),
+                                                  mimetype='application/json')
+            body = json.dumps(data, ensure_ascii=False, default=str).encode('utf-8')
+            _put_cached(key, corp_name, version, body)
+
+    response = current_app.response_class(body or b'', mimetype='application/json')
+    response.set_etag(etag)
+    response.last_modified = datetime.fromtimestamp(get_last_modified(corp_name), tz=timezone.utc)
+    # 항상 재검증하되, 데이터가 바뀌지 않았으면 304로 본문 전송 생략
+    response.cache_control.public = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+add_invalidation_listener(invalidate)
@@ -0,0 +1,287 @@
+"""
+계측(프로파일링) 모듈
+DB 쿼리, DART 호출, ML/PDF/OCR 진입점, 라우트 실행 시간을 구간(span)으로 측정합니다.
+
+- 요청별 구간 합계: METRICS_SERVER_TIMING=true이면 Server-Timing 응답 헤더로 내보냄
+  (브라우저 개발자 도구 Network > Timing 탭에서 확인)
+- 누적 히스토그램: /metrics 에서 Prometheus 텍스트 형식으로 제공 (워커 프로세스별 값)
+- 프로세스 메모리: /metrics 에 USS(이 프로세스만 쓰는 메모리)/PSS/공유 메모리를 함께 제공 (Linux)
+- 백그라운드 작업 게이지: register_collector()로 등록한 함수의 값을 /metrics 에 함께 제공 (예: app/refresher.py)
+- 샘플링 프로파일러: PROFILE_REQUESTS=true일 때 요청에 ?_profile=1 또는 X-Profile: 1 헤더를 붙이면
+  해당 요청의 스택을 주기적으로 샘플링하여 flamegraph.pl/speedscope용 collapsed stack 파일로 저장
+"""
+import functools
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from flask import g, has_request_context, request
+
+
+SERVER_TIMING_ENABLED = os.environ.get('METRICS_SERVER_TIMING', 'False').lower() == 'true'
+PROFILE_ENABLED = os.environ.get('PROFILE_REQUESTS', 'False').lower() == 'true'
+PROFILE_DIR = os.environ.get(
+    'PROFILE_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'instance', 'profiles')
+)
+PROFILE_INTERVAL = float(os.environ.get('PROFILE_INTERVAL', 0.005))
+
+# Prometheus 기본 버킷 (초)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+SPAN_METRIC = 'app_span_duration_seconds'
+REQUEST_METRIC = 'http_request_duration_seconds'
+MEMORY_METRIC = 'process_memory_bytes'
+
+# (메트릭 이름, 라벨 튜플) -> [버킷별 개수..., 합계, 개수]
+_histograms = {}
+_lock = threading.Lock()
+# /metrics를 만들 때 호출하는 다른 모듈의 게이지 수집 함수 (register_collector)
+_collectors = []
+
+
+def _observe(metric, labels, seconds):
+    key = (metric, labels)
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = [0] * len(BUCKETS) + [0.0, 0]
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                hist[i] += 1
+                break
+        hist[-2] += seconds
+        hist[-1] += 1
+
+
+def record_span(name, seconds):
+    """구간 측정값을 히스토그램과 현재 요청의 구간 목록에 기록합니다."""
+    _observe(SPAN_METRIC, (('span', name),), seconds)
+    if has_request_context():
+        spans = g.setdefault('_metric_spans', {})
+        total, count = spans.get(name, (0.0, 0))
+        spans[name] = (total + seconds, count + 1)
+
+
+class span:
+    """
+    실행 시간을 구간으로 측정하는 컨텍스트 매니저
+
+        with metrics.span('dart.fnlttSinglAcntAll'):
+            response = requests.get(...)
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        record_span(self.name, time.perf_counter() - self.started)
+        return False
+
+
+def timed(name):
+    """함수 실행 시간을 구간으로 측정하는 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record_span(name, time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+# --- 샘플링 프로파일러 ---
+
+class StackSampler:
+    """
+    대상 스레드의 호출 스택을 일정 간격으로 샘플링하여 collapsed stack 형식으로 모읍니다.
+    (한 줄에 "바깥함수;안쪽함수 샘플수", flamegraph.pl과 speedscope에서 바로 열 수 있음)
+    """
+
+    def __init__(self, thread_id, interval=PROFILE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self.samples[';'.join(reversed(stack))] += 1
+
+    def dump(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def _profile_requested():
+    return PROFILE_ENABLED and (request.args.get('_profile') == '1' or request.headers.get('X-Profile') == '1')
+
+
+# --- Flask 연동 ---
+
+def _before_request():
+    g._metric_started = time.perf_counter()
+    g._metric_spans = {}
+    if _profile_requested():
+        g._metric_sampler = StackSampler(threading.get_ident()).start()
+
+
+def _after_request(response):
+    started = g.pop('_metric_started', None)
+    if started is None:
+        return response
+
+    elapsed = time.perf_counter() - started
+    endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+    _observe(REQUEST_METRIC, (('endpoint', endpoint), ('method', request.method), ('status', str(response.status_code))), elapsed)
+
+    sampler = g.pop('_metric_sampler', None)
+    if sampler:
+        sampler.stop()
+        filename = f"{time.strftime('%Y%m%d_%H%M%S')}_{request.endpoint or 'unmatched'}_{os.getpid()}.folded"
+        path = os.path.join(PROFILE_DIR, filename)
+        sampler.dump(path)
+        response.headers['X-Profile-File'] = filename
+        print(f"프로파일 저장: {path} (샘플 {sum(sampler.samples.values())}개)")
+
+    if SERVER_TIMING_ENABLED:
+        # 스트리밍 응답은 본문 생성 전에 헤더가 나가므로 라우트 본문 실행 시간까지만 포함됨
+        entries = [f'total;dur={elapsed * 1000:.1f}']
+        for name, (total, count) in sorted(g.get('_metric_spans', {}).items(), key=lambda item: -item[1][0]):
+            safe_name = ''.join(c if c.isalnum() or c in '-_' else '_' for c in name)
+            entries.append(f'{safe_name};dur={total * 1000:.1f};desc="{name} x{count}"')
+        response.headers['Server-Timing'] = ', '.join(entries)
+    return response
+
+
+def _format_labels(labels, extra=None):
+    items = list(labels) + ([extra] if extra else [])
+    escaped = [(k, str(v).replace('\\', '\\\\').replace('"', '\\"')) for k, v in items]
+    return '{' + ','.join(f'{k}="{v}"' for k, v in escaped) + '}'
+
+
+def process_memory(pid='self'):
+    """
+    /proc/<pid>/smaps_rollup에서 프로세스 메모리 사용량을 읽습니다. (Linux 4.14+, 읽을 수 없으면 None)
+
+    Returns:
+        dict: 바이트 단위 {'rss', 'pss', 'uss', 'shared'}
+              uss: Private_Clean + Private_Dirty (이 프로세스만 쓰는 메모리, 워커를 늘릴 때마다 추가되는 양)
+              shared: Shared_Clean + Shared_Dirty (fork 후 마스터/다른 워커와 copy-on-write로 공유 중인 페이지)
+    """
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            lines = f.readlines()
+    except OSError:
+        return None
+
+    fields = {}
+    for line in lines:
+        parts = line.split()
+        if len(parts) == 3 and parts[2] == 'kB':
+            fields[parts[0].rstrip(':')] = int(parts[1]) * 1024
+    return {
+        'rss': fields.get('Rss', 0),
+        'pss': fields.get('Pss', 0),
+        'uss': fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0),
+        'shared': fields.get('Shared_Clean', 0) + fields.get('Shared_Dirty', 0),
+    }
+
+
+def register_collector(collect):
+    """
+    /metrics에 내보낼 값을 만드는 함수를 등록합니다. (백그라운드 작업의 진행 상황 등)
+    collect()는 [(메트릭 이름, 타입('gauge'/'counter'), 설명, [(라벨 튜플, 값), ...]), ...]를 반환합니다.
+    """
+    if collect not in _collectors:
+        _collectors.append(collect)
+
+
+def _render_collected(lines):
+    for collect in list(_collectors):
+        try:
+            families = collect()
+        except Exception as e:
+            print(f"경고: 메트릭 수집 실패 ({getattr(collect, '__module__', collect)}): {e}")
+            continue
+        for metric, kind, description, samples in families:
+            lines.append(f'# HELP {metric} {description}')
+            lines.append(f'# TYPE {metric} {kind}')
+            for labels, value in samples:
+                lines.append(f'{metric}{_format_labels(labels) if labels else ""} {value}')
+
+
+def render_prometheus():
+    """누적 히스토그램을 Prometheus 텍스트 형식으로 만듭니다."""
+    with _lock:
+        snapshot = {key: list(hist) for key, hist in _histograms.items()}
+
+    lines = []
+    descriptions = {
+        SPAN_METRIC: '내부 구간(DB 쿼리, DART 호출, 서비스 진입점) 실행 시간',
+        REQUEST_METRIC: 'HTTP 요청 처리 시간 (스트리밍 응답은 본문 전송 전까지)',
+    }
+    for metric in (REQUEST_METRIC, SPAN_METRIC):
+        keys = sorted(key for key in snapshot if key[0] == metric)
+        if not keys:
+            continue
+        lines.append(f'# HELP {metric} {descriptions[metric]}')
+        lines.append(f'# TYPE {metric} histogram')
+        for key in keys:
+            labels = key[1]
+            hist = snapshot[key]
+            cumulative = 0
+            for bound, count in zip(BUCKETS, hist):
+                cumulative += count
+                lines.append(f'{metric}_bucket{_format_labels(labels, ("le", bound))} {cumulative}')
+            lines.append(f'{metric}_bucket{_format_labels(labels, ("le", "+Inf"))} {hist[-1]}')
+            lines.append(f'{metric}_sum{_format_labels(labels)} {hist[-2]:.6f}')
+            lines.append(f'{metric}_count{_format_labels(labels)} {hist[-1]}')
+
+    memory = process_memory()
+    if memory:
+        lines.append(f'# HELP {MEMORY_METRIC} 이 워커 프로세스의 메모리 (uss: 고유, shared: copy-on-write 공유, pss: 비례 배분)')
+        lines.append(f'# TYPE {MEMORY_METRIC} gauge')
+        for kind in ('rss', 'pss', 'uss', 'shared'):
+            lines.append(f'{MEMORY_METRIC}{_format_labels((("kind", kind), ("pid", os.getpid())))} {memory[kind]}')
+    _render_collected(lines)
+    return '\n'.join(lines) + '\n'
+
+
+def init_app(app):
+    """Flask 앱에 요청 계측 훅과 /metrics 엔드포인트를 등록합니다."""
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+
+    @app.route('/metrics')
+    def metrics():
+        return app.response_class(render_prometheus(), mimetype='text/plain; version=0.0.4')
@@ -4,22 +4,12 @@
 """
 import pandas as pd
 import numpy as np
-from app import db
+from app import db, metrics
 
 
+@metrics.timed('ml.scikit')
 def scikit():
     """머신러닝용 데이터 준비"""
-    rows = db.get_all_data()
-    
-    if not rows:
-        raise ValueError("저장된 재무 데이터가 없습니다. 먼저 기업 데이터를 저장해주세요.")
-    
-    df = pd.DataFrame(rows, columns=["corp_name", "account_id", "account_nm", "amount", "year"])
-    df = df[df["account_id"].notna()].copy()
-    
-    if df.empty:
-        raise ValueError("계정과목 코드가 있는 데이터가 없습니다.")
-    
     TARGET_IDS = [
         "ifrs-full_Assets",
         "ifrs-full_Equity",
@@ -43,25 +33,28 @@ def scikit():
         "ifrs-full_NoncontrollingInterests"
     ]
 
-    target_df = df[df["account_id"].isin(TARGET_IDS)]
-    feature_df = df[df["account_id"].isin(COMMON_IDS)]
+    # 피벗은 DB(DuckDB 백엔드에서는 열 기반 집계)에서 계산하고 필요한 계정만 가져옴
+    pivot = db.get_account_pivot(COMMON_IDS)
+    target_df = db.get_account_frame(TARGET_IDS)
+    
+    if pivot is None or target_df is None:
+        raise ValueError("재무 데이터를 조회하지 못했습니다. 데이터베이스 연결을 확인해주세요.")
+    
+    if pivot.empty and target_df.empty:
+        raise ValueError("저장된 재무 데이터가 없습니다. 먼저 기업 데이터를 저장해주세요.")
     
     if target_df.empty:
         raise ValueError("목표 계정 ID(자산총계, 자본총계, 부채총계) 데이터가 없습니다.")
     
-    if feature_df.empty:
+    if pivot.empty:
         raise ValueError("입력 계정 ID 데이터가 없습니다.")
 
-    pivot = feature_df.pivot_table(
-        index=["corp_name","year"],
-        columns="account_id",
-        values="amount",
-        aggfunc="sum"
-    ).fillna(0).reset_index()
+    pivot = pivot.fillna(0)
     
     return pivot, target_df
 
 
+@metrics.timed('ml.train_model')
 def train_model(pivot, target_df):
     """모델 학습"""
     from sklearn.linear_model import LinearRegression
@@ -193,6 +186,7 @@ def train_model(pivot, target_df):
     }
 
 
+@metrics.timed('ml.predict_company')
 def predict_company(model, pivot, corp_name, COMMON_IDS, TARGET_IDS, target_year=None):
     """기업의 재무 지표를 예측합니다."""
     corp_data = pivot[pivot["corp_name"] == corp_name].copy()
@@ -2,53 +2,167 @@
 OCR 서비스 모듈
 이미지 텍스트 추출 담당
 """
-import easyocr
-import base64
+import hashlib
+import os
+import threading
+import time
+
+import cv2
 import numpy as np
-from PIL import Image
-from io import BytesIO
+
+from app import metrics
 
 
 _ocr_reader = None
 
+# 미리보기 썸네일 (내용 해시 -> JPEG 파일)
+# 어느 워커가 /ocr/thumbnail 요청을 받아도 찾을 수 있도록 디스크에 저장
+THUMBNAIL_DIR = os.environ.get(
+    'OCR_THUMBNAIL_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'instance', 'ocr_thumbnails')
+)
+THUMBNAIL_MAX_SIZE = 480
+THUMBNAIL_TTL = 600  # 10분 (초 단위)
+THUMBNAIL_MAX_ENTRIES = 64
+
+_thumbnail_lock = threading.Lock()
 
+
+@metrics.timed('ocr.get_ocr_reader')
 def get_ocr_reader():
     """EasyOCR Reader를 지연 로딩합니다"""
     global _ocr_reader
     if _ocr_reader is None:
+        import easyocr
         _ocr_reader = easyocr.Reader(['ko', 'en'], gpu=False)
     return _ocr_reader
 
 
+def decode_image(buffer):
+    """
+    업로드 바이트를 복사 없이 NumPy 배열로 한 번만 디코딩합니다.
+    EasyOCR이 bytes 입력을 처리하는 방식과 동일하게 RGB 컬러 배열로 반환합니다. (OpenCV 기본 BGR에서 변환)
+    """
+    encoded = np.frombuffer(buffer, dtype=np.uint8)
+    img_array = cv2.imdecode(encoded, cv2.IMREAD_COLOR)
+    if img_array is None:
+        return None
+    return cv2.cvtColor(img_array, cv2.COLOR_BGR2RGB)
+
+
+def _thumbnail_path(key):
+    return os.path.join(THUMBNAIL_DIR, f"{key}.jpg")
+
+
+def _prune_thumbnails(now):
+    """만료되었거나 개수 제한을 넘은 오래된 썸네일 파일을 삭제합니다."""
+    entries = []
+    try:
+        names = os.listdir(THUMBNAIL_DIR)
+    except OSError:
+        return
+    for name in names:
+        if not name.endswith('.jpg'):
+            continue
+        path = os.path.join(THUMBNAIL_DIR, name)
+        try:
+            entries.append((os.stat(path).st_mtime, path))
+        except OSError:
+            continue
+
+    entries.sort(reverse=True)
+    for index, (mtime, path) in enumerate(entries):
+        if index >= THUMBNAIL_MAX_ENTRIES or now - mtime > THUMBNAIL_TTL:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def _store_thumbnail(key, img_array):
+    """디코딩된 RGB 이미지로 미리보기용 JPEG 썸네일을 만들어 디스크에 저장합니다."""
+    path = _thumbnail_path(key)
+    try:
+        # 같은 이미지를 다시 올리면 만료 시각만 연장
+        os.utime(path, None)
+        return
+    except OSError:
+        pass
+
+    height, width = img_array.shape[:2]
+    scale = min(1.0, THUMBNAIL_MAX_SIZE / max(height, width))
+    if scale < 1.0:
+        thumb = cv2.resize(img_array, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA)
+    else:
+        thumb = img_array
+
+    # cv2.imencode는 BGR 순서를 기대하므로 작은 썸네일만 다시 변환
+    ok, encoded = cv2.imencode('.jpg', cv2.cvtColor(thumb, cv2.COLOR_RGB2BGR), [cv2.IMWRITE_JPEG_QUALITY, 80])
+    if not ok:
+        return
+
+    os.makedirs(THUMBNAIL_DIR, exist_ok=True)
+    # 다른 워커가 쓰는 중인 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(encoded.tobytes())
+    os.replace(tmp_path, path)
+
+    with _thumbnail_lock:
+        _prune_thumbnails(time.time())
+
+
+def get_thumbnail(key):
+    """
+    내용 해시로 미리보기 썸네일을 조회합니다.
+
+    Returns:
+        bytes: JPEG 썸네일, 없거나 만료된 경우 None
+    """
+    # 키는 sha256 hex만 허용 (경로 조작 방지)
+    if len(key) != 64 or any(c not in '0123456789abcdef' for c in key):
+        return None
+
+    path = _thumbnail_path(key)
+    try:
+        with open(path, 'rb') as f:
+            if time.time() - os.fstat(f.fileno()).st_mtime > THUMBNAIL_TTL:
+                return None
+            return f.read()
+    except OSError:
+        # 다른 워커가 정리하면서 삭제한 경우
+        return None
+
+
+@metrics.timed('ocr.process_image')
 def process_image(file):
     """
     이미지 파일을 처리하여 텍스트를 추출합니다.
-    
+
     Args:
         file: 업로드된 파일 객체
-    
+
     Returns:
-        tuple: (image_data_uri: str, text_lines: list)
+        tuple: (thumbnail_key: str, text_lines: list)
     """
     if not file:
         return None, None
-    
-    image_bytes = BytesIO()
-    file.save(image_bytes)
-    image_bytes.seek(0)
-    
-    image_base64 = base64.b64encode(image_bytes.read()).decode('utf-8')
-    image_bytes.seek(0)
-    
-    file_ext = file.filename.rsplit('.', 1)[-1].lower() if '.' in file.filename else 'png'
-    mime_type = f'image/{file_ext}' if file_ext in ['jpg', 'jpeg', 'png', 'gif'] else 'image/png'
-    image_data_uri = f'data:{mime_type};base64,{image_base64}'
-    
-    img = Image.open(image_bytes)
-    img_array = np.array(img)
-    
+
+    # 업로드 스트림을 한 번만 읽고, 이후 해시/디코딩은 같은 버퍼를 공유
+    buffer = file.stream.read()
+    if not buffer:
+        return None, None
+
+    thumbnail_key = hashlib.sha256(buffer).hexdigest()
+
+    img_array = decode_image(buffer)
+    del buffer
+    if img_array is None:
+        raise ValueError("이미지 파일을 읽을 수 없습니다.")
+
+    _store_thumbnail(thumbnail_key, img_array)
+
     reader = get_ocr_reader()
     text_lines = reader.readtext(img_array, detail=0)
-    
-    return image_data_uri, text_lines
 
+    return thumbnail_key, text_lines
@@ -0,0 +1,159 @@
+"""
+렌더링 결과 디스크 캐시 모듈
+(기업, 연도, 데이터 버전)으로 주소가 정해지는 PDF/차트 PNG 파일을 보관하고,
+전체 크기가 한도를 넘으면 가장 오래 사용되지 않은 파일부터 삭제합니다.
+"""
+import hashlib
+import os
+import shutil
+import threading
+
+from app.data_version import add_invalidation_listener
+
+
+CACHE_DIR = os.environ.get(
+    'OUTPUT_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'instance', 'output_cache')
+)
+MAX_BYTES = int(os.environ.get('OUTPUT_CACHE_MAX_BYTES', 200 * 1024 * 1024))
+# 다른 워커가 쓴 파일도 반영하도록 이 횟수만큼 저장한 뒤에는 디렉토리를 다시 훑어 전체 크기를 맞춤
+RESCAN_INTERVAL = int(os.environ.get('OUTPUT_CACHE_RESCAN_INTERVAL', 64))
+
+_evict_lock = threading.Lock()
+# 이 프로세스가 추적하는 캐시 전체 크기 (None이면 다음 저장 때 디렉토리를 훑어 계산)
+_total_bytes = None
+_puts_since_scan = 0
+
+
+def _corp_dir(corp_name):
+    """기업별 하위 디렉토리 (무효화 시 통째로 삭제)"""
+    corp_hash = hashlib.sha256(corp_name.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, corp_hash)
+
+
+def _entry_path(kind, corp_name, year, version):
+    key = hashlib.sha256(f"{kind}|{corp_name}|{year}|{version}".encode('utf-8')).hexdigest()
+    return os.path.join(_corp_dir(corp_name), f"{key}.{kind}")
+
+
+def get(kind, corp_name, year, version):
+    """
+    캐시된 파일을 열어 반환합니다.
+    경로 대신 열린 파일을 돌려주므로, 다른 요청이 무효화/정리로 파일을 지워도 읽기(send_file 등)는 끝까지 성공합니다.
+
+    Args:
+        kind (str): 'pdf' 또는 'png'
+        corp_name (str): 기업 이름
+        year (str): 연도
+        version (int): 데이터 버전
+
+    Returns:
+        file: 바이너리 읽기 모드로 연 파일 (호출한 쪽에서 닫음), 캐시에 없으면 None
+    """
+    path = _entry_path(kind, corp_name, year, version)
+    try:
+        f = open(path, 'rb')
+    except OSError:
+        return None
+    try:
+        # LRU 판단을 위해 접근 시각 갱신
+        os.utime(f.fileno(), None)
+    except OSError:
+        pass
+    return f
+
+
+def put(kind, corp_name, year, version, data):
+    """
+    렌더링 결과를 캐시에 저장합니다.
+
+    Args:
+        data (bytes): 저장할 파일 내용
+    """
+    path = _entry_path(kind, corp_name, year, version)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    try:
+        replaced = os.stat(path).st_size
+    except OSError:
+        replaced = 0
+
+    # 다른 요청이 쓰는 중인 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+    _account(len(data) - replaced)
+
+
+def _account(delta):
+    """저장한 크기를 전체 크기에 더하고, 한도를 넘었거나 다시 훑을 때가 되면 정리합니다. (매 저장마다 디렉토리를 훑지 않음)"""
+    global _total_bytes, _puts_since_scan
+    with _evict_lock:
+        _puts_since_scan += 1
+        if _total_bytes is not None and _puts_since_scan < RESCAN_INTERVAL:
+            _total_bytes += delta
+            if _total_bytes <= MAX_BYTES:
+                return
+        _evict()
+
+
+def _evict():
+    """
+    디렉토리를 훑어 전체 크기를 다시 계산하고, MAX_BYTES를 넘으면 오래 사용되지 않은 파일부터 한도의 90%까지 삭제합니다.
+    _evict_lock을 잡은 상태에서 호출합니다.
+    """
+    global _total_bytes, _puts_since_scan
+    entries = []
+    total = 0
+    for root, _, files in os.walk(CACHE_DIR):
+        for name in files:
+            if name.endswith('.tmp'):
+                continue
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+    if total > MAX_BYTES:
+        # 한도 바로 아래까지만 지우면 다음 저장마다 다시 훑게 되므로 90%까지 비움
+        target = MAX_BYTES * 0.9
+        entries.sort()
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    _total_bytes = total
+    _puts_since_scan = 0
+
+
+def invalidate(corp_name, version=None):
+    """기업의 캐시된 렌더링 결과를 모두 삭제합니다."""
+    global _total_bytes
+    corp_dir = _corp_dir(corp_name)
+    removed = 0
+    try:
+        names = os.listdir(corp_dir)
+    except OSError:
+        return
+    for name in names:
+        try:
+            removed += os.stat(os.path.join(corp_dir, name)).st_size
+        except OSError:
+            pass
+    shutil.rmtree(corp_dir, ignore_errors=True)
+    with _evict_lock:
+        if _total_bytes is not None:
+            _total_bytes = max(0, _total_bytes - removed)
+
+
+add_invalidation_listener(invalidate)
@@ -0,0 +1,162 @@
+"""
+결과 표 페이지네이션 모듈
+/search(DART 조회 결과)와 /view(DB 재무상태표) 표를 한 번에 모두 렌더링하지 않고,
+첫 페이지만 HTML로 보낸 뒤 나머지는 커서 기반 JSON API로 나누어 보냅니다.
+
+정렬/필터는 서버에서 적용하며, 커서에는 위치와 함께 (데이터 스냅샷, 정렬, 필터) 지문을 넣어
+데이터가 바뀌었거나 조건이 달라진 커서로 엉뚱한 페이지를 받지 않도록 합니다.
+"""
+import base64
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# DART 검색 결과 캐시 (같은 기업의 다음 페이지 요청마다 DART API를 다시 호출하지 않도록)
+SEARCH_RESULT_TTL = 600
+SEARCH_RESULT_MAX_ENTRIES = 32
+
+# corp_name -> (생성 시각, 스냅샷 ID, DataFrame)
+_search_results = OrderedDict()
+_search_lock = threading.Lock()
+
+
+class CursorError(ValueError):
+    """커서가 잘못되었거나 현재 데이터/조건과 맞지 않을 때 발생"""
+
+
+def get_search_result(corp_name, refresh=False):
+    """
+    기업의 최근 10년치 DART 조회 결과를 캐시에서 가져오거나 새로 조회합니다.
+
+    Args:
+        corp_name (str): 기업 이름
+        refresh (bool): True면 캐시를 무시하고 다시 조회
+
+    Returns:
+        tuple: (스냅샷 ID(frame_snapshot), DataFrame)
+    """
+    now = time.time()
+    if not refresh:
+        with _search_lock:
+            entry = _search_results.get(corp_name)
+            if entry and now - entry[0] < SEARCH_RESULT_TTL:
+                _search_results.move_to_end(corp_name)
+                return entry[1], entry[2]
+
+    from app.api_service import get_finance_dataframe_10years
+    df = get_finance_dataframe_10years(corp_name).reset_index(drop=True)
+    snapshot = frame_snapshot(df)
+
+    with _search_lock:
+        _search_results[corp_name] = (now, snapshot, df)
+        _search_results.move_to_end(corp_name)
+        while len(_search_results) > SEARCH_RESULT_MAX_ENTRIES:
+            _search_results.popitem(last=False)
+    return snapshot, df
+
+
+def frame_snapshot(df):
+    """
+    DataFrame 내용(컬럼, 값, 순서)으로 스냅샷 ID를 만듭니다.
+    캐시는 워커 프로세스마다 따로 있으므로, 다른 워커가 같은 데이터를 다시 조회해도 같은 ID가 나와 커서가 그대로 유효합니다.
+    """
+    import pandas as pd
+    digest = hashlib.sha1('|'.join(map(str, df.columns)).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()[:12]
+
+
+def _fingerprint(snapshot, sort, order, q):
+    return hashlib.sha1(f"{snapshot}|{sort}|{order}|{q}".encode('utf-8')).hexdigest()[:12]
+
+
+def encode_cursor(offset, fingerprint):
+    payload = json.dumps({'o': offset, 'f': fingerprint}, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, fingerprint):
+    """커서에서 시작 위치를 꺼냅니다. 지문이 다르면 CursorError"""
+    if not cursor:
+        return 0
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        offset = int(payload['o'])
+    except (ValueError, KeyError, TypeError):
+        raise CursorError("잘못된 커서입니다.")
+    if payload.get('f') != fingerprint or offset < 0:
+        raise CursorError("데이터 또는 정렬/필터 조건이 바뀌었습니다. 처음부터 다시 불러와주세요.")
+    return offset
+
+
+def parse_page_args(args):
+    """요청 인자에서 (sort, order, q, cursor, limit)를 읽습니다."""
+    sort = args.get('sort') or None
+    order = 'desc' if args.get('order') == 'desc' else 'asc'
+    q = (args.get('q') or '').strip()
+    cursor = args.get('cursor') or None
+    try:
+        limit = int(args.get('limit', PAGE_SIZE))
+    except (TypeError, ValueError):
+        limit = PAGE_SIZE
+    return sort, order, q, cursor, max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def paginate(df, columns, snapshot, sort=None, order='asc', q='', cursor=None, limit=PAGE_SIZE,
+             filter_columns=None):
+    """
+    DataFrame에 필터/정렬을 적용하고 커서 위치부터 한 페이지를 잘라 반환합니다.
+
+    Args:
+        df (DataFrame): 전체 결과
+        columns (list): 응답에 포함할 컬럼 (정렬 가능한 컬럼이기도 함)
+        snapshot (str): 데이터 스냅샷 식별자 (데이터 버전, 검색 결과 ID 등)
+        sort (str): 정렬 컬럼 (없으면 원래 순서)
+        order (str): 'asc' 또는 'desc'
+        q (str): 필터 검색어 (filter_columns 중 하나에 포함되면 통과, 대소문자 무시)
+        cursor (str): 이전 응답의 next_cursor (없으면 처음부터)
+        limit (int): 페이지 크기
+        filter_columns (list): 필터를 적용할 문자열 컬럼 (없으면 columns 중 문자열 컬럼)
+
+    Returns:
+        dict: {'columns', 'rows'(행마다 값 리스트), 'total'(필터 후 전체 행 수), 'next_cursor'}
+    """
+    import pandas as pd
+    if sort not in columns:
+        sort = None
+    fingerprint = _fingerprint(snapshot, sort, order, q)
+    offset = decode_cursor(cursor, fingerprint)
+
+    view = df
+    if q:
+        if filter_columns is None:
+            filter_columns = [c for c in columns if df[c].dtype == object]
+        mask = pd.Series(False, index=df.index)
+        for column in filter_columns:
+            mask |= df[column].astype(str).str.contains(q, case=False, regex=False, na=False)
+        view = df[mask]
+
+    if sort:
+        # 안정 정렬로 같은 값은 원래 순서를 유지하여 페이지 경계가 흔들리지 않도록 함
+        view = view.sort_values(sort, ascending=(order != 'desc'), kind='mergesort', na_position='last')
+
+    total = len(view)
+    page = view.iloc[offset:offset + limit][columns]
+    rows = [
+        [None if pd.isna(value) else (value.item() if hasattr(value, 'item') else value) for value in row]
+        for row in page.itertuples(index=False, name=None)
+    ]
+
+    next_offset = offset + len(rows)
+    return {
+        'columns': columns,
+        'rows': rows,
+        'total': total,
+        'next_cursor': encode_cursor(next_offset, fingerprint) if next_offset < total else None,
+    }
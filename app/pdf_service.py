@@ -2,17 +2,15 @@
 PDF 생성 서비스 모듈
 PDF 차트 이미지 및 문서 생성 담당
 """
-import pandas as pd
 from io import BytesIO
+from app import db, metrics, output_cache, renderer
+from app.data_version import get_data_version
 
 
+@metrics.timed('pdf.generate_pdf_chart_image')
 def generate_pdf_chart_image(rows, selected_corp, selected_year):
     """PDF용 차트 이미지를 생성합니다."""
-    import matplotlib
-    matplotlib.use('Agg')
-    import matplotlib.pyplot as plt
-    from matplotlib import font_manager, rc
-    
+    import pandas as pd
     important_account_ids = [
         "ifrs-full_Assets",
         "ifrs-full_CurrentAssets",
@@ -33,67 +31,71 @@ def generate_pdf_chart_image(rows, selected_corp, selected_year):
     if not filtered_rows:
         filtered_rows = rows
     
-    font_path = "C:/Windows/Fonts/malgun.ttf"
-    font_name = font_manager.FontProperties(fname=font_path).get_name()
-    rc('font', family=font_name)
-    plt.rcParams['axes.unicode_minus'] = False
-    
     data = [(r[1], r[2]) for r in filtered_rows]
     df = pd.DataFrame(data, columns=["account_nm", "amount"])
     
-    accounts = df["account_nm"]
-    amounts = df["amount"]
-    
-    plt.bar(accounts, amounts)
-    plt.xticks(rotation=60, ha="right")
-    plt.title(f"{selected_corp} {selected_year}년 재무상태표 주요 항목", fontsize=14, pad=20)
-    plt.xlabel("계정과목")
-    plt.ylabel("금액(원)")
-    
-    img_buffer = BytesIO()
-    plt.savefig(img_buffer, format='png', dpi=300, bbox_inches='tight', transparent=True)
-    plt.close()
-    
-    img_buffer.seek(0)
-    return img_buffer
+    return renderer.render_bar_chart(
+        df["account_nm"],
+        df["amount"],
+        title=f"{selected_corp} {selected_year}년 재무상태표 주요 항목",
+        xlabel="계정과목",
+        ylabel="금액(원)"
+    )
 
 
+@metrics.timed('pdf.generate_pdf_document')
 def generate_pdf_document(rows, selected_corp, selected_year, chart_image_buffer):
     """PDF 문서를 생성합니다."""
     from reportlab.lib.pagesizes import A4
     from reportlab.pdfgen import canvas
-    from reportlab.pdfbase import pdfmetrics
-    from reportlab.pdfbase.ttfonts import TTFont
-    from reportlab.lib.utils import ImageReader
     
     buffer = BytesIO()
     c = canvas.Canvas(buffer, pagesize=A4)
-    width, height = A4
+
+    draw_report_pages(c, rows, selected_corp, selected_year, chart_image_buffer)
+
+    c.save()
+    buffer.seek(0)
     
-    pdfmetrics.registerFont(
-        TTFont("Malgun", "C:/Windows/Fonts/malgun.ttf")
-    )
+    return buffer
+
+
+def draw_report_pages(c, rows, selected_corp, selected_year, chart_image_buffer):
+    """
+    캔버스에 기업 한 곳의 재무상태표 보고서를 그립니다.
+    여러 기업을 한 문서로 합칠 수 있도록 마지막 페이지까지 마무리합니다.
+
+    Returns:
+        int: 사용한 페이지 수
+    """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.utils import ImageReader
+    
+    font_name = renderer.get_pdf_font_name()
+    width, height = A4
+    pages = 1
 
     x = 50
     y = height - 50
 
-    c.setFont("Malgun", 16)
+    c.setFont(font_name, 16)
     c.drawString(x, y, f"{selected_corp} {selected_year}년 재무상태표")
     y -= 30
 
-    c.setFont("Malgun", 11)
+    c.setFont(font_name, 11)
     c.drawString(x, y, "계정과목")
     c.drawRightString(width - 50, y, "금액(원)")
     y -= 20
 
-    c.setFont("Malgun", 9)
+    c.setFont(font_name, 9)
 
     for row in rows:
         account_nm = row[1]
         amount = row[2]
         if y < 120:
             c.showPage()
-            c.setFont("Malgun", 9)
+            pages += 1
+            c.setFont(font_name, 9)
             y = height - 50
 
         c.drawString(x, y, str(account_nm))
@@ -108,9 +110,43 @@ def generate_pdf_document(rows, selected_corp, selected_year, chart_image_buffer
         width=500,
         height=250
     )
+    c.showPage()
 
-    c.save()
-    buffer.seek(0)
-    
-    return buffer
+    return pages
+
+
+@metrics.timed('pdf.build_pdf_report')
+def build_pdf_report(selected_corp, selected_year):
+    """
+    기업/연도별 PDF 파일을 캐시에서 찾거나 새로 생성합니다.
+    데이터가 다시 저장되기 전까지는 같은 파일을 그대로 재사용합니다.
+
+    Returns:
+        file: PDF 내용을 읽을 수 있는 파일 객체 (캐시 파일 또는 BytesIO, send_file이 닫음),
+              해당 연도 데이터가 없으면 None
+    """
+    version = get_data_version(selected_corp)
+
+    pdf_file = output_cache.get('pdf', selected_corp, selected_year, version)
+    if pdf_file:
+        return pdf_file
+
+    rows = db.get_account_data_by_year(selected_corp, selected_year)
+    if not rows:
+        return None
+
+    chart_file = output_cache.get('png', selected_corp, selected_year, version)
+    if chart_file:
+        with chart_file:
+            chart_image_buffer = BytesIO(chart_file.read())
+    else:
+        chart_image_buffer = generate_pdf_chart_image(rows, selected_corp, selected_year)
+        # 대체 폰트로 그린 결과는 캐시하지 않음 (폰트를 설치하면 바로 올바른 파일로 다시 생성)
+        if renderer.has_chart_font():
+            output_cache.put('png', selected_corp, selected_year, version, chart_image_buffer.getvalue())
 
+    pdf_buffer = generate_pdf_document(rows, selected_corp, selected_year, chart_image_buffer)
+    if renderer.has_chart_font() and renderer.has_pdf_font():
+        output_cache.put('pdf', selected_corp, selected_year, version, pdf_buffer.getvalue())
+    pdf_buffer.seek(0)
+    return pdf_buffer
@@ -0,0 +1,152 @@
+"""
+prefork 서버(gunicorn preload_app) 지원 모듈
+마스터 프로세스에서 읽기 전용 캐시(기업 코드 목록, 한글 폰트, 무거운 라이브러리)를 fork 전에 한 번만 로드하여
+워커들이 copy-on-write로 공유하도록 하고, fork 후 워커에서 백그라운드 스레드와 DB 핸들을 다시 준비합니다.
+gunicorn.conf.py의 훅에서 호출합니다.
+
+워커별 고유/공유 메모리 확인:
+    python -m app.prefork <마스터 PID>
+"""
+import argparse
+import gc
+import importlib
+import os
+import time
+
+from app import cache, db, metrics, refresher
+
+
+# fork 전에 마스터에서 import할 모듈 (코드와 모듈 상수를 워커들이 공유)
+PRELOAD_MODULES = [
+    name.strip() for name in os.environ.get(
+        'PRELOAD_MODULES',
+        'pandas,numpy,sklearn.linear_model,sklearn.metrics,sklearn.model_selection,'
+        'app.finance_service,app.pagination,app.pdf_service,app.ml_service'
+    ).split(',') if name.strip()
+]
+PRELOAD_FONTS = os.environ.get('PRELOAD_FONTS', 'True').lower() == 'true'
+# EasyOCR 모델 가중치(수백 MB)를 마스터에서 읽어 워커가 공유 (torch 스레드 풀이 fork 전에 만들어지므로 선택 사항)
+PRELOAD_OCR = os.environ.get('PRELOAD_OCR', 'False').lower() == 'true'
+# 기업 코드 캐시 로딩을 기다리는 시간 (넘으면 경고를 남기고 로딩 스레드가 끝날 때까지 기다린 뒤, 실패했으면 각 워커가 직접 로드)
+PRELOAD_CACHE_TIMEOUT = float(os.environ.get('PRELOAD_CACHE_TIMEOUT', 120))
+
+
+def _format_mb(value):
+    return f"{value / 1024 / 1024:.1f}MB"
+
+
+def log_memory(label, pid='self'):
+    """프로세스의 고유(USS)/공유/PSS 메모리를 한 줄로 출력합니다."""
+    memory = metrics.process_memory(pid)
+    if memory:
+        print(f"[메모리] {label}: USS {_format_mb(memory['uss'])}, 공유 {_format_mb(memory['shared'])}, "
+              f"PSS {_format_mb(memory['pss'])}, RSS {_format_mb(memory['rss'])}")
+    return memory
+
+
+def preload():
+    """
+    마스터 프로세스에서 fork 전에 호출합니다. (gunicorn when_ready 훅)
+    create_app()이 시작한 기업 코드 캐시 로딩이 끝나길 기다리고, 무거운 모듈과 폰트를 미리 로드합니다.
+    실행 중인 스레드가 잡고 있던 잠금(import 잠금, HTTP 연결 풀, 캐시 잠금 등)이 잠긴 채 워커에 복사되지 않도록
+    fork 전에 백그라운드 스레드를 모두 끝냅니다.
+    """
+    started = time.perf_counter()
+
+    try:
+        cache.wait_for_cache(PRELOAD_CACHE_TIMEOUT)
+        if cache.is_loading():
+            # DART 요청 timeout으로 끝나는 시점이 정해져 있으므로 끝날 때까지 기다림 (실패하면 워커에서 다시 로드)
+            print(f"[preload] 기업 코드 캐시를 {PRELOAD_CACHE_TIMEOUT:.0f}초 안에 로드하지 못했습니다. "
+                  "fork 전에 로딩 스레드가 끝나길 기다립니다.")
+        if cache.wait_for_cache():
+            print("[preload] 기업 코드 캐시 로드 완료 (워커와 공유)")
+        else:
+            print("[preload] 기업 코드 캐시를 로드하지 못해 워커에서 다시 로드합니다.")
+        # 마스터는 요청을 처리하지 않으므로 주기적 갱신은 각 워커에서만 실행
+        cache.stop_refresh_schedule(wait=True)
+        refresher.stop(wait=True)
+
+        for name in PRELOAD_MODULES:
+            try:
+                importlib.import_module(name)
+            except ImportError as e:
+                print(f"[preload] {name} 건너뜀: {e}")
+
+        if PRELOAD_FONTS:
+            from app import renderer
+            renderer.init_fonts()
+
+        if PRELOAD_OCR:
+            from app import ocr_service
+            ocr_service.get_ocr_reader()
+
+        # 지금까지 만든 객체를 GC 추적 대상에서 빼서, 워커의 GC가 참조 정보를 갱신하며 공유 페이지를 복사하지 않도록 함
+        gc.freeze()
+    finally:
+        # gunicorn.conf.py에서 앱 로드 전에 멈춘 GC를 다시 켬 (미리 로드 중 예외가 나도 워커가 GC 없이 fork되지 않도록)
+        gc.enable()
+
+    print(f"[preload] 완료 ({time.perf_counter() - started:.1f}초, 고정 객체 {gc.get_freeze_count():,}개)")
+    log_memory(f"마스터 {os.getpid()}")
+
+
+def after_fork():
+    """
+    fork된 워커 프로세스에서 호출합니다. (gunicorn post_fork 훅)
+    부모의 스레드는 자식에 복사되지 않으므로, 끝나지 않은 캐시 로딩과 주기적 갱신(기업 코드 목록, 오래된 기업 데이터)을 다시 시작하고
+    부모가 열어 둔 DB 핸들을 버립니다. (GA4 전송 스레드는 첫 이벤트 때 자동으로 시작)
+    """
+    db.backend.after_fork()
+    if cache.restart_after_fork():
+        print(f"[prefork] 워커 {os.getpid()}: 기업 코드 캐시 로딩을 다시 시작합니다.")
+    # 워커마다 시작하지만 잠금 파일로 한 번에 한 워커만 갱신 주기를 실행
+    refresher.restart_after_fork()
+
+
+def _child_pids(pid):
+    """/proc/<pid>/task/*/children에서 자식 프로세스 PID 목록을 읽습니다."""
+    children = []
+    task_dir = f'/proc/{pid}/task'
+    for tid in os.listdir(task_dir):
+        try:
+            with open(os.path.join(task_dir, tid, 'children')) as f:
+                children.extend(int(child) for child in f.read().split())
+        except OSError:
+            continue
+    return sorted(set(children))
+
+
+def worker_memory_report(master_pid):
+    """
+    마스터와 워커별 메모리 사용량을 반환합니다.
+
+    Returns:
+        list: [(역할, pid, process_memory 결과), ...]
+    """
+    rows = [('master', master_pid, metrics.process_memory(master_pid))]
+    rows.extend(('worker', pid, metrics.process_memory(pid)) for pid in _child_pids(master_pid))
+    return [row for row in rows if row[2]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="prefork 서버의 워커별 고유(USS)/공유 메모리를 출력합니다.")
+    parser.add_argument('master_pid', type=int, help="gunicorn 마스터 프로세스 PID")
+    args = parser.parse_args()
+
+    rows = worker_memory_report(args.master_pid)
+    if not rows:
+        parser.error(f"/proc/{args.master_pid}/smaps_rollup을 읽을 수 없습니다. (Linux 전용)")
+
+    print(f"{'역할':<8} {'PID':>8} {'USS':>10} {'공유':>10} {'PSS':>10} {'RSS':>10}")
+    for role, pid, memory in rows:
+        print(f"{role:<8} {pid:>8} {_format_mb(memory['uss']):>10} {_format_mb(memory['shared']):>10} "
+              f"{_format_mb(memory['pss']):>10} {_format_mb(memory['rss']):>10}")
+
+    total_pss = sum(memory['pss'] for _, _, memory in rows)
+    total_rss = sum(memory['rss'] for _, _, memory in rows)
+    print(f"\n실제 사용량(PSS 합계) {_format_mb(total_pss)} / 공유 없이 계산한 RSS 합계 {_format_mb(total_rss)}")
+
+
+if __name__ == '__main__':
+    main()
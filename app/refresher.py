@@ -0,0 +1,540 @@
+"""
+오래된 기업 데이터 백그라운드 갱신 모듈
+DB에 저장된 기업 중 최근 연도가 현재 공시 기준 연도(사업보고서가 나왔어야 하는 연도)보다 오래된 기업을 찾아
+우선순위 순서로 새 연도 데이터를 받아 저장합니다.
+
+- 변경 감지: 공시 목록(list.json)에서 저장된 커서 이후 접수된 사업보고서를 찾아, 저장된 기업 중 실제로 제출한 기업만
+  대기열에 넣고 갱신 (재무제표 요청 수 = 새 공시 수). 커서가 없는 첫 주기나 공시 목록 조회에 실패한 주기,
+  REFRESHER_POLL_FILINGS=false이면 오래된 기업 전체를 확인
+- DART 요청은 RateLimiter로 분당 요청 수를 제한하고, 하루 요청 수 한도를 넘지 않도록 주기를 멈춤
+- 기업마다 새 연도의 행을 한 트랜잭션 안에서 지우고 다시 넣음, 보관 범위(최근 10년)보다 오래된 연도는 삭제
+  (db.replace_data_by_corp_code)
+- 기업별 시도 결과, 재시도 시각, 주기별 진행 상황은 상태 파일(instance/refresher_state.json)에 저장하여
+  재시작해도 이어서 진행하고, 모든 워커의 /metrics 에서 같은 진행 상황을 보여줌
+- 갱신 주기는 요청을 처리하지 않는 데몬 스레드에서 실행하며(REFRESHER_ENABLED=true),
+  prefork 서버의 워커가 여러 개여도 잠금 파일로 한 프로세스만 주기를 실행
+
+별도 프로세스로 실행 (앱과 같은 DB 설정 사용, DuckDB는 한 프로세스만 열 수 있으므로 앱 안에서 실행):
+    python -m app.refresher              # 주기적으로 반복
+    python -m app.refresher --once       # 한 번만 실행
+    python -m app.refresher --dry-run    # 갱신 대상과 순서만 출력
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date
+
+from app import api_service, db, metrics
+
+
+# 앱에서는 Flask 앱 로거('app')의 하위 로거로 같은 핸들러를 사용, 단독 실행(main)은 basicConfig로 출력
+logger = logging.getLogger(__name__)
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 실행 (개발 서버는 프로세스 하나)
+    fcntl = None
+
+
+ENABLED = os.environ.get('REFRESHER_ENABLED', 'False').lower() == 'true'
+# 갱신 주기 (초)
+INTERVAL = float(os.environ.get('REFRESHER_INTERVAL', 6 * 3600))
+# 앱 시작 후 첫 주기까지 기다리는 시간 (초, 시작 직후의 기업 코드 로딩과 겹치지 않도록)
+START_DELAY = float(os.environ.get('REFRESHER_START_DELAY', 60))
+# DART 요청 제한 (분당 요청 수, 하루 요청 수) - 인증키 한도를 화면 요청과 나눠 쓰므로 한도보다 작게 설정
+REQUESTS_PER_MINUTE = float(os.environ.get('REFRESHER_REQUESTS_PER_MINUTE', 60))
+DAILY_REQUESTS = int(os.environ.get('REFRESHER_DAILY_REQUESTS', 5000))
+# 한 주기에 갱신할 최대 기업 수 (0이면 제한 없음)
+BATCH_SIZE = int(os.environ.get('REFRESHER_BATCH_SIZE', 0))
+# 아직 새 사업보고서가 없는 기업을 다시 확인하기까지의 시간 (초)
+NOT_FILED_RETRY = float(os.environ.get('REFRESHER_NOT_FILED_RETRY', 24 * 3600))
+# 실패한 기업의 첫 재시도 간격 (초, 실패할 때마다 두 배, 최대 MAX_FAILURE_RETRY)
+FAILURE_RETRY = float(os.environ.get('REFRESHER_FAILURE_RETRY', 3600))
+MAX_FAILURE_RETRY = 7 * 24 * 3600
+# 공시 목록으로 새 사업보고서를 낸 기업만 갱신 (false면 매 주기 오래된 기업 전체를 확인)
+POLL_FILINGS = os.environ.get('REFRESHER_POLL_FILINGS', 'True').lower() == 'true'
+# 사업보고서 제출 기한(사업연도 종료 후 90일)이 지나는 달 - 이 달부터 작년 사업보고서가 있어야 함
+FILING_MONTH = int(os.environ.get('REFRESHER_FILING_MONTH', 4))
+STATE_PATH = os.environ.get(
+    'REFRESHER_STATE',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'instance', 'refresher_state.json')
+)
+
+# 기업별 시도 결과
+UPDATED = 'updated'
+NOT_FILED = 'not_filed'
+FAILED = 'failed'
+RESULTS = (UPDATED, NOT_FILED, FAILED)
+
+# 공시 보고서명의 결산 기준월 (예: '사업보고서 (2024.12)', '[기재정정]사업보고서 (2024.12)')
+_REPORT_PERIOD_PATTERN = re.compile(r'\((\d{4})\.(\d{2})\)')
+
+_thread = None
+_stop = None
+
+
+def reporting_year(today=None):
+    """사업보고서가 나와 있어야 하는 가장 최근 사업연도를 반환합니다. (4월부터 작년, 그 전에는 재작년)"""
+    today = today or date.today()
+    return today.year - 1 if today.month >= FILING_MONTH else today.year - 2
+
+
+def _empty_state():
+    return {'companies': {}, 'cycle': None, 'totals': dict.fromkeys(RESULTS, 0), 'budget': {'date': None, 'requests': 0},
+            'filings': {'cursor': None, 'seen': [], 'polled_at': None}, 'pending': {}}
+
+
+def load_state():
+    """상태 파일을 읽습니다. (없거나 읽을 수 없으면 빈 상태)"""
+    try:
+        with open(STATE_PATH, encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return _empty_state()
+    return {**_empty_state(), **state}
+
+
+def save_state(state):
+    """상태 파일을 저장합니다. (임시 파일에 쓴 뒤 교체하므로 읽는 쪽은 항상 완전한 파일을 봄)"""
+    try:
+        os.makedirs(os.path.dirname(STATE_PATH) or '.', exist_ok=True)
+        temp_path = f"{STATE_PATH}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(temp_path, STATE_PATH)
+    except OSError as e:
+        logger.warning("갱신 상태 저장 실패: %s", e)
+
+
+@contextmanager
+def _cycle_lock():
+    """주기를 실행할 권한을 얻습니다. 다른 프로세스/스레드가 실행 중이면 False를 넘깁니다."""
+    os.makedirs(os.path.dirname(STATE_PATH) or '.', exist_ok=True)
+    with open(f"{STATE_PATH}.lock", 'a') as lock_file:
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                yield False
+                return
+        yield True
+
+
+def plan(rows, state, target_year, now=None):
+    """
+    갱신할 기업을 우선순위 순서로 고릅니다.
+    최근 연도가 target_year보다 오래된 기업 중 재시도 대기 중이 아닌 기업을
+    밀린 연도가 많은 순, 상장 기업, 마지막 시도가 오래된 순(처음이면 먼저), 이름 순으로 정렬합니다.
+
+    Args:
+        rows (list): db.get_corp_directory() 결과 [(corp_code, corp_name, years, latest_year), ...]
+        state (dict): load_state() 결과
+        target_year (int): reporting_year() 결과
+
+    Returns:
+        tuple: (stale 기업 수, [{'corp_code', 'corp_name', 'latest_year'}, ...])
+    """
+    now = time.time() if now is None else now
+    directory = api_service.get_directory()
+    listed = directory.by_code if directory is not None else {}
+    companies = state['companies']
+
+    stale = 0
+    queue = []
+    for corp_code, corp_name, _, latest_year in rows:
+        if latest_year is not None and latest_year >= target_year:
+            continue
+        stale += 1
+        entry = companies.get(corp_code) or {}
+        if entry.get('target_year') == target_year and entry.get('next_attempt', 0) > now:
+            continue
+        corp = listed.get(corp_code)
+        lag = target_year - latest_year if latest_year is not None else target_year
+        queue.append(((-lag, not (corp and corp.stock_code), entry.get('last_attempt') or 0, corp_name),
+                      {'corp_code': corp_code, 'corp_name': corp_name, 'latest_year': latest_year}))
+    queue.sort(key=lambda item: item[0])
+    return stale, [item for _, item in queue]
+
+
+def _filing_year(filing):
+    """공시의 사업연도 (보고서명의 결산 기준월, 없으면 접수 연도 - 1)"""
+    match = _REPORT_PERIOD_PATTERN.search(filing.get('report_nm') or '')
+    if match:
+        return int(match.group(1))
+    return int((filing.get('rcept_dt') or filing['rcept_no'])[:4]) - 1
+
+
+def _filing_corp_code(filing, directory):
+    """공시를 기업 코드 캐시의 corp_code로 연결합니다. (코드가 목록에 없으면 종목코드, 기업명 순으로 찾음)"""
+    corp_code = filing.get('corp_code')
+    if directory is None or corp_code in directory.by_code:
+        return corp_code
+    for query in (filing.get('stock_code'), filing.get('corp_name')):
+        found = directory.get_code(query) if query else None
+        if found:
+            return found
+    return None
+
+
+def poll_filings(state, stored, today):
+    """
+    커서 이후 접수된 사업보고서를 공시 목록에서 찾아, 저장된 기업만 갱신 대기열(state['pending'])에 넣습니다.
+    같은 날 나중에 접수된 공시를 놓치지 않도록 커서 날짜부터 다시 조회하고, 이미 본 접수번호는 건너뜁니다.
+
+    Args:
+        state (dict): load_state() 결과 (state['filings']['cursor']가 있어야 함)
+        stored (dict): corp_code -> (corp_name, latest_year) DB에 저장된 기업
+        today (date): 조회 종료일
+
+    Returns:
+        int: 대기열에 넣은 새 공시 수
+    """
+    filings_state = state['filings']
+    cursor = filings_state['cursor']
+    end_de = today.strftime('%Y%m%d')
+    seen = set(filings_state.get('seen') or [])
+    seen_today = seen if cursor == end_de else set()
+    directory = api_service.get_directory()
+    pending = state['pending']
+
+    found = 0
+    for filing in api_service.get_filings(cursor, end_de, api_service.FILING_TYPES['FY']):
+        rcept_no = filing.get('rcept_no') or ''
+        rcept_dt = filing.get('rcept_dt') or rcept_no[:8]
+        if rcept_dt < cursor or rcept_no in seen:
+            continue
+        if rcept_dt == end_de:
+            seen_today.add(rcept_no)
+
+        corp_code = _filing_corp_code(filing, directory)
+        if corp_code not in stored:
+            continue
+        bsns_year = _filing_year(filing)
+        previous = pending.get(corp_code)
+        if previous and previous['bsns_year'] > bsns_year:
+            continue
+        pending[corp_code] = {'bsns_year': bsns_year, 'rcept_no': rcept_no, 'rcept_dt': rcept_dt,
+                              'report_nm': filing.get('report_nm'), 'next_attempt': 0}
+        found += 1
+
+    filings_state.update(cursor=end_de, seen=sorted(seen_today), polled_at=time.time())
+    return found
+
+
+def plan_pending(state, stored, now=None):
+    """
+    공시 목록으로 찾은 갱신 대기열을 처리 순서대로 반환합니다. (상장 기업, 접수 순, 재시도 대기 중이면 제외)
+    DB에서 지워진 기업은 대기열에서 뺍니다.
+    """
+    now = time.time() if now is None else now
+    directory = api_service.get_directory()
+    listed = directory.by_code if directory is not None else {}
+    pending = state['pending']
+
+    queue = []
+    for corp_code in list(pending):
+        if corp_code not in stored:
+            del pending[corp_code]
+            continue
+        entry = pending[corp_code]
+        if entry.get('next_attempt', 0) > now:
+            continue
+        corp = listed.get(corp_code)
+        corp_name, latest_year = stored[corp_code]
+        queue.append(((not (corp and corp.stock_code), entry['rcept_no']),
+                      {'corp_code': corp_code, 'corp_name': corp_name, 'latest_year': latest_year,
+                       'bsns_year': entry['bsns_year']}))
+    queue.sort(key=lambda item: item[0])
+    return [item for _, item in queue]
+
+
+def refresh_company(corp_code, corp_name, latest_year, bsns_year=None):
+    """
+    기업 하나의 저장된 최근 연도 이후 데이터를 받아 저장합니다. (보통 DART 요청 1회)
+    bsns_year(공시 목록에서 찾은 사업보고서 연도)를 주면 그 연도부터 조회하고,
+    이미 저장된 연도(정정 공시 등)이면 그 연도만 다시 받아 교체합니다.
+
+    Returns:
+        tuple: (결과(UPDATED/NOT_FILED), 저장 후 최근 연도) - 실패하면 예외
+    """
+    from app.finance_service import make_insert_rows
+
+    after_year = latest_year
+    if bsns_year is not None and latest_year is not None and bsns_year <= latest_year:
+        after_year = bsns_year - 1
+    df = api_service.get_finance_dataframe_10years(corp_name, after_year=after_year, corp_code=corp_code,
+                                                   bsns_year=bsns_year)
+    if df is None or df.empty:
+        return NOT_FILED, latest_year
+
+    rows = make_insert_rows(df)
+    years = sorted({row[5] for row in rows})
+    newest_year = max(years[-1], latest_year or years[-1])
+    if not db.replace_data_by_corp_code(corp_code, rows, years if latest_year is not None else None,
+                                        min_year=newest_year - (api_service.FINANCE_YEARS - 1)):
+        raise RuntimeError("DB 저장 실패")
+    return UPDATED, newest_year
+
+
+def _record(state, item, result, target_year, latest_year, error=None, now=None):
+    now = time.time() if now is None else now
+    previous = state['companies'].get(item['corp_code']) or {}
+    failures = previous.get('failures', 0) + 1 if result == FAILED else 0
+    if result == UPDATED:
+        next_attempt = 0
+    elif result == NOT_FILED:
+        next_attempt = now + NOT_FILED_RETRY
+    else:
+        next_attempt = now + min(FAILURE_RETRY * 2 ** (failures - 1), MAX_FAILURE_RETRY)
+    state['companies'][item['corp_code']] = {
+        'corp_name': item['corp_name'], 'target_year': target_year, 'result': result, 'latest_year': latest_year,
+        'last_attempt': now, 'next_attempt': next_attempt, 'failures': failures, 'error': error,
+    }
+    state['totals'][result] = state['totals'].get(result, 0) + 1
+    state['cycle'][result] += 1
+    state['cycle']['done'] += 1
+
+
+def run_cycle(stop=None, limit=None, today=None, sweep=False):
+    """
+    갱신 주기를 한 번 실행합니다. 기업을 하나 처리할 때마다 상태 파일을 저장합니다.
+    POLL_FILINGS이면 공시 목록에서 새 사업보고서를 낸 기업만 갱신하고,
+    첫 주기(커서 없음), 공시 목록 조회 실패, sweep이면 오래된 기업 전체를 확인합니다.
+
+    Args:
+        stop (threading.Event): 설정되면 다음 기업으로 넘어가기 전에 멈춤
+        limit (int): 이번 주기에 처리할 최대 기업 수 (None이면 BATCH_SIZE)
+        today (date): 공시 기준 연도와 공시 조회 종료일 계산용 날짜 (None이면 오늘)
+        sweep (bool): 공시 목록과 관계없이 오래된 기업 전체를 확인
+
+    Returns:
+        dict: 이번 주기 요약 (state['cycle']), 다른 프로세스가 실행 중이거나 기업 목록을 읽지 못하면 None
+    """
+    with _cycle_lock() as acquired:
+        if not acquired:
+            logger.info("다른 프로세스에서 갱신 중이므로 이번 주기를 건너뜁니다.")
+            return None
+
+        rows = db.get_corp_directory()
+        if rows is None:
+            return None
+
+        state = load_state()
+        today = today or date.today()
+        budget = state['budget']
+        if budget.get('date') != today.isoformat():
+            budget.update(date=today.isoformat(), requests=0)
+
+        target_year = reporting_year(today)
+        stored = {corp_code: (corp_name, latest_year) for corp_code, corp_name, _, latest_year in rows}
+        cycle = state['cycle'] = {
+            'target_year': target_year, 'started_at': time.time(), 'finished_at': None, 'mode': 'sweep',
+            'filings': None, 'stale': 0, 'queued': 0, 'done': 0, 'requests': 0, 'stopped': None,
+            **dict.fromkeys(RESULTS, 0),
+        }
+
+        limiter = api_service.RateLimiter(REQUESTS_PER_MINUTE)
+        with api_service.rate_limited(limiter):
+            if POLL_FILINGS and not sweep:
+                if state['filings']['cursor'] is None:
+                    # 첫 주기: 이전 공시는 알 수 없으므로 전체를 확인하고 오늘부터 공시를 추적
+                    state['filings'].update(cursor=today.strftime('%Y%m%d'), seen=[])
+                elif budget['requests'] < DAILY_REQUESTS:
+                    try:
+                        cycle['filings'] = poll_filings(state, stored, today)
+                        cycle['mode'] = 'filings'
+                    except Exception as e:
+                        logger.warning("공시 목록 조회 실패, 오래된 기업 전체를 확인합니다: %s", e)
+                    cycle['requests'] += limiter.requests
+                    budget['requests'] += limiter.requests
+
+            stale, stale_queue = plan(rows, state, target_year)
+            queue = plan_pending(state, stored)
+            if cycle['mode'] == 'sweep':
+                queue += [item for item in stale_queue if item['corp_code'] not in state['pending']]
+            limit = BATCH_SIZE if limit is None else limit
+            if limit:
+                queue = queue[:limit]
+            cycle.update(stale=stale, queued=len(queue))
+            save_state(state)
+
+            for item in queue:
+                if stop is not None and stop.is_set():
+                    cycle['stopped'] = 'stopped'
+                    break
+                if budget['requests'] >= DAILY_REQUESTS:
+                    cycle['stopped'] = 'daily_budget'
+                    break
+
+                before = limiter.requests
+                try:
+                    result, latest_year = refresh_company(item['corp_code'], item['corp_name'], item['latest_year'],
+                                                          item.get('bsns_year'))
+                    _record(state, item, result, target_year, latest_year)
+                except Exception as e:
+                    logger.warning("%s(%s) 갱신 실패: %s", item['corp_name'], item['corp_code'], e)
+                    result = FAILED
+                    _record(state, item, FAILED, target_year, item['latest_year'], error=str(e))
+                if item['corp_code'] in state['pending']:
+                    # 공시는 됐지만 재무제표 API에 아직 없거나 실패하면 대기열에 남겨 재시도 간격 후 다시 시도
+                    if result == UPDATED:
+                        del state['pending'][item['corp_code']]
+                    else:
+                        state['pending'][item['corp_code']]['next_attempt'] = \
+                            state['companies'][item['corp_code']]['next_attempt']
+                used = limiter.requests - before
+                cycle['requests'] += used
+                budget['requests'] += used
+                save_state(state)
+
+        cycle['finished_at'] = time.time()
+        save_state(state)
+        source = f"새 공시 {cycle['filings']}건" if cycle['mode'] == 'filings' else "전체 확인"
+        logger.info("기준 연도 %s (%s): 오래된 기업 %d개, %d개 처리 (갱신 %d, 미공시 %d, 실패 %d, DART 요청 %d회)",
+                    target_year, source, stale, cycle['done'], cycle[UPDATED], cycle[NOT_FILED], cycle[FAILED],
+                    cycle['requests'])
+        return cycle
+
+
+def get_status(state=None):
+    """상태 파일의 요약을 반환합니다. (API 응답, /metrics용)"""
+    state = state or load_state()
+    now = time.time()
+    waiting = sum(1 for entry in state['companies'].values() if entry.get('next_attempt', 0) > now)
+    return {
+        'enabled': ENABLED,
+        'running': _thread is not None and _thread.is_alive(),
+        'cycle': state['cycle'],
+        'totals': state['totals'],
+        'budget': {**state['budget'], 'limit': DAILY_REQUESTS},
+        'waiting_retry': waiting,
+        'pending': len(state['pending']),
+        'filings': state['filings'] and {key: state['filings'].get(key) for key in ('cursor', 'polled_at')},
+    }
+
+
+def collect_metrics():
+    """/metrics용 갱신 진행 상황 (metrics.register_collector로 등록)"""
+    status = get_status()
+    cycle = status['cycle'] or {}
+    families = [
+        ('refresher_companies_total', 'counter', '백그라운드 갱신에서 처리한 기업 수 (결과별 누적)',
+         [((('result', result),), status['totals'].get(result, 0)) for result in RESULTS]),
+        ('refresher_waiting_retry', 'gauge', '재시도 시각을 기다리는 기업 수 (미공시/실패)',
+         [((), status['waiting_retry'])]),
+        ('refresher_dart_requests', 'gauge', '백그라운드 갱신의 DART 요청 수 (오늘/현재 주기)',
+         [((('window', 'day'),), status['budget']['requests']), ((('window', 'cycle'),), cycle.get('requests', 0))]),
+        ('refresher_pending_companies', 'gauge', '새 사업보고서를 냈지만 아직 갱신하지 못한 기업 수 (공시 목록 대기열)',
+         [((), status['pending'])]),
+    ]
+    if status['filings'].get('polled_at'):
+        families.append(('refresher_filings_polled_timestamp_seconds', 'gauge', '마지막 공시 목록 조회 시각',
+                         [((), f"{status['filings']['polled_at']:.0f}")]))
+    if cycle:
+        families += [
+            ('refresher_cycle_companies', 'gauge', '현재(마지막) 주기의 기업 수 (stale: 기준 연도보다 오래됨, queued: 이번 주기 대상)',
+             [((('state', key),), cycle.get(key) or 0) for key in ('stale', 'filings', 'queued', 'done') + RESULTS]),
+            ('refresher_target_year', 'gauge', '공시 기준 연도', [((), cycle['target_year'])]),
+            ('refresher_cycle_running', 'gauge', '주기 실행 중 여부', [((), int(cycle.get('finished_at') is None))]),
+            ('refresher_cycle_started_timestamp_seconds', 'gauge', '현재(마지막) 주기 시작 시각',
+             [((), f"{cycle['started_at']:.0f}")]),
+        ]
+    return families
+
+
+def start(interval=None, start_delay=None):
+    """갱신 주기를 반복하는 데몬 스레드를 시작합니다. (이미 실행 중이면 아무 작업도 하지 않음)"""
+    global _thread, _stop
+
+    interval = INTERVAL if interval is None else interval
+    start_delay = START_DELAY if start_delay is None else start_delay
+    if interval <= 0 or (_thread is not None and _thread.is_alive()):
+        return
+
+    stop_event = threading.Event()
+
+    def refresh_loop():
+        wait = start_delay
+        while not stop_event.wait(wait):
+            try:
+                run_cycle(stop_event)
+            except Exception as e:
+                logger.exception("갱신 주기 실패: %s", e)
+            wait = interval
+
+    _stop = stop_event
+    _thread = threading.Thread(target=refresh_loop, name='stale-refresher', daemon=True)
+    _thread.start()
+
+
+def stop(wait=False):
+    """
+    갱신 스레드를 멈춥니다. (처리 중인 기업은 마치고 멈춤, prefork 마스터처럼 요청을 처리하지 않는 프로세스)
+    wait이면 스레드가 종료될 때까지 기다립니다.
+    """
+    if _stop is not None:
+        _stop.set()
+    if wait and _thread is not None:
+        _thread.join()
+
+
+def restart_after_fork():
+    """fork된 워커에서 호출합니다. 부모의 스레드는 자식에 없으므로 설정되어 있으면 다시 시작합니다."""
+    global _thread
+    _thread = None
+    if ENABLED:
+        start()
+
+
+def init_app(app):
+    """/metrics에 진행 상황을 등록하고, REFRESHER_ENABLED이면 갱신 스레드를 시작합니다. (create_app()에서 호출)"""
+    metrics.register_collector(collect_metrics)
+    if ENABLED:
+        start()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="최근 연도가 오래된 기업의 재무제표를 DART에서 받아 갱신합니다.")
+    parser.add_argument('--once', action='store_true', help="한 번만 실행하고 종료")
+    parser.add_argument('--dry-run', action='store_true', help="갱신 대상과 순서만 출력")
+    parser.add_argument('--limit', type=int, help="한 주기에 처리할 최대 기업 수")
+    parser.add_argument('--sweep', action='store_true', help="공시 목록과 관계없이 오래된 기업 전체를 확인")
+    parser.add_argument('--interval', type=float, default=INTERVAL, help="반복 주기 (초)")
+    args = parser.parse_args()
+
+    if args.dry_run:
+        rows = db.get_corp_directory()
+        if rows is None:
+            parser.error("기업 목록을 읽을 수 없습니다.")
+        target_year = reporting_year()
+        state = load_state()
+        stored = {corp_code: (corp_name, latest_year) for corp_code, corp_name, _, latest_year in rows}
+        stale, queue = plan(rows, state, target_year)
+        pending = plan_pending(state, stored)
+        print(f"기준 연도 {target_year}: 오래된 기업 {stale}개, 공시 목록 대기열 {len(pending)}개 "
+              f"(공시 커서 {state['filings']['cursor'] or '없음'})")
+        if POLL_FILINGS and state['filings']['cursor'] and not args.sweep:
+            queue = pending
+        else:
+            queue = pending + [item for item in queue if item['corp_code'] not in state['pending']]
+        for item in queue[:args.limit or None]:
+            print(f"  {item['corp_code']}  {item['corp_name']}  (최근 연도 {item['latest_year']})")
+        return
+
+    logging.basicConfig(level=logging.INFO, format='[%(asctime)s] %(levelname)s in %(module)s: %(message)s')
+    # 상장 기업 우선순위에 기업 코드 목록을 사용 (없으면 순서만 달라짐)
+    api_service.load_snapshot()
+    while True:
+        run_cycle(limit=args.limit, sweep=args.sweep)
+        if args.once:
+            return
+        time.sleep(args.interval)
+
+
+if __name__ == '__main__':
+    main()
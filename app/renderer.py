@@ -0,0 +1,160 @@
+"""
+차트/PDF 렌더러 모듈
+한글 폰트를 프로세스당 한 번만 찾아 matplotlib과 reportlab에 등록하고,
+pyplot 전역 상태 없이 Figure/Agg 객체 API로 차트를 그립니다.
+한글 폰트가 없으면 대체 폰트로 그리며, 이 결과는 렌더링 결과 캐시에 저장하지 않습니다. (has_chart_font/has_pdf_font)
+"""
+import logging
+import os
+import threading
+from io import BytesIO
+
+logger = logging.getLogger(__name__)
+
+
+# 한글 폰트 후보 (PDF_FONT_PATH 환경변수가 있으면 가장 먼저 사용)
+# reportlab은 TrueType 윤곽선 폰트만 읽으므로 CFF 기반 Noto Sans CJK(.ttc)는 차트(matplotlib)에만 쓰이고
+# PDF는 목록에서 읽을 수 있는 다음 폰트로 넘어감 (없으면 Helvetica)
+FONT_CANDIDATES = [
+    "C:/Windows/Fonts/malgun.ttf",
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+    "/usr/share/fonts/nanum/NanumGothic.ttf",
+    "/usr/share/fonts/naver-nanum/NanumGothic.ttf",
+    "/usr/share/fonts/truetype/unfonts-core/UnDotum.ttf",
+    "/usr/share/fonts/truetype/baekmuk/dotum.ttf",
+    "/Library/Fonts/AppleGothic.ttf",
+    "/System/Library/Fonts/Supplemental/AppleGothic.ttf",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/google-noto-cjk/NotoSansCJK-Regular.ttc",
+    "/System/Library/Fonts/AppleSDGothicNeo.ttc",
+]
+
+PDF_FONT_NAME = "KoreanFont"
+PDF_FALLBACK_FONT_NAME = "Helvetica"
+
+_init_lock = threading.Lock()
+_initialized = False
+_font_path = None
+_pdf_font_name = PDF_FALLBACK_FONT_NAME
+
+
+def font_paths():
+    """설정된 경로와 후보 목록 중 존재하는 한글 폰트 경로를 우선순위대로 반환합니다."""
+    configured = os.environ.get('PDF_FONT_PATH', '').strip()
+    candidates = ([configured] if configured else []) + FONT_CANDIDATES
+    return [path for path in dict.fromkeys(candidates) if os.path.exists(path)]
+
+
+def resolve_font_path():
+    """설정된 경로 또는 후보 목록에서 존재하는 첫 번째 한글 폰트 경로를 반환합니다."""
+    paths = font_paths()
+    return paths[0] if paths else None
+
+
+def _register_pdf_font(paths):
+    """
+    후보 폰트를 차례로 reportlab에 등록해 보고 처음 성공한 경로를 반환합니다.
+    CFF 윤곽선(OpenType/CJK .ttc) 등 reportlab이 읽지 못하는 폰트는 건너뜁니다. (모두 실패하면 None)
+    """
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFError, TTFont
+
+    for path in paths:
+        try:
+            # 폰트 모음(.ttc)은 첫 번째 서체를 사용
+            options = {'subfontIndex': 0} if path.lower().endswith('.ttc') else {}
+            pdfmetrics.registerFont(TTFont(PDF_FONT_NAME, path, **options))
+            return path
+        except (TTFError, OSError) as e:
+            logger.warning("PDF 폰트로 사용할 수 없어 건너뜁니다 (%s): %s", path, e)
+    return None
+
+
+def init_fonts():
+    """
+    한글 폰트를 matplotlib과 reportlab에 한 번만 등록합니다.
+    여러 번 호출해도 두 번째 호출부터는 아무 작업도 하지 않습니다.
+    """
+    global _initialized, _font_path, _pdf_font_name
+
+    if _initialized:
+        return
+
+    with _init_lock:
+        if _initialized:
+            return
+
+        import matplotlib
+        from matplotlib import font_manager
+
+        paths = font_paths()
+        font_path = paths[0] if paths else None
+        if font_path:
+            # matplotlib은 .ttc/CFF 폰트도 읽으므로 차트에는 첫 번째 후보를 사용
+            font_manager.fontManager.addfont(font_path)
+            font_name = font_manager.FontProperties(fname=font_path).get_name()
+            matplotlib.rcParams['font.family'] = font_name
+
+            if _register_pdf_font(paths):
+                _pdf_font_name = PDF_FONT_NAME
+            else:
+                logger.warning("PDF에 사용할 TrueType 한글 폰트가 없어 Helvetica로 대체합니다. "
+                               "PDF_FONT_PATH에 .ttf 경로를 설정해주세요.")
+        else:
+            logger.warning("한글 폰트를 찾을 수 없습니다. PDF_FONT_PATH 환경변수를 설정해주세요.")
+
+        matplotlib.rcParams['axes.unicode_minus'] = False
+
+        _font_path = font_path
+        _initialized = True
+
+
+def get_pdf_font_name():
+    """reportlab에 등록된 PDF용 폰트 이름을 반환합니다."""
+    init_fonts()
+    return _pdf_font_name
+
+
+def has_chart_font():
+    """차트(matplotlib)에 한글 폰트가 등록되었는지 반환합니다. (False이면 한글이 깨진 차트가 그려짐)"""
+    init_fonts()
+    return _font_path is not None
+
+
+def has_pdf_font():
+    """PDF(reportlab)에 한글 폰트가 등록되었는지 반환합니다. (False이면 Helvetica로 대체됨)"""
+    init_fonts()
+    return _pdf_font_name == PDF_FONT_NAME
+
+
+def render_bar_chart(labels, values, title, xlabel, ylabel, dpi=300):
+    """
+    막대 차트를 PNG로 렌더링합니다.
+    요청마다 독립된 Figure를 사용하므로 여러 스레드에서 동시에 호출해도 안전합니다.
+
+    Returns:
+        BytesIO: PNG 이미지 버퍼
+    """
+    init_fonts()
+
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+
+    ax.bar(labels, values)
+    ax.tick_params(axis='x', labelrotation=60)
+    for label in ax.get_xticklabels():
+        label.set_horizontalalignment('right')
+    ax.set_title(title, fontsize=14, pad=20)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+
+    img_buffer = BytesIO()
+    fig.savefig(img_buffer, format='png', dpi=dpi, bbox_inches='tight', transparent=True)
+
+    img_buffer.seek(0)
+    return img_buffer
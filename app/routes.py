@@ -1,7 +1,11 @@
-from flask import render_template, request, redirect, url_for, session, jsonify, flash, send_file
-from app import app, service, db
+from flask import render_template, request, redirect, url_for, session, jsonify, flash, send_file, abort, Response, stream_with_context
+from app import app, service, db, http_cache, corp_list_cache, pagination, refresher
 from io import BytesIO
 from datetime import datetime
+from urllib.parse import quote
+import os
+import threading
+import tracemalloc
 
 app.jinja_env.filters["krnum"] = service.format_korean_number
 
@@ -18,15 +22,16 @@ def search():
         if corp_name:
             service.send_event_to_ga4('search', {'search_term': corp_name})
             try:
-                df = service.get_finance_dataframe_10years(corp_name)
-                data = df.to_dict('records')
-                columns = df.columns.tolist()
+                # 첫 페이지만 렌더링하고 나머지 행은 /api/search_rows로 스크롤 시 불러옴
+                snapshot, df = pagination.get_search_result(corp_name, refresh=True)
+                page = pagination.paginate(df, df.columns.tolist(), snapshot)
                 
                 return render_template('search.html', 
                                         corp_name=corp_name,
-                                        data=data,
-                                        columns=columns,
-                                        row_count=len(data))
+                                        data=page['rows'],
+                                        columns=page['columns'],
+                                        next_cursor=page['next_cursor'],
+                                        row_count=page['total'])
             except Exception as e:
                 return render_template('search.html', error=str(e), corp_name=corp_name)
     else:
@@ -34,6 +39,22 @@ def search():
     
     return render_template('search.html')
 
+@app.route('/api/search_rows', methods=['GET'])
+def api_search_rows():
+    """검색 결과 표의 다음 페이지를 반환하는 API (정렬/필터는 서버에서 적용)"""
+    corp_name = request.args.get('corp_name', '').strip()
+    if not corp_name:
+        return jsonify({'error': '기업 이름이 필요합니다.'}), 400
+    
+    sort, order, q, cursor, limit = pagination.parse_page_args(request.args)
+    try:
+        snapshot, df = pagination.get_search_result(corp_name)
+        return jsonify(pagination.paginate(df, df.columns.tolist(), snapshot, sort, order, q, cursor, limit))
+    except pagination.CursorError as e:
+        return jsonify({'error': str(e)}), 409
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/search_corps', methods=['GET'])
 def api_search_corps():
     """검색어로 기업 목록을 반환하는 API"""
@@ -41,13 +62,50 @@ def api_search_corps():
     if not search_term:
         return jsonify({'corps': []})
     
+    listed_only = request.args.get('listed', '').lower() in ('1', 'true')
     service.send_event_to_ga4('api_search_corps', {'search_term': search_term})
     try:
-        corps = service.search_corps(search_term, limit=50)
+        corps = service.search_corps(search_term, limit=50, listed_only=listed_only)
+        status = service.get_cache_status()
+        if not status['ready']:
+            # 서버 시작 직후 기업 코드 목록을 아직 불러오지 못한 경우 (빈 결과와 구분)
+            return jsonify({'corps': corps, 'loading': status['state'] == 'loading', 'cache': status})
         return jsonify({'corps': corps})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/corps/lookup', methods=['GET'])
+def api_lookup_corps():
+    """기업코드, 종목코드, 기업명, 영문명이 정확히 일치하는 기업을 모두 반환하는 API (같은 이름의 기업 구분용)"""
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'corps': [], 'ambiguous': False})
+    corps = service.find_corps(query)
+    return jsonify({'corps': corps, 'ambiguous': len(corps) > 1})
+
+@app.route('/healthz', methods=['GET'])
+def healthz():
+    """프로세스 생존 확인 (로드 밸런서 liveness)"""
+    return jsonify({'status': 'ok'})
+
+@app.route('/readyz', methods=['GET'])
+def readyz():
+    """요청을 받을 준비 여부 (기업 코드 캐시가 ready 또는 stale이면 200, loading/failed면 503)"""
+    status = service.get_cache_status()
+    return jsonify(status), 200 if status['ready'] else 503
+
+@app.route('/api/corp_directory/changes', methods=['GET'])
+def corp_directory_changes():
+    """마지막 기업 코드 목록 갱신에서 추가/삭제/이름 변경/상장폐지/신규 상장된 기업"""
+    limit = request.args.get('limit', 100, type=int)
+    changes = service.get_directory_changes(max(limit, 0))
+    return jsonify({'changes': changes, 'cache': service.get_cache_status()})
+
+@app.route('/api/refresher/status', methods=['GET'])
+def refresher_status():
+    """오래된 기업 데이터 백그라운드 갱신의 진행 상황 (현재/마지막 주기, 누적 결과, 오늘 DART 요청 수)"""
+    return jsonify(refresher.get_status())
+
 @app.route('/insert_data', methods=['POST'])
 def insert_data():
     """데이터베이스에 재무제표 데이터를 삽입합니다."""
@@ -69,14 +127,14 @@ def insert_data():
             flash(message, 'error' if '오류' in message else 'info')
             return redirect(url_for('search'))
         
-        # 데이터베이스에 삽입
-        insert_success = db.insert_data(insert_values)
+        # 데이터베이스에 저장 (갱신이면 받은 연도만 한 트랜잭션으로 교체)
+        insert_success = service.save_finance_rows(insert_values, is_update)
         
         if insert_success:
             event_name = 'db_update_data' if is_update else 'db_insert_new_data'
             service.send_event_to_ga4(event_name, {'corp_name': corp_name})
             if is_update:
-                flash(f'{corp_name}의 재무제표 데이터가 갱신되었습니다.', 'success')
+                flash(f'{corp_name}의 재무제표 데이터가 갱신되었습니다. (최근 연도 데이터 {len(insert_values)}개 반영)', 'success')
             else:
                 flash(f'{corp_name}의 재무제표 데이터 {len(insert_values)}개가 성공적으로 저장되었습니다.', 'success')
         else:
@@ -90,9 +148,75 @@ def insert_data():
             service.send_event_to_ga4('error', {'error_type': 'insert_data_failed', 'corp_name': corp_name})
         return redirect(url_for('search'))
 
+# 보고서 기간/재무제표 종류 표시 이름
+REPORT_PERIOD_NAMES = {'FY': '사업보고서', 'H1': '반기보고서', 'Q1': '1분기보고서', 'Q3': '3분기보고서'}
+FS_DIV_NAMES = {'CFS': '연결', 'OFS': '별도'}
+
+@app.route('/insert_report', methods=['POST'])
+def insert_report():
+    """반기/분기보고서, 별도재무제표, 손익계산서/현금흐름표 등 보고서별 재무제표를 저장합니다."""
+    corp_name = request.form.get('corp_name')
+    period = request.form.get('period', 'FY')
+    fs_div = request.form.get('fs_div', 'CFS')
+    try:
+        if not corp_name:
+            flash('기업 이름이 필요합니다.', 'error')
+            return redirect(url_for('search'))
+        if period not in REPORT_PERIOD_NAMES or fs_div not in FS_DIV_NAMES:
+            flash('보고서 기간 또는 재무제표 종류가 올바르지 않습니다.', 'error')
+            return redirect(url_for('search'))
+        
+        service.send_event_to_ga4('db_insert_report_attempt', {'corp_name': corp_name, 'period': period, 'fs_div': fs_div})
+        success, message, insert_values, is_update = service.prepare_report_data_for_insert(corp_name, period, fs_div)
+        if not success:
+            flash(message, 'error' if '오류' in message else 'info')
+            return redirect(url_for('search'))
+        
+        report_name = f"{REPORT_PERIOD_NAMES[period]}({FS_DIV_NAMES[fs_div]})"
+        if db.insert_report_data(insert_values):
+            years = sorted({row[5] for row in insert_values}, reverse=True)
+            flash(f'{corp_name}의 {report_name} 재무제표 데이터 {len(insert_values)}개를 저장했습니다. '
+                  f'({", ".join(str(year) for year in years)}년)', 'success')
+        else:
+            flash('데이터 저장 중 오류가 발생했습니다.', 'error')
+        return redirect(url_for('search'))
+    
+    except Exception as e:
+        flash(f'데이터 저장 중 오류가 발생했습니다: {str(e)}', 'error')
+        if corp_name:
+            service.send_event_to_ga4('error', {'error_type': 'insert_report_failed', 'corp_name': corp_name})
+        return redirect(url_for('search'))
+
+@app.route('/api/report_data', methods=['GET'])
+def api_report_data():
+    """저장된 보고서별 재무제표를 반환하는 API (corp_name, period, fs_div, sj_div, year)"""
+    corp_name = request.args.get('corp_name', '').strip()
+    period = request.args.get('period', 'FY')
+    fs_div = request.args.get('fs_div', 'CFS')
+    sj_div = request.args.get('sj_div') or None
+    year = request.args.get('year', type=int)
+    if not corp_name:
+        return jsonify({'error': '기업 이름이 필요합니다.'}), 400
+    if period not in REPORT_PERIOD_NAMES or fs_div not in FS_DIV_NAMES:
+        return jsonify({'error': '보고서 기간 또는 재무제표 종류가 올바르지 않습니다.'}), 400
+    try:
+        corp_code = service.get_corp_code(corp_name)
+        rows = db.get_report_data(corp_code, period, fs_div, sj_div, year) if corp_code else []
+        return jsonify({
+            'corp_name': corp_name,
+            'period': period,
+            'fs_div': fs_div,
+            'rows': [
+                {'year': row[0], 'sj_div': row[1], 'account_id': row[2], 'account_nm': row[3], 'amount': row[4]}
+                for row in rows
+            ],
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/view', methods=['GET', 'POST'])
 def view():
-    corp_list = db.get_corp_list()
+    corp_list = corp_list_cache.get_corp_list()
     years = []
     rows = []
     indicators = None
@@ -103,14 +227,14 @@ def view():
         if action == "select_corp":
             selected_corp = request.form.get("corp_name")
             service.send_event_to_ga4('select_corp_view', {'corp_name': selected_corp})
-            years = db.get_year_list(selected_corp)
+            years = corp_list_cache.get_year_list(selected_corp)
             selected_year, rows = service.prepare_view_data(selected_corp, None, years)
 
         elif action == "select_year":
             selected_corp = request.form.get("corp_name")
             selected_year = request.form.get("year")
             service.send_event_to_ga4('select_year_view', {'corp_name': selected_corp, 'year': selected_year})
-            years = db.get_year_list(selected_corp)
+            years = corp_list_cache.get_year_list(selected_corp)
             selected_year, rows = service.prepare_view_data(selected_corp, selected_year, years)
         else:
             selected_corp = None
@@ -122,27 +246,51 @@ def view():
         
         if selected_corp:
             service.send_event_to_ga4('view_by_get', {'corp_name': selected_corp, 'year': selected_year or 'Latest'})
-            years = db.get_year_list(selected_corp)
+            years = corp_list_cache.get_year_list(selected_corp)
             selected_year, rows = service.prepare_view_data(selected_corp, selected_year, years)
         else:
             selected_corp = None
             selected_year = None
     
     indicators = service.calculate_financial_indicators(rows) if rows else None
+    
+    # 지표는 전체 행으로 계산하고, 표에는 첫 페이지만 렌더링 (나머지는 /api/view_rows로 불러옴)
+    page = None
+    if rows:
+        page = service.paginate_view_rows(selected_corp, rows)
 
     return render_template(
         "view.html",
         corp_list=corp_list,
         years=years,
-        rows=rows,
+        rows=page['rows'] if page else [],
+        next_cursor=page['next_cursor'] if page else None,
+        row_count=page['total'] if page else 0,
         selected_corp=selected_corp,
         selected_year=selected_year,
         indicators=indicators
     )
 
+@app.route('/api/view_rows/<corp>/<year>')
+def api_view_rows(corp, year):
+    """재무상태표 표의 다음 페이지를 반환하는 API (정렬/필터는 서버에서 적용)"""
+    sort, order, q, cursor, limit = pagination.parse_page_args(request.args)
+    
+    def build():
+        rows = db.get_account_data_by_year(corp, year)
+        if not rows:
+            return {}
+        return service.paginate_view_rows(corp, rows, sort, order, q, cursor, limit)
+    
+    try:
+        # 커서에 데이터 버전이 들어 있어, 데이터가 바뀐 뒤의 이전 커서는 캐시에 걸리지 않고 여기서 거부됨
+        return http_cache.cached_json_response(corp, build)
+    except pagination.CursorError as e:
+        return jsonify({'error': str(e)}), 409
+
 @app.route('/chart', methods=['GET', 'POST'])
 def chart():
-    corp_list = [row[0] for row in db.get_corp_list()]
+    corp_list = [row[0] for row in corp_list_cache.get_corp_list()]
     
     selected_corp = request.form.get('corp')
     selected_year = request.form.get('year')
@@ -154,7 +302,7 @@ def chart():
         service.send_event_to_ga4('page_view', {'page_location': url_for('chart', _external=True), 'page_title': 'Chart'})
         
     if selected_corp:
-        years = db.get_year_list(selected_corp)
+        years = corp_list_cache.get_year_list(selected_corp)
         year_list = [row[0] for row in years]
         if not selected_year and years:
             selected_year = service.get_latest_year_from_years(years)
@@ -168,18 +316,43 @@ def chart():
 @app.route('/chart1_data/<corp>')
 def chart1_data(corp):
     service.send_event_to_ga4('api_get_chart1', {'corp_name': corp})
-    data = db.get_jasan_data(corp)
-    years = [row[0] for row in data]
-    amounts = [row[1] for row in data]
-    return jsonify({'years': years, 'amounts': amounts})
+    
+    def build():
+        data = db.get_jasan_data(corp)
+        if not data:
+            return None
+        years = [row[0] for row in data]
+        amounts = [row[1] for row in data]
+        return {'years': years, 'amounts': amounts}
+    
+    return http_cache.cached_json_response(corp, build, empty={'years': [], 'amounts': []})
 
 @app.route('/chart2_data/<corp>/<year>')
 def chart2_data(corp, year):
     service.send_event_to_ga4('api_get_chart2', {'corp_name': corp, 'year': year})
-    data = db.get_account_data_by_year(corp, year)
-    accounts = [row[1] for row in data]
-    amounts = [row[2] for row in data]
-    return jsonify({'accounts': accounts, 'amounts': amounts})
+    
+    def build():
+        data = db.get_account_data_by_year(corp, year)
+        if not data:
+            return None
+        accounts = [row[1] for row in data]
+        amounts = [row[2] for row in data]
+        return {'accounts': accounts, 'amounts': amounts}
+    
+    return http_cache.cached_json_response(corp, build, empty={'accounts': [], 'amounts': []})
+
+@app.route('/api/matrix/<corp>')
+def api_matrix(corp):
+    """기업의 계정과목 x 연도 금액 행렬을 반환하는 API (account_id로 계정 필터, 반복 또는 쉼표 구분)"""
+    account_ids = [
+        account_id.strip()
+        for value in request.args.getlist('account_id')
+        for account_id in value.split(',')
+        if account_id.strip()
+    ]
+    service.send_event_to_ga4('api_get_matrix', {'corp_name': corp})
+    
+    return http_cache.cached_json_response(corp, lambda: service.make_account_matrix(corp, account_ids or None))
 
 @app.route("/export_csv")
 def export_csv():
@@ -224,35 +397,60 @@ def export_pdf():
     
     service.send_event_to_ga4('export_attempt', {'format': 'pdf', 'corp_name': selected_corp, 'year': selected_year or 'Latest'})
     
-    years = db.get_year_list(selected_corp)
-    if not selected_year and years:
+    if not selected_year:
+        years = corp_list_cache.get_year_list(selected_corp)
         selected_year = service.get_latest_year_from_years(years)
         
-    if selected_year:
-        rows = db.get_account_data_by_year(selected_corp, selected_year)
-    else:
-        rows = []
+    # 같은 데이터 버전의 PDF가 캐시에 있으면 다시 렌더링하지 않고 파일만 전송
+    pdf_file = service.build_pdf_report(selected_corp, selected_year) if selected_year else None
 
-    if not rows:
+    if not pdf_file:
         flash("해당 연도의 데이터가 존재하지 않습니다.", "error")
         return redirect(url_for("view"))
     
-    chart_image_buffer = service.generate_pdf_chart_image(rows, selected_corp, selected_year)
-    pdf_buffer = service.generate_pdf_document(rows, selected_corp, selected_year, chart_image_buffer)
-    
     filename = f"{selected_corp}_{selected_year}_재무상태표.pdf"
     
     return send_file(
-        pdf_buffer,
+        pdf_file,
         as_attachment=True,
         download_name=filename,
         mimetype="application/pdf"
     )
 
+@app.route("/export_pdf_batch", methods=["GET", "POST"])
+def export_pdf_batch():
+    """여러 기업/연도의 PDF 보고서를 하나의 PDF 또는 ZIP으로 내려받습니다."""
+    values = request.form if request.method == "POST" else request.args
+    corp_names = [c for c in values.getlist("corp_name") if c]
+    years = [y for y in values.getlist("year") if y]
+    output_format = values.get("format", "pdf")
+    
+    if not corp_names or not years:
+        return jsonify({'error': '기업과 연도를 하나 이상 선택해주세요.'}), 400
+    
+    service.send_event_to_ga4('export_attempt', {'format': f'pdf_batch_{output_format}', 'item_count': len(corp_names) * len(years)})
+    
+    try:
+        count, stream = service.generate_batch_report(corp_names, years, output_format)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    if not count:
+        return jsonify({'error': '해당 기업/연도의 데이터가 존재하지 않습니다.'}), 404
+    
+    filename = f"재무상태표_{count}건.{output_format}"
+    mimetype = "application/zip" if output_format == "zip" else "application/pdf"
+    
+    return Response(
+        stream_with_context(stream),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f"attachment; filename*=UTF-8''{quote(filename)}"}
+    )
+
 @app.route("/predict", methods=['GET', 'POST'])
 def predict():
     """머신러닝 모델을 사용한 재무 지표 예측"""
-    corp_list = [row[0] for row in db.get_corp_list()]
+    corp_list = [row[0] for row in corp_list_cache.get_corp_list()]
     selected_corp = request.form.get('corp') if request.method == 'POST' else request.args.get('corp')
     selected_year = request.form.get('year') if request.method == 'POST' else request.args.get('year')
     prediction_result = None
@@ -306,7 +504,7 @@ def predict():
 @app.route('/compare', methods=['GET', 'POST'])
 def compare():
     """기업 비교 기능"""
-    corp_list = db.get_corp_list()
+    corp_list = corp_list_cache.get_corp_list()
 
     if request.method == "POST":
         corp_names = request.form.getlist("corp_name")
@@ -355,22 +553,31 @@ def api_get_years():
     """연도 리스트 API"""
     corp = request.args.get('corp')
     service.send_event_to_ga4('api_get_years', {'corp_name': corp})
-    years = db.get_year_list(corp)
-    years = [y[0] for y in years]
-    return jsonify({'years': years})
+    
+    def build():
+        years = corp_list_cache.get_year_list(corp)
+        if not years:
+            return None
+        return {'years': [y[0] for y in years]}
+    
+    return http_cache.cached_json_response(corp or '', build, empty={'years': []})
 
 @app.route('/pie_data/<corp>/<year>')
 def pie_data(corp, year):
     """파이 차트 데이터 API"""
     service.send_event_to_ga4('api_get_pie_data', {'corp_name': corp, 'year': year})
-    data = db.get_pie_data(corp, year)
-    return jsonify(data)
+    return http_cache.cached_json_response(corp, lambda: db.get_pie_data(corp, year))
+
+# tracemalloc 추적은 프로세스 전체에 하나이므로 한 번에 한 요청만 측정 (gunicorn 스레드 워커)
+_ocr_profile_lock = threading.Lock()
 
 @app.route('/ocr', methods=['GET', 'POST'])
 def ocr():
     """OCR 기능"""
-    image_data_uri = None
+    thumbnail_key = None
     text_lines = None
+    # OCR_PROFILE_MEMORY=true 이면 요청별 HTML 크기와 최대 메모리 사용량을 기록
+    profile_memory = request.method == 'POST' and os.environ.get('OCR_PROFILE_MEMORY', 'False').lower() == 'true'
 
     if request.method == 'POST':
         file = request.files['image']
@@ -378,13 +585,48 @@ def ocr():
             return render_template('ocr.html', error="파일이 없습니다.")
         
         service.send_event_to_ga4('perform_ocr', {'filename': file.filename})
-        image_data_uri, text_lines = service.process_image(file)
     else:
         service.send_event_to_ga4('page_view', {'page_location': url_for('ocr', _external=True), 'page_title': 'OCR'})
 
-    return render_template(
-        'ocr.html',
-        image_data_uri=image_data_uri,
-        text_lines=text_lines
-    )
+    if profile_memory:
+        # 다른 요청이 측정 중이거나 이미 추적 중이면(PYTHONTRACEMALLOC 등) 이번 요청은 측정하지 않음
+        profile_memory = _ocr_profile_lock.acquire(blocking=False)
+        if profile_memory and tracemalloc.is_tracing():
+            _ocr_profile_lock.release()
+            profile_memory = False
+    if profile_memory:
+        tracemalloc.start()
+    try:
+        if request.method == 'POST':
+            try:
+                thumbnail_key, text_lines = service.process_image(file)
+            except ValueError as e:
+                return render_template('ocr.html', error=str(e))
+
+        html = render_template(
+            'ocr.html',
+            thumbnail_key=thumbnail_key,
+            text_lines=text_lines
+        )
+
+        if profile_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            app.logger.info("OCR 요청: HTML %d bytes, 최대 메모리 %.1fMB", len(html.encode('utf-8')), peak / 1024 / 1024)
+        return html
+    finally:
+        # 처리 중 어떤 예외가 나도 추적을 멈춤 (켜진 채로 두면 이후 모든 할당이 느려짐)
+        if profile_memory:
+            tracemalloc.stop()
+            _ocr_profile_lock.release()
+
+@app.route('/ocr/thumbnail/<key>')
+def ocr_thumbnail(key):
+    """OCR 업로드 이미지 미리보기 (내용 해시 기반 단기 캐시)"""
+    data = service.get_ocr_thumbnail(key)
+    if data is None:
+        abort(404)
 
+    response = send_file(BytesIO(data), mimetype="image/jpeg")
+    # 내용 해시가 키이므로 만료 전까지는 내용이 바뀌지 않음
+    response.headers['Cache-Control'] = 'private, max-age=600, immutable'
+    return response
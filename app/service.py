@@ -5,23 +5,35 @@
 # 모든 서비스를 import
 from app.api_service import (
     load_corp_code_cache,
+    get_cache_status,
+    get_directory_changes,
     get_corp_code,
+    find_corps,
     search_corps,
     get_finance_data,
     get_finance_dataframe,
-    get_finance_dataframe_10years
+    get_finance_dataframe_10years,
+    get_report_dataframe
 )
 
 from app.finance_service import (
     prepare_data_for_insert,
+    prepare_report_data_for_insert,
     export_data_to_csv,
     export_data_to_json,
     calculate_financial_indicators,
     make_compare_table,
     make_chart_data,
+    make_account_matrix,
     get_amount_by_account_id,
     find_account_id_by_name,
-    prepare_view_data
+    prepare_view_data,
+    paginate_view_rows
+)
+
+from app.data_version import (
+    get_data_version,
+    changed_since
 )
 
 from app.utils import (
@@ -55,11 +67,23 @@ def generate_pdf_document(rows, selected_corp, selected_year, chart_image_buffer
     from app.pdf_service import generate_pdf_document
     return generate_pdf_document(rows, selected_corp, selected_year, chart_image_buffer)
 
+def build_pdf_report(selected_corp, selected_year):
+    from app.pdf_service import build_pdf_report
+    return build_pdf_report(selected_corp, selected_year)
+
+def generate_batch_report(corp_names, years, output_format='pdf'):
+    from app.batch_report import generate_batch_report
+    return generate_batch_report(corp_names, years, output_format)
+
 # OCR 서비스는 지연 로딩
 def process_image(file):
     from app.ocr_service import process_image
     return process_image(file)
 
+def get_ocr_thumbnail(key):
+    from app.ocr_service import get_thumbnail
+    return get_thumbnail(key)
+
 # ML 서비스의 validate 함수
 def validate_prediction_year(year_str, min_year):
     from app.utils import validate_year
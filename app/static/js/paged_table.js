@@ -0,0 +1,166 @@
+// 서버 페이지네이션 표: 첫 페이지는 서버에서 렌더링하고, 스크롤이 표 끝에 닿으면 다음 페이지를 불러옵니다.
+// 정렬(헤더 클릭)과 필터(검색어 입력)는 서버에서 적용하며, 조건이 바뀌면 처음부터 다시 불러옵니다.
+//
+// <table class="paged-table" data-api-url="..." data-next-cursor="..."
+//        data-plain-columns="year" data-zero-as-empty="true">
+//   <thead><tr><th data-column="account_nm">...</th></tr></thead>
+// </table>
+// <input class="paged-table-filter" data-table="표 id">
+// <span class="paged-table-total" data-table="표 id"></span>
+// <div class="paged-table-sentinel" data-table="표 id"><button type="button">더 보기</button></div>
+document.addEventListener('DOMContentLoaded', function() {
+    document.querySelectorAll('table.paged-table').forEach(initPagedTable);
+
+    function initPagedTable(table) {
+        const apiUrl = table.dataset.apiUrl;
+        const plainColumns = (table.dataset.plainColumns || '').split(',').filter(Boolean);
+        const zeroAsEmpty = table.dataset.zeroAsEmpty === 'true';
+        const tbody = table.querySelector('tbody');
+        const headers = Array.from(table.querySelectorAll('thead th[data-column]'));
+        const filterInput = document.querySelector(`.paged-table-filter[data-table="${table.id}"]`);
+        const totalLabel = document.querySelector(`.paged-table-total[data-table="${table.id}"]`);
+        const sentinel = document.querySelector(`.paged-table-sentinel[data-table="${table.id}"]`);
+
+        const state = {
+            sort: null,
+            order: 'asc',
+            q: '',
+            nextCursor: table.dataset.nextCursor || null,
+            loading: false,
+            requestId: 0
+        };
+
+        function formatCell(column, value) {
+            if (value === null || value === undefined || value === '' || (zeroAsEmpty && value === 0)) {
+                return '-';
+            }
+            if (typeof value === 'number' && !plainColumns.includes(column)) {
+                return value.toLocaleString('en-US');
+            }
+            return String(value);
+        }
+
+        function appendRows(columns, rows) {
+            const fragment = document.createDocumentFragment();
+            rows.forEach(function(row) {
+                const tr = document.createElement('tr');
+                columns.forEach(function(column, i) {
+                    const td = document.createElement('td');
+                    td.textContent = formatCell(column, row[i]);
+                    tr.appendChild(td);
+                });
+                fragment.appendChild(tr);
+            });
+            tbody.appendChild(fragment);
+        }
+
+        function updateSentinel() {
+            if (sentinel) {
+                sentinel.style.display = state.nextCursor ? 'block' : 'none';
+            }
+        }
+
+        function loadPage(reset) {
+            if (state.loading && !reset) {
+                return;
+            }
+            if (!reset && !state.nextCursor) {
+                return;
+            }
+
+            const url = new URL(apiUrl, window.location.origin);
+            if (state.sort) {
+                url.searchParams.set('sort', state.sort);
+                url.searchParams.set('order', state.order);
+            }
+            if (state.q) {
+                url.searchParams.set('q', state.q);
+            }
+            if (!reset) {
+                url.searchParams.set('cursor', state.nextCursor);
+            }
+
+            // 조건이 바뀌어 새로 요청하면 이전 요청의 응답은 버림
+            const requestId = ++state.requestId;
+            state.loading = true;
+
+            fetch(url)
+                .then(response => response.json().then(data => ({ status: response.status, data: data })))
+                .then(function(result) {
+                    if (requestId !== state.requestId) {
+                        return;
+                    }
+                    state.loading = false;
+
+                    if (result.status === 409) {
+                        // 데이터가 갱신되어 커서가 만료됨: 처음부터 다시 불러옴
+                        loadPage(true);
+                        return;
+                    }
+                    if (result.data.error) {
+                        throw new Error(result.data.error);
+                    }
+
+                    const data = result.data;
+                    if (reset) {
+                        tbody.innerHTML = '';
+                    }
+                    appendRows(data.columns || [], data.rows || []);
+                    state.nextCursor = data.next_cursor || null;
+                    if (totalLabel) {
+                        totalLabel.textContent = data.total || 0;
+                    }
+                    updateSentinel();
+                })
+                .catch(function(error) {
+                    if (requestId === state.requestId) {
+                        state.loading = false;
+                    }
+                    console.error('표 데이터를 불러오지 못했습니다:', error);
+                });
+        }
+
+        headers.forEach(function(th) {
+            th.style.cursor = 'pointer';
+            th.addEventListener('click', function() {
+                const column = th.dataset.column;
+                if (state.sort === column) {
+                    state.order = state.order === 'asc' ? 'desc' : 'asc';
+                } else {
+                    state.sort = column;
+                    state.order = 'asc';
+                }
+                headers.forEach(h => h.removeAttribute('data-order'));
+                th.setAttribute('data-order', state.order);
+                loadPage(true);
+            });
+        });
+
+        if (filterInput) {
+            let timer = null;
+            filterInput.addEventListener('input', function() {
+                clearTimeout(timer);
+                timer = setTimeout(function() {
+                    state.q = filterInput.value.trim();
+                    loadPage(true);
+                }, 300);
+            });
+        }
+
+        if (sentinel) {
+            const button = sentinel.querySelector('button');
+            if (button) {
+                button.addEventListener('click', () => loadPage(false));
+            }
+            if ('IntersectionObserver' in window) {
+                new IntersectionObserver(function(entries) {
+                    if (entries.some(entry => entry.isIntersecting)) {
+                        loadPage(false);
+                    }
+                }, { rootMargin: '400px' }).observe(sentinel);
+            }
+        }
+
+        updateSentinel();
+    }
+});
@@ -39,6 +39,16 @@ document.addEventListener('DOMContentLoaded', function() {
                     return;
                 }
                 
+                // 서버가 기업 코드 목록을 아직 불러오지 못한 경우 (시작 직후 또는 실패)
+                if (data.cache && (!data.corps || data.corps.length === 0)) {
+                    const message = data.loading
+                        ? '기업 목록을 불러오는 중입니다. 잠시 후 다시 시도해주세요.'
+                        : '기업 목록을 불러오지 못했습니다. 잠시 후 다시 시도해주세요.';
+                    corpListContent.innerHTML = '<p style="padding: 10px;">' + message + '</p>';
+                    corpList.style.display = 'block';
+                    return;
+                }
+                
                 if (data.corps && data.corps.length > 0) {
                     let html = '<div style="padding: 10px;">';
                     data.corps.forEach(function(corp) {
@@ -47,7 +57,9 @@ document.addEventListener('DOMContentLoaded', function() {
                         html += 'onmouseout="this.style.backgroundColor=\'white\'" ';
                         html += `onclick="selectCorp('${corp.corp_name.replace(/'/g, "\\'")}')">`;
                         html += '<strong>' + corp.corp_name + '</strong>';
-                        html += '<span style="color: #666; margin-left: 10px;">(' + corp.corp_code + ')</span>';
+                        // 같은 이름의 기업을 구분할 수 있도록 종목코드(상장 기업)를 함께 표시
+                        const codes = corp.stock_code ? corp.corp_code + ', 종목코드 ' + corp.stock_code : corp.corp_code;
+                        html += '<span style="color: #666; margin-left: 10px;">(' + codes + ')</span>';
                         html += '</div>';
                     });
                     html += '</div>';
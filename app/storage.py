@@ -0,0 +1,371 @@
+"""
+저장소 백엔드 모듈
+db.py가 사용하는 DB 연결과 SQL 방언 차이를 백엔드별로 감쌉니다.
+DB_BACKEND 환경변수로 mysql(기본), sqlite, duckdb 중 하나를 선택합니다.
+
+- mysql: 운영 환경용 (기존 방식)
+- sqlite: MySQL 서버 없이 실행하는 테스트/데모/단일 서버용
+- duckdb: 열 기반 저장소로, 전체 조회/피벗이 많은 ML·내보내기 경로에 유리
+"""
+import os
+import threading
+
+
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'instance')
+
+
+class _Cursor:
+    """
+    백엔드 커서를 감싸 db.py의 %s 파라미터 표기와 dictionary 옵션을 모든 백엔드에서 동일하게 제공합니다.
+    """
+
+    def __init__(self, cursor, backend, dictionary=False):
+        self._cursor = cursor
+        self._backend = backend
+        self._dictionary = dictionary
+
+    def execute(self, query, params=()):
+        self._cursor.execute(self._backend.translate(query), tuple(params))
+        return self
+
+    def executemany(self, query, seq_of_params):
+        seq_of_params = [tuple(params) for params in seq_of_params]
+        if seq_of_params:
+            self._cursor.executemany(self._backend.translate(query), seq_of_params)
+        return self
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def _columns(self):
+        return [column[0] for column in self._cursor.description]
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None and self._dictionary:
+            return dict(zip(self._columns(), row))
+        return row
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        if self._dictionary:
+            columns = self._columns()
+            return [dict(zip(columns, row)) for row in rows]
+        return [tuple(row) for row in rows]
+
+    def fetch_df(self):
+        """조회 결과를 pandas DataFrame으로 반환합니다. (DuckDB는 열 단위로 바로 변환)"""
+        return self._backend.fetch_df(self._cursor)
+
+    def close(self):
+        self._backend.close_cursor(self._cursor)
+
+
+class _Connection:
+    """백엔드 커넥션을 감싸 _Cursor를 돌려주는 커넥션"""
+
+    def __init__(self, conn, backend):
+        self._conn = conn
+        self._backend = backend
+
+    def cursor(self, dictionary=False):
+        return _Cursor(self._backend.raw_cursor(self._conn), self._backend, dictionary)
+
+    def commit(self):
+        self._backend.commit(self._conn)
+
+    def rollback(self):
+        self._backend.rollback(self._conn)
+
+    def close(self):
+        self._backend.close(self._conn)
+
+
+class StorageBackend:
+    """백엔드 공통 인터페이스와 기본(SQLite/DuckDB 공통) SQL 방언"""
+
+    name = None
+    Error = Exception
+    json_type = 'text'
+    lock_clause = ''
+
+    def connect(self):
+        raise NotImplementedError
+
+    def create_database(self):
+        """데이터베이스를 준비합니다. 파일 기반 백엔드는 연결 시 자동으로 생성됩니다."""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+
+    # --- 연결 관리 ---
+
+    def raw_cursor(self, conn):
+        return conn.cursor()
+
+    def commit(self, conn):
+        conn.commit()
+
+    def rollback(self, conn):
+        conn.rollback()
+
+    def close(self, conn):
+        conn.close()
+
+    def close_cursor(self, cursor):
+        cursor.close()
+
+    def after_fork(self):
+        """fork된 자식 프로세스에서 부모가 열어 둔 연결을 버립니다. (요청마다 연결하는 백엔드는 할 일 없음)"""
+
+    def fetch_df(self, cursor):
+        import pandas as pd
+        columns = [column[0] for column in cursor.description]
+        return pd.DataFrame.from_records(cursor.fetchall(), columns=columns)
+
+    # --- SQL 방언 ---
+
+    def translate(self, query):
+        """db.py의 %s 파라미터 표기를 백엔드 표기로 바꿉니다."""
+        return query.replace('%s', '?')
+
+    def auto_pk(self, cursor, table, column='id'):
+        """자동 증가 정수 기본키 컬럼 정의를 반환합니다."""
+        return f"{column} integer primary key autoincrement"
+
+    def drop_auto_pk(self, cursor, table):
+        """auto_pk가 만든 부가 객체(시퀀스 등)를 삭제합니다."""
+
+    def upsert(self, table, columns, key_columns):
+        """키가 겹치면 나머지 컬럼을 갱신하는 INSERT 문을 반환합니다."""
+        placeholders = ", ".join(["%s"] * len(columns))
+        updates = ", ".join(f"{c} = excluded.{c}" for c in columns if c not in key_columns)
+        return (f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders}) "
+                f"ON CONFLICT ({', '.join(key_columns)}) DO UPDATE SET {updates}")
+
+    def insert_ignore(self, table, columns):
+        """키가 겹치면 무시하는 INSERT 문을 반환합니다."""
+        placeholders = ", ".join(["%s"] * len(columns))
+        return f"INSERT OR IGNORE INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+
+    def relation_type(self, cursor, name):
+        """이름이 테이블이면 'table', 뷰이면 'view', 없으면 None을 반환합니다."""
+        raise NotImplementedError
+
+    def column_type(self, cursor, table, column):
+        """컬럼의 선언 타입(소문자, 예: 'double', 'timestamp')을 반환합니다. 컬럼이 없으면 None"""
+        raise NotImplementedError
+
+    def has_index(self, cursor, table, index):
+        """테이블에 이름이 index인 인덱스가 있는지 반환합니다."""
+        raise NotImplementedError
+
+
+class MySQLBackend(StorageBackend):
+    name = 'mysql'
+    json_type = 'json'
+    lock_clause = ' FOR UPDATE'
+
+    def __init__(self, host=None, user=None, password=None, database=None):
+        import mysql.connector
+        self._connector = mysql.connector
+        self.Error = mysql.connector.Error
+        self.config = {
+            "host": host or os.environ.get('DB_HOST', 'localhost'),
+            "user": user or os.environ.get('DB_USER', 'root'),
+            "password": password if password is not None else os.environ.get('DB_PASSWORD'),
+        }
+        self.database = database or os.environ.get('DB_NAME', 'default_db')
+
+    def connect(self):
+        return _Connection(self._connector.connect(**self.config, database=self.database), self)
+
+    def create_database(self):
+        conn = self._connector.connect(**self.config)
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"CREATE DATABASE IF NOT EXISTS {self.database} CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci")
+            conn.commit()
+            cursor.close()
+        finally:
+            conn.close()
+
+    def raw_cursor(self, conn):
+        return conn.cursor()
+
+    def translate(self, query):
+        return query
+
+    def auto_pk(self, cursor, table, column='id'):
+        return f"{column} int primary key auto_increment"
+
+    def upsert(self, table, columns, key_columns):
+        placeholders = ", ".join(["%s"] * len(columns))
+        updates = ", ".join(f"{c} = VALUES({c})" for c in columns if c not in key_columns)
+        return (f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders}) "
+                f"ON DUPLICATE KEY UPDATE {updates}")
+
+    def insert_ignore(self, table, columns):
+        placeholders = ", ".join(["%s"] * len(columns))
+        return f"INSERT IGNORE INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+
+    def relation_type(self, cursor, name):
+        cursor.execute("""
+            SELECT TABLE_TYPE FROM information_schema.TABLES
+            WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
+        """, (self.database, name))
+        row = cursor.fetchone()
+        if not row:
+            return None
+        return 'view' if row[0] == 'VIEW' else 'table'
+
+    def column_type(self, cursor, table, column):
+        cursor.execute("""
+            SELECT DATA_TYPE FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND COLUMN_NAME = %s
+        """, (self.database, table, column))
+        row = cursor.fetchone()
+        return str(row[0]).lower() if row else None
+
+    def has_index(self, cursor, table, index):
+        cursor.execute("""
+            SELECT 1 FROM information_schema.STATISTICS
+            WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND INDEX_NAME = %s LIMIT 1
+        """, (self.database, table, index))
+        return cursor.fetchone() is not None
+
+
+class SQLiteBackend(StorageBackend):
+    name = 'sqlite'
+
+    def __init__(self, path=None):
+        import sqlite3
+        self._sqlite3 = sqlite3
+        self.Error = sqlite3.Error
+        self.path = path or os.environ.get('DB_PATH') or os.path.join(
+            DEFAULT_DATA_DIR, f"{os.environ.get('DB_NAME', 'default_db')}.sqlite3")
+
+    def connect(self):
+        self.create_database()
+        conn = self._sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return _Connection(conn, self)
+
+    def relation_type(self, cursor, name):
+        cursor.execute("SELECT type FROM sqlite_master WHERE name = %s AND type IN ('table', 'view')", (name,))
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+    def column_type(self, cursor, table, column):
+        cursor.execute(f"PRAGMA table_info({table})")
+        for row in cursor.fetchall():
+            if row[1] == column:
+                return str(row[2]).lower()
+        return None
+
+    def has_index(self, cursor, table, index):
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND tbl_name = %s AND name = %s", (table, index))
+        return cursor.fetchone() is not None
+
+
+class DuckDBBackend(StorageBackend):
+    """
+    DuckDB 백엔드
+    한 프로세스에서 데이터베이스를 한 번만 열고, 요청마다 독립된 커서(연결 복제본)를 사용합니다.
+    """
+    name = 'duckdb'
+
+    def __init__(self, path=None):
+        import duckdb
+        self._duckdb = duckdb
+        self.Error = duckdb.Error
+        self.path = path or os.environ.get('DB_PATH') or os.path.join(
+            DEFAULT_DATA_DIR, f"{os.environ.get('DB_NAME', 'default_db')}.duckdb")
+        self._database = None
+        self._lock = threading.Lock()
+
+    def connect(self):
+        if self._database is None:
+            with self._lock:
+                if self._database is None:
+                    self.create_database()
+                    self._database = self._duckdb.connect(self.path)
+        conn = self._database.cursor()
+        conn.begin()
+        return _Connection(conn, self)
+
+    def raw_cursor(self, conn):
+        # DuckDB는 커넥션 자체가 커서 역할을 하므로 같은 트랜잭션을 공유하도록 그대로 사용
+        return conn
+
+    def commit(self, conn):
+        conn.commit()
+        conn.begin()
+
+    def rollback(self, conn):
+        conn.rollback()
+        conn.begin()
+
+    def close(self, conn):
+        try:
+            conn.rollback()
+        except self._duckdb.Error:
+            pass
+        conn.close()
+
+    def close_cursor(self, cursor):
+        pass
+
+    def after_fork(self):
+        # 부모의 데이터베이스 핸들은 자식에서 쓸 수 없으므로 첫 연결 때 다시 열도록 함
+        self._database = None
+        self._lock = threading.Lock()
+
+    def fetch_df(self, cursor):
+        return cursor.df()
+
+    def auto_pk(self, cursor, table, column='id'):
+        cursor.execute(f"CREATE SEQUENCE IF NOT EXISTS seq_{table}_{column}")
+        return f"{column} integer primary key default nextval('seq_{table}_{column}')"
+
+    def drop_auto_pk(self, cursor, table):
+        cursor.execute(f"SELECT sequence_name FROM duckdb_sequences() WHERE sequence_name LIKE %s", (f"seq_{table}_%",))
+        for (sequence_name,) in cursor.fetchall():
+            cursor.execute(f"DROP SEQUENCE IF EXISTS {sequence_name}")
+
+    def relation_type(self, cursor, name):
+        cursor.execute("SELECT table_type FROM information_schema.tables WHERE table_name = %s", (name,))
+        row = cursor.fetchone()
+        if not row:
+            return None
+        return 'view' if row[0] == 'VIEW' else 'table'
+
+    def column_type(self, cursor, table, column):
+        cursor.execute("""
+            SELECT data_type FROM information_schema.columns WHERE table_name = %s AND column_name = %s
+        """, (table, column))
+        row = cursor.fetchone()
+        return str(row[0]).lower() if row else None
+
+    def has_index(self, cursor, table, index):
+        cursor.execute("SELECT 1 FROM duckdb_indexes() WHERE table_name = %s AND index_name = %s", (table, index))
+        return cursor.fetchone() is not None
+
+
+BACKENDS = {
+    'mysql': MySQLBackend,
+    'sqlite': SQLiteBackend,
+    'duckdb': DuckDBBackend,
+}
+
+
+def create_backend(name=None, **options):
+    """
+    설정된 저장소 백엔드를 생성합니다.
+
+    Args:
+        name (str): 'mysql', 'sqlite', 'duckdb' (없으면 DB_BACKEND 환경변수, 기본 mysql)
+    """
+    name = (name or os.environ.get('DB_BACKEND', 'mysql')).strip().lower()
+    if name not in BACKENDS:
+        raise ValueError(f"지원하지 않는 DB_BACKEND입니다: {name} (mysql, sqlite, duckdb 중 선택)")
+    return BACKENDS[name](**options)
@@ -1,38 +1,141 @@
 """
 유틸리티 함수 모듈
 """
-import os, uuid, requests
+import os, uuid, queue, threading, atexit, requests
 
 # GA4 서버 이벤트 전송 설정
 MEASUREMENT_ID = os.getenv('MEASUREMENT_ID') # GA4 측정 ID
 API_SECRET = os.getenv('API_SECRET') # Measurement Protocol용 비밀키
 CLIENT_ID = str(uuid.uuid4()) # 사용자를 구분하기 위한 임의의 사용자 ID
 
+# 테스트 시 로컬 스텁 수집기(app.ga4_stub)로 바꿀 수 있는 전송 주소
+GA4_ENDPOINT = os.getenv('GA4_ENDPOINT', 'https://www.google-analytics.com/mp/collect')
+GA4_MAX_BATCH = 25  # Measurement Protocol 요청당 최대 이벤트 수
+GA4_QUEUE_SIZE = int(os.getenv('GA4_QUEUE_SIZE', 1000))
+GA4_TIMEOUT = float(os.getenv('GA4_TIMEOUT', 3))
+GA4_FLUSH_TIMEOUT = float(os.getenv('GA4_FLUSH_TIMEOUT', 5))  # 종료 시 남은 이벤트 전송을 기다리는 최대 시간 (초)
+
+_ga4_queue = queue.Queue(maxsize=GA4_QUEUE_SIZE)
+_ga4_thread = None
+_ga4_stop = None
+# 전송 스레드 시작과 통계 갱신을 함께 보호 (통계는 요청 스레드와 전송 스레드가 함께 갱신)
+_ga4_lock = threading.Lock()
+_ga4_session = None
+_ga4_stats = {'sent': 0, 'dropped': 0, 'failed': 0}
+
+
 def send_event_to_ga4(event_name, params):
     """
-    GA4 서버로 이벤트 데이터를 전송하는 함수
+    GA4 서버로 보낼 이벤트를 전송 큐에 넣는 함수
+    실제 전송은 백그라운드 스레드가 묶음 단위로 처리하므로 요청 처리를 막지 않습니다.
+    큐가 가득 차면 이벤트를 버립니다.
 
     :param event_name: GA4에서 확인할 이벤트 이름
     :param params: 이벤트와 함께 전송할 추가 정보 (딕셔너리 형태)
     """
+    if not MEASUREMENT_ID or not API_SECRET:
+        return
 
-    # GA4 이벤트 전송용 URL
-    url = f"https://www.google-analytics.com/mp/collect?measurement_id={MEASUREMENT_ID}&api_secret={API_SECRET}"
+    _ensure_ga4_worker()
 
+    try:
+        _ga4_queue.put_nowait({
+            "name": event_name,   # 이벤트 이름
+            "params": params      # 이벤트 상세 데이터
+        })
+    except queue.Full:
+        _count_ga4('dropped', 1)
+
+
+def _ensure_ga4_worker():
+    """전송 스레드가 없으면 시작합니다. (fork 이후 자식 프로세스에서도 다시 시작)"""
+    global _ga4_thread, _ga4_stop, _ga4_session
+    if _ga4_thread is not None and _ga4_thread.is_alive():
+        return
+    with _ga4_lock:
+        if _ga4_thread is not None and _ga4_thread.is_alive():
+            return
+        # keep-alive 연결을 재사용하기 위한 세션 (전송 스레드만 사용)
+        _ga4_session = requests.Session()
+        _ga4_stop = threading.Event()
+        _ga4_thread = threading.Thread(target=_ga4_worker, args=(_ga4_stop,), name='ga4-sender', daemon=True)
+        _ga4_thread.start()
+
+
+def _count_ga4(key, count):
+    with _ga4_lock:
+        _ga4_stats[key] += count
+
+
+def _next_ga4_batch(block=True):
+    """큐에서 최대 GA4_MAX_BATCH개의 이벤트를 꺼냅니다."""
+    try:
+        events = [_ga4_queue.get(block=block, timeout=1 if block else None)]
+    except queue.Empty:
+        return []
+    while len(events) < GA4_MAX_BATCH:
+        try:
+            events.append(_ga4_queue.get_nowait())
+        except queue.Empty:
+            break
+    return events
+
+
+def _post_ga4_batch(events):
+    """이벤트 묶음을 한 번의 요청으로 전송합니다. 실패(연결 오류, 2xx가 아닌 응답)해도 예외를 올리지 않습니다."""
     # GA4에 전달할 데이터 구조
     payload = {
         "client_id": CLIENT_ID,       # 사용자 식별 ID
-        "events": [
-            {
-                "name": event_name,   # 이벤트 이름
-                "params": params      # 이벤트 상세 데이터
-            }
-        ]
+        "events": events
     }
-    
-    # 실제 HTTP POST 요청을 보내 GA 서버로 전송
-    # 이 과정에서 웹페이지 작동에는 영향을 주지 않습니다.
-    requests.post(url, json=payload)
+    try:
+        response = _ga4_session.post(
+            GA4_ENDPOINT,
+            params={'measurement_id': MEASUREMENT_ID, 'api_secret': API_SECRET},
+            json=payload,
+            timeout=GA4_TIMEOUT
+        )
+        response.raise_for_status()
+        _count_ga4('sent', len(events))
+    except requests.exceptions.RequestException:
+        _count_ga4('failed', len(events))
+
+
+def _ga4_worker(stop):
+    """백그라운드에서 큐를 비우며 이벤트를 묶어 전송합니다. stop이 설정되면 남은 이벤트를 모두 보내고 끝납니다."""
+    while not stop.is_set():
+        events = _next_ga4_batch()
+        if events:
+            _post_ga4_batch(events)
+    while True:
+        events = _next_ga4_batch(block=False)
+        if not events:
+            return
+        _post_ga4_batch(events)
+
+
+def flush_ga4_events(timeout=None):
+    """
+    전송 스레드에 종료를 알리고, 큐에 남은 이벤트와 전송 중인 묶음을 모두 보낼 때까지 기다립니다.
+    프로세스 종료 시 자동으로 호출됩니다. (세션을 전송 스레드와 나눠 쓰지 않도록 직접 보내지 않음)
+
+    :param timeout: 기다리는 최대 시간 (초, 기본값 GA4_FLUSH_TIMEOUT)
+    """
+    thread = _ga4_thread
+    if thread is None or not thread.is_alive():
+        return
+    _ga4_stop.set()
+    thread.join(GA4_FLUSH_TIMEOUT if timeout is None else timeout)
+
+
+def get_ga4_stats():
+    """GA4 전송 통계를 반환합니다. (전송/버림/실패 이벤트 수, 대기 중인 이벤트 수)"""
+    with _ga4_lock:
+        stats = dict(_ga4_stats)
+    return {**stats, 'queued': _ga4_queue.qsize()}
+
+
+atexit.register(flush_ga4_events)
 
 
 def read_readme():
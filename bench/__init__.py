@@ -0,0 +1,8 @@
+"""
+벤치마크 하네스
+합성 DART 데이터(corpCode.xml ZIP, fnlttSinglAcntAll JSON)를 로컬 가짜 DART 서버로 제공하고,
+MySQL 대신 임베디드 저장소(SQLite 기본)를 사용하여 주요 경로의 성능을 측정합니다.
+
+    python -m bench.run --corps 50
+    python -m bench.run --baseline bench/results/baseline.json --threshold 0.2
+"""
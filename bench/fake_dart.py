@@ -0,0 +1,140 @@
+"""
+로컬 가짜 DART 서버
+bench.fixtures로 만든 합성 데이터를 실제 DART와 같은 경로로 제공합니다.
+
+    python -m bench.fake_dart --corps 50 --port 8766
+    BASE_URL=http://127.0.0.1:8766/api API_KEY=bench python app.py
+"""
+import argparse
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from bench import fixtures
+
+
+class FakeDart:
+    """
+    가짜 DART 서버. with 문으로 사용하면 백그라운드에서 서버를 띄우고 종료 시 정리합니다.
+
+        with FakeDart(fixtures.make_corps(50)) as dart:
+            api_service.BASE_URL = dart.base_url
+            ...
+            dart.requests  # 경로별 요청 수
+            dart.filings.extend(fixtures.make_filings(corps[:5], 2025, '20260315'))  # 공시 목록(list.json)에 추가
+    """
+
+    def __init__(self, corps, directory_size=20000, latency=0.0, host='127.0.0.1', port=0, seed=42, filings=None):
+        self.corps = {corp['corp_code']: corp for corp in corps}
+        self.filings = list(filings or [])
+        self.latency = latency
+        self.requests = Counter()
+        self._lock = threading.Lock()
+        self._corp_code_zip = fixtures.build_corp_code_zip(corps, directory_size, seed)
+        self._responses = {}
+        dart = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                params = {key: values[0] for key, values in parse_qs(url.query).items()}
+                with dart._lock:
+                    dart.requests[url.path] += 1
+                if dart.latency:
+                    time.sleep(dart.latency)
+
+                if not params.get('crtfc_key'):
+                    self._send_json({'status': '010', 'message': '등록되지 않은 인증키입니다.'})
+                elif url.path == '/api/corpCode.xml':
+                    self._send(dart._corp_code_zip, 'application/zip')
+                elif url.path == '/api/fnlttSinglAcntAll.json':
+                    self._send(dart.finance_body(params.get('corp_code'), params.get('bsns_year'),
+                                                 params.get('reprt_code', '11011'), params.get('fs_div', 'CFS')),
+                               'application/json')
+                elif url.path == '/api/list.json':
+                    self._send_json(fixtures.build_disclosure_list(list(dart.filings), params))
+                else:
+                    self.send_error(404)
+
+            def _send_json(self, payload):
+                self._send(json.dumps(payload, ensure_ascii=False).encode('utf-8'), 'application/json')
+
+            def _send(self, body, content_type):
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self._thread = None
+
+    def finance_body(self, corp_code, bsns_year, reprt_code='11011', fs_div='CFS'):
+        """fnlttSinglAcntAll 응답 본문 (기업/연도/보고서별로 한 번만 생성)"""
+        key = (corp_code, bsns_year, reprt_code, fs_div)
+        body = self._responses.get(key)
+        if body is None:
+            corp = self.corps.get(corp_code)
+            if corp is None or not (bsns_year or '').isdigit():
+                payload = {'status': '013', 'message': '조회된 데이타가 없습니다.'}
+            else:
+                payload = fixtures.build_finance_response(corp, bsns_year, reprt_code, fs_div)
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self._responses[key] = body
+        return body
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 데이터를 제공하는 로컬 가짜 DART 서버를 실행합니다.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--corps', type=int, default=50, help="재무 데이터를 제공할 기업 수")
+    parser.add_argument('--directory-size', type=int, default=20000, help="corpCode.xml 전체 항목 수")
+    parser.add_argument('--latency', type=float, default=0.0, help="응답마다 추가할 지연 (초)")
+    parser.add_argument('--filings', type=int, default=0, help="오늘 사업보고서를 낸 것으로 공시 목록에 올릴 기업 수")
+    args = parser.parse_args()
+
+    corps = fixtures.make_corps(args.corps)
+    filings = fixtures.make_filings(corps[:args.filings], fixtures.latest_business_year(),
+                                    time.strftime('%Y%m%d'))
+    dart = FakeDart(corps, args.directory_size, args.latency, args.host, args.port, filings=filings)
+    print(f"가짜 DART 서버 실행 중: {dart.base_url} (기업 {len(corps)}개, 예: {corps[0]['corp_name']})")
+    try:
+        dart.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        dart.server.server_close()
+        print(f"요청 수: {dict(dart.requests)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,315 @@
+"""
+합성 DART 데이터 생성기
+실제 DART 응답과 같은 구조의 corpCode.xml ZIP, fnlttSinglAcntAll JSON, 공시 목록(list.json)을 시드 기반으로 만듭니다.
+같은 시드와 기업 수이면 항상 같은 데이터가 생성되어 실행 간 결과를 비교할 수 있습니다.
+"""
+import io
+import random
+import zipfile
+from datetime import datetime
+from xml.sax.saxutils import escape
+
+
+# 재무상태표 계정: (account_id, account_nm, 구분, 자산/부채/자본 내 비중)
+# 구분 A: 자산, L: 부채, E: 자본, 비중 None은 합계 계정
+BS_ACCOUNTS = [
+    ('ifrs-full_CurrentAssets', '유동자산', 'A', None),
+    ('ifrs-full_CashAndCashEquivalents', '현금및현금성자산', 'A', 0.12),
+    ('ifrs-full_CurrentTradeReceivables', '매출채권', 'A', 0.10),
+    ('ifrs-full_Inventories', '재고자산', 'A', 0.11),
+    ('ifrs-full_OtherCurrentAssets', '기타유동자산', 'A', 0.04),
+    ('dart_ShortTermDepositsNotClassifiedAsCashEquivalents', '단기금융상품', 'A', 0.08),
+    ('ifrs-full_NoncurrentAssets', '비유동자산', 'A', None),
+    ('ifrs-full_PropertyPlantAndEquipment', '유형자산', 'A', 0.35),
+    ('ifrs-full_IntangibleAssetsAndGoodwill', '무형자산', 'A', 0.06),
+    ('ifrs-full_InvestmentProperty', '투자부동산', 'A', 0.03),
+    ('-표준계정코드 미사용-', '장기선급비용', 'A', 0.02),
+    ('ifrs-full_DeferredTaxAssets', '이연법인세자산', 'A', 0.09),
+    ('ifrs-full_Assets', '자산총계', 'A', None),
+    ('ifrs-full_CurrentLiabilities', '유동부채', 'L', None),
+    ('ifrs-full_ShorttermBorrowings', '단기차입금', 'L', 0.20),
+    ('ifrs-full_CurrentProvisions', '유동성충당부채', 'L', 0.06),
+    ('ifrs-full_OtherCurrentLiabilities', '기타유동부채', 'L', 0.14),
+    ('ifrs-full_NoncurrentLiabilities', '비유동부채', 'L', None),
+    ('ifrs-full_LongtermBorrowings', '장기차입금', 'L', 0.35),
+    ('ifrs-full_DeferredTaxLiabilities', '이연법인세부채', 'L', 0.10),
+    ('-표준계정코드 미사용-', '장기미지급비용', 'L', 0.15),
+    ('ifrs-full_Liabilities', '부채총계', 'L', None),
+    ('ifrs-full_IssuedCapital', '자본금', 'E', 0.10),
+    ('ifrs-full_SharePremium', '주식발행초과금', 'E', 0.12),
+    ('ifrs-full_RetainedEarnings', '이익잉여금', 'E', 0.70),
+    ('ifrs-full_NoncontrollingInterests', '비지배지분', 'E', 0.08),
+    ('ifrs-full_Equity', '자본총계', 'E', None),
+    ('ifrs-full_EquityAndLiabilities', '자본과부채총계', 'T', None),
+]
+
+# 손익계산서 항목 (재무상태표와 함께 한 응답에 포함)
+IS_ACCOUNTS = [
+    ('ifrs-full_Revenue', '매출액'),
+    ('ifrs-full_CostOfSales', '매출원가'),
+    ('ifrs-full_GrossProfit', '매출총이익'),
+    ('dart_OperatingIncomeLoss', '영업이익'),
+    ('ifrs-full_ProfitLoss', '당기순이익'),
+]
+
+# 현금흐름표 항목
+CF_ACCOUNTS = [
+    ('ifrs-full_CashFlowsFromUsedInOperatingActivities', '영업활동현금흐름'),
+    ('ifrs-full_CashFlowsFromUsedInInvestingActivities', '투자활동현금흐름'),
+    ('ifrs-full_CashFlowsFromUsedInFinancingActivities', '재무활동현금흐름'),
+]
+
+# 보고서 코드별 (이름, 재무상태표 금액 배율, 손익/현금흐름 누적 비율)
+REPORTS = {
+    '11011': ('사업보고서', 1.0, 1.0),
+    '11012': ('반기보고서', 0.98, 0.5),
+    '11013': ('1분기보고서', 0.96, 0.25),
+    '11014': ('3분기보고서', 0.99, 0.75),
+}
+# 별도재무제표(OFS)는 연결재무제표 금액의 일정 비율
+SEPARATE_RATIO = 0.85
+
+NAME_PREFIXES = ['가온', '누리', '다온', '라온', '마루', '바른', '새솔', '아라', '자람', '한빛', '푸른', '하늘']
+NAME_SUFFIXES = ['전자', '화학', '바이오', '건설', '식품', '제약', '중공업', '에너지', '통신', '반도체', '물산', '홀딩스']
+
+YEARS_PER_CORP = 10
+
+
+def latest_business_year():
+    """앱이 조회를 시작하는 사업연도 (올해 - 1)"""
+    return datetime.now().year - 1
+
+
+def make_corps(count, seed=42):
+    """
+    재무 데이터를 제공할 상장 기업 목록을 만듭니다.
+
+    Returns:
+        list: [{'corp_code', 'corp_name', 'stock_code', 'seed'}, ...]
+    """
+    rng = random.Random(seed)
+    corps = []
+    names = set()
+    i = 0
+    while len(corps) < count:
+        base = f"{NAME_PREFIXES[i % len(NAME_PREFIXES)]}{NAME_SUFFIXES[(i // len(NAME_PREFIXES)) % len(NAME_SUFFIXES)]}"
+        name = base if base not in names else f"{base}{i // (len(NAME_PREFIXES) * len(NAME_SUFFIXES)) + 1}"
+        i += 1
+        if name in names:
+            continue
+        names.add(name)
+        corps.append({
+            'corp_code': f"{10000000 + len(corps):08d}",
+            'corp_name': name,
+            'stock_code': f"{100000 + len(corps) * 10:06d}",
+            'seed': rng.randrange(1 << 30),
+        })
+    return corps
+
+
+def build_corp_code_zip(corps, directory_size=20000, seed=42):
+    """
+    DART corpCode.xml ZIP을 만듭니다.
+    실제 목록처럼 재무 데이터가 없는 비상장 법인을 섞어 directory_size개 항목을 채웁니다.
+    """
+    rng = random.Random(seed)
+    modify_date = datetime.now().strftime('%Y%m%d')
+    parts = ['<?xml version="1.0" encoding="UTF-8"?>\n<result>\n']
+
+    def append(corp_code, corp_name, stock_code):
+        parts.append(
+            f"<list><corp_code>{corp_code}</corp_code><corp_name>{escape(corp_name)}</corp_name>"
+            f"<corp_eng_name>{escape(corp_name)} Co., Ltd.</corp_eng_name>"
+            f"<stock_code>{stock_code}</stock_code><modify_date>{modify_date}</modify_date></list>\n"
+        )
+
+    unlisted = max(0, directory_size - len(corps))
+    # 상장 기업이 목록 곳곳에 흩어지도록 위치를 무작위로 정함
+    positions = set(rng.sample(range(unlisted + len(corps)), len(corps)))
+    corp_iter = iter(corps)
+    filler = 0
+    for position in range(unlisted + len(corps)):
+        if position in positions:
+            corp = next(corp_iter)
+            append(corp['corp_code'], corp['corp_name'], corp['stock_code'])
+        else:
+            filler += 1
+            append(f"{20000000 + filler:08d}", f"비상장법인{filler:06d}", ' ')
+    parts.append('</result>\n')
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('CORPCODE.xml', ''.join(parts).encode('utf-8'))
+    return buffer.getvalue()
+
+
+def _balance_sheet(rng, total_assets):
+    """자산총계로부터 합계가 맞는 재무상태표 금액을 만듭니다."""
+    debt_ratio = rng.uniform(0.25, 0.65)
+    totals = {'A': total_assets, 'L': int(total_assets * debt_ratio)}
+    totals['E'] = total_assets - totals['L']
+
+    amounts = {}
+    for i, (account_id, account_nm, group, share) in enumerate(BS_ACCOUNTS):
+        if share is not None:
+            amounts[i] = int(totals[group] * share * rng.uniform(0.8, 1.2))
+
+    def subtotal(indices):
+        return sum(amounts[j] for j in indices)
+
+    current_assets, noncurrent_assets = range(1, 6), range(7, 12)
+    current_liabilities, noncurrent_liabilities = range(14, 17), range(18, 21)
+    amounts[0] = subtotal(current_assets)
+    amounts[6] = subtotal(noncurrent_assets)
+    amounts[12] = amounts[0] + amounts[6]
+    amounts[13] = subtotal(current_liabilities)
+    amounts[17] = subtotal(noncurrent_liabilities)
+    amounts[21] = amounts[13] + amounts[17]
+    amounts[26] = subtotal(range(22, 26))
+    amounts[27] = amounts[21] + amounts[26]
+    return amounts
+
+
+def corp_years(corp):
+    """기업이 재무 데이터를 제공하는 사업연도 목록 (최근 YEARS_PER_CORP + 2년, 오래된 순)"""
+    latest = latest_business_year()
+    return list(range(latest - YEARS_PER_CORP - 1, latest + 1))
+
+
+def _year_amounts(corp):
+    """사업연도별 재무상태표 금액 (기업 시드로 결정)"""
+    rng = random.Random(corp['seed'])
+    assets = rng.randrange(10 ** 11, 10 ** 14)
+    by_year = {}
+    for year in corp_years(corp):
+        by_year[year] = _balance_sheet(rng, assets)
+        assets = int(assets * rng.uniform(0.95, 1.15))
+    return by_year
+
+
+def build_finance_response(corp, bsns_year, reprt_code='11011', fs_div='CFS'):
+    """
+    fnlttSinglAcntAll.json 응답을 만듭니다. (재무상태표, 손익계산서, 현금흐름표)
+    사업보고서는 당기/전기/전전기 금액을, 반기/분기보고서는 당기 금액과 재무상태표의 전기말 금액을 포함합니다.
+    제공 기간 밖의 연도나 없는 보고서 코드는 DART와 같은 '013' 응답을 반환합니다.
+    """
+    bsns_year = int(bsns_year)
+    by_year = _year_amounts(corp)
+    if bsns_year not in by_year or reprt_code not in REPORTS:
+        return {'status': '013', 'message': '조회된 데이타가 없습니다.'}
+
+    _, balance_scale, flow_ratio = REPORTS[reprt_code]
+    annual = reprt_code == '11011'
+    ratio = SEPARATE_RATIO if fs_div == 'OFS' else 1.0
+
+    def amount(year, index, scale=1.0):
+        values = by_year.get(year)
+        return str(int(values[index] * scale * ratio)) if values and index in values else ''
+
+    rcept_no = f"{bsns_year + 1}0315{corp['corp_code'][-6:]}"
+    rows = []
+
+    def append(sj_div, sj_nm, account_id, account_nm, amounts):
+        row = {
+            'rcept_no': rcept_no,
+            'reprt_code': reprt_code,
+            'bsns_year': str(bsns_year),
+            'corp_code': corp['corp_code'],
+            'sj_div': sj_div,
+            'sj_nm': sj_nm,
+            'account_id': account_id,
+            'account_nm': account_nm,
+            'account_detail': '-',
+            'thstrm_nm': f"제 {bsns_year - 1960} 기",
+            'thstrm_amount': amounts[0],
+            'frmtrm_nm': f"제 {bsns_year - 1961} 기",
+            'frmtrm_amount': amounts[1],
+        }
+        if annual and len(amounts) > 2:
+            row['bfefrmtrm_nm'] = f"제 {bsns_year - 1962} 기"
+            row['bfefrmtrm_amount'] = amounts[2]
+        row['ord'] = str(len(rows) + 1)
+        row['currency'] = 'KRW'
+        rows.append(row)
+
+    for index, (account_id, account_nm, _, _) in enumerate(BS_ACCOUNTS):
+        # 반기/분기보고서의 전기 금액은 전년도 말(사업보고서) 금액
+        append('BS', '재무상태표', account_id, account_nm,
+               [amount(bsns_year, index, balance_scale), amount(bsns_year - 1, index), amount(bsns_year - 2, index)])
+
+    rng = random.Random(corp['seed'] + bsns_year)
+    for sj_div, sj_nm, accounts in (('IS', '손익계산서', IS_ACCOUNTS), ('CF', '현금흐름표', CF_ACCOUNTS)):
+        for account_id, account_nm in accounts:
+            # 사업보고서는 당기/전기/전전기, 반기/분기보고서는 당기/전년 동기 금액
+            values = [rng.randrange(10 ** 10, 10 ** 13) for _ in range(3 if annual else 2)]
+            append(sj_div, sj_nm, account_id, account_nm, [str(int(value * flow_ratio * ratio)) for value in values])
+
+    return {'status': '000', 'message': '정상', 'list': rows}
+
+
+# 공시 상세 유형별 보고서명 (list.json의 pblntf_detail_ty)
+FILING_REPORT_NAMES = {'A001': '사업보고서', 'A002': '반기보고서', 'A003': '분기보고서'}
+
+
+def make_filings(corps, bsns_year, rcept_dt, detail_ty='A001', correction=False, start_no=1):
+    """
+    공시 목록(list.json) 항목을 만듭니다. 기업마다 한 건씩 rcept_dt에 접수된 공시입니다.
+    pblntf_detail_ty 필터용으로 항목에 'pblntf_detail_ty'를 함께 넣습니다. (응답에서는 제외)
+
+    Args:
+        corps (list): make_corps() 결과 중 공시를 낸 기업
+        bsns_year (int): 사업연도 (보고서명 '사업보고서 (YYYY.12)')
+        rcept_dt (str): 접수일자 (YYYYMMDD)
+        detail_ty (str): 공시 상세 유형 (A001 사업보고서, A002 반기보고서, A003 분기보고서)
+        correction (bool): 정정 공시 ('[기재정정]' 접두어)
+        start_no (int): 접수번호 일련번호 시작값 (같은 날 여러 번 만들 때 겹치지 않도록)
+    """
+    month = {'A001': 12, 'A002': 6, 'A003': 9}.get(detail_ty, 12)
+    report_nm = f"{'[기재정정]' if correction else ''}{FILING_REPORT_NAMES.get(detail_ty, '사업보고서')} ({bsns_year}.{month:02d})"
+    return [{
+        'corp_code': corp['corp_code'],
+        'corp_name': corp['corp_name'],
+        'stock_code': corp.get('stock_code', ''),
+        'corp_cls': 'Y' if corp.get('stock_code') else 'E',
+        'report_nm': report_nm,
+        'rcept_no': f"{rcept_dt}{80000 + start_no + index:06d}",
+        'flr_nm': corp['corp_name'],
+        'rcept_dt': rcept_dt,
+        'rm': '',
+        'pblntf_detail_ty': detail_ty,
+    } for index, corp in enumerate(corps)]
+
+
+def build_disclosure_list(filings, params):
+    """
+    list.json 응답을 만듭니다. 접수일자 범위, 공시 상세 유형, 기업 코드로 거르고 page_no/page_count로 나눕니다.
+    기업 코드 없이 3개월을 넘는 기간을 조회하거나 결과가 없으면 DART와 같은 오류/'013' 응답을 반환합니다.
+    """
+    bgn_de = params.get('bgn_de') or '00000000'
+    end_de = params.get('end_de') or '99999999'
+    if not params.get('corp_code') and bgn_de.isdigit() and end_de.isdigit() and \
+            (datetime.strptime(end_de, '%Y%m%d') - datetime.strptime(bgn_de, '%Y%m%d')).days > 92:
+        return {'status': '100', 'message': '검색기간은 3개월을 초과할 수 없습니다.'}
+
+    matched = [
+        filing for filing in filings
+        if bgn_de <= filing['rcept_dt'] <= end_de
+        and (not params.get('pblntf_detail_ty') or filing['pblntf_detail_ty'] == params['pblntf_detail_ty'])
+        and (not params.get('corp_code') or filing['corp_code'] == params['corp_code'])
+    ]
+    if not matched:
+        return {'status': '013', 'message': '조회된 데이타가 없습니다.'}
+    matched.sort(key=lambda filing: filing['rcept_no'], reverse=params.get('sort_mth', 'desc') != 'asc')
+
+    page_no = max(int(params.get('page_no') or 1), 1)
+    page_count = min(max(int(params.get('page_count') or 10), 1), 100)
+    page = matched[(page_no - 1) * page_count:page_no * page_count]
+    return {
+        'status': '000',
+        'message': '정상',
+        'page_no': page_no,
+        'page_count': page_count,
+        'total_count': len(matched),
+        'total_page': (len(matched) + page_count - 1) // page_count,
+        'list': [{key: value for key, value in filing.items() if key != 'pblntf_detail_ty'} for filing in page],
+    }
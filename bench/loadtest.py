@@ -0,0 +1,284 @@
+"""
+라우트 부하 테스트와 지연 시간 SLO 보고서
+bench.serve로 합성 데이터 앱 서버를 별도 프로세스로 띄우고, 여러 동시성 수준에서 시나리오별로
+요청을 보내 p50/p95/p99 지연 시간과 처리량(req/s)을 측정합니다.
+SLO를 넘는 시나리오가 있으면 종료 코드 1로 끝납니다.
+
+    python -m bench.loadtest
+    python -m bench.loadtest --scenarios search_corps,view --concurrency 1,8,32 --duration 10
+    python -m bench.loadtest --url http://127.0.0.1:5000   # 이미 실행 중인 서버 대상 (기업은 --corps 기준 합성 이름)
+"""
+import argparse
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+
+import requests
+
+from bench import fixtures
+from bench.run import RESULTS_DIR
+from bench.scenarios import percentile
+
+
+# 시나리오별 SLO: 가장 높은 동시성 수준에서 지켜야 하는 값
+# (p95_ms: 95번째 백분위 지연 시간 상한, error_rate: 오류 응답 비율 상한)
+DEFAULT_SLO = {
+    'search_corps': {'p95_ms': 100, 'error_rate': 0.0},
+    'view': {'p95_ms': 500, 'error_rate': 0.0},
+    'chart': {'p95_ms': 300, 'error_rate': 0.0},
+    'compare': {'p95_ms': 1500, 'error_rate': 0.0},
+    'export_csv': {'p95_ms': 3000, 'error_rate': 0.0},
+}
+
+
+class Traffic:
+    """시나리오가 요청을 만들 때 쓰는 합성 기업/연도 정보"""
+
+    def __init__(self, corps, seed):
+        self.corps = corps
+        self.years = list(range(fixtures.latest_business_year() - fixtures.YEARS_PER_CORP + 1,
+                                fixtures.latest_business_year() + 1))
+        self.rng = random.Random(seed)
+
+    def corp(self, rng):
+        return rng.choice(self.corps)['corp_name']
+
+
+# 각 시나리오는 (session, base_url, traffic, rng)를 받아 한 번의 사용자 동작을 수행하고
+# [(라우트 라벨, 응답 시간 초, 성공 여부), ...]를 반환합니다.
+
+def _timed(session, method, url, label, **kwargs):
+    started = time.perf_counter()
+    try:
+        response = session.request(method, url, timeout=30, **kwargs)
+        response.content
+        ok = response.status_code < 400
+    except requests.RequestException:
+        ok = False
+    return label, time.perf_counter() - started, ok
+
+
+def scenario_search_corps(session, base_url, traffic, rng):
+    """검색창에 기업 이름을 한 글자씩 입력할 때의 연속 요청"""
+    name = traffic.corp(rng)
+    return [
+        _timed(session, 'GET', f"{base_url}/api/search_corps", '/api/search_corps', params={'q': name[:i]})
+        for i in range(1, len(name) + 1)
+    ]
+
+
+def scenario_view(session, base_url, traffic, rng):
+    """재무상태표 조회 페이지 탐색"""
+    params = {'corp_name': traffic.corp(rng), 'year': rng.choice(traffic.years)}
+    return [_timed(session, 'GET', f"{base_url}/view", '/view', params=params)]
+
+
+def scenario_chart(session, base_url, traffic, rng):
+    """차트 페이지의 데이터 요청 (자산 추이, 연도별 계정, 파이 차트)"""
+    corp = traffic.corp(rng)
+    year = rng.choice(traffic.years)
+    return [
+        _timed(session, 'GET', f"{base_url}/chart1_data/{corp}", '/chart1_data'),
+        _timed(session, 'GET', f"{base_url}/chart2_data/{corp}/{year}", '/chart2_data'),
+        _timed(session, 'GET', f"{base_url}/pie_data/{corp}/{year}", '/pie_data'),
+    ]
+
+
+def scenario_compare(session, base_url, traffic, rng):
+    """기업 3곳 비교 제출"""
+    corps = rng.sample(traffic.corps, min(3, len(traffic.corps)))
+    data = {
+        'corp_name': [corp['corp_name'] for corp in corps],
+        'year': [str(rng.choice(traffic.years)) for _ in corps],
+    }
+    return [_timed(session, 'POST', f"{base_url}/compare", '/compare', data=data)]
+
+
+def scenario_export_csv(session, base_url, traffic, rng):
+    """전체 데이터 CSV 다운로드"""
+    return [_timed(session, 'GET', f"{base_url}/export_csv", '/export_csv')]
+
+
+SCENARIOS = {
+    'search_corps': scenario_search_corps,
+    'view': scenario_view,
+    'chart': scenario_chart,
+    'compare': scenario_compare,
+    'export_csv': scenario_export_csv,
+}
+
+
+def run_level(scenario, base_url, traffic, concurrency, duration, seed):
+    """
+    concurrency개 스레드가 duration초 동안 시나리오를 반복 실행합니다.
+
+    Returns:
+        dict: {'routes': {라우트: 통계}, 'requests', 'errors', 'throughput_per_s', ...}
+    """
+    samples = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker(index):
+        rng = random.Random(seed * 1000 + index)
+        session = requests.Session()
+        local = []
+        while time.perf_counter() < deadline:
+            local.extend(scenario(session, base_url, traffic, rng))
+        session.close()
+        with lock:
+            samples.extend(local)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    def stats(items):
+        latencies = [latency for _, latency, _ in items]
+        errors = sum(1 for _, _, ok in items if not ok)
+        return {
+            'requests': len(items),
+            'errors': errors,
+            'error_rate': errors / len(items) if items else 0.0,
+            'throughput_per_s': len(items) / elapsed if elapsed else 0.0,
+            'p50_ms': percentile(latencies, 50) * 1000,
+            'p95_ms': percentile(latencies, 95) * 1000,
+            'p99_ms': percentile(latencies, 99) * 1000,
+        }
+
+    routes = {}
+    for sample in samples:
+        routes.setdefault(sample[0], []).append(sample)
+
+    result = stats(samples)
+    result['concurrency'] = concurrency
+    result['routes'] = {route: stats(items) for route, items in sorted(routes.items())}
+    return result
+
+
+def check_slo(name, level, slo):
+    """SLO 위반 항목 목록을 반환합니다."""
+    violations = []
+    if not slo:
+        return violations
+    if level['requests'] == 0:
+        return [f"{name}: 완료된 요청이 없습니다."]
+    if 'p95_ms' in slo and level['p95_ms'] > slo['p95_ms']:
+        violations.append(f"{name}: p95 {level['p95_ms']:.0f}ms > {slo['p95_ms']}ms (동시성 {level['concurrency']})")
+    if 'error_rate' in slo and level['error_rate'] > slo['error_rate']:
+        violations.append(f"{name}: 오류율 {level['error_rate'] * 100:.1f}% > {slo['error_rate'] * 100:.1f}% (동시성 {level['concurrency']})")
+    return violations
+
+
+def start_server(args):
+    """bench.serve 하위 프로세스를 띄우고 준비될 때까지 기다립니다."""
+    command = [sys.executable, '-m', 'bench.serve', '--corps', str(args.corps),
+               '--latency', str(args.dart_latency), '--backend', args.backend]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True,
+                               cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    for line in process.stdout:
+        # 캐시 로딩 스레드의 출력이 같은 줄에 섞일 수 있으므로 주소 부분만 추출
+        ready = re.search(r'READY (http://[\w.]+:\d+)', line)
+        if ready:
+            # 이후 출력은 버려서 파이프가 가득 차 서버가 멈추지 않도록 함
+            threading.Thread(target=lambda: [None for _ in process.stdout], daemon=True).start()
+            return process, ready.group(1)
+        print(f"  [server] {line.rstrip()}")
+    raise RuntimeError(f"부하 테스트 서버가 시작되지 않았습니다. (종료 코드 {process.wait()})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Flask 라우트 부하 테스트와 SLO 검사")
+    parser.add_argument('--scenarios', default='all', help=f"쉼표로 구분 ({', '.join(SCENARIOS)}) 또는 all")
+    parser.add_argument('--concurrency', default='1,4,16', help="쉼표로 구분한 동시 사용자 수 목록")
+    parser.add_argument('--duration', type=float, default=5.0, help="동시성 수준별 측정 시간 (초)")
+    parser.add_argument('--corps', type=int, default=30, help="합성 기업 수")
+    parser.add_argument('--dart-latency', type=float, default=0.0, help="가짜 DART 응답 지연 (초)")
+    parser.add_argument('--backend', default='sqlite', choices=['sqlite', 'duckdb', 'mysql'])
+    parser.add_argument('--url', help="이미 실행 중인 서버 주소 (지정하면 서버를 띄우지 않음)")
+    parser.add_argument('--slo', help="SLO JSON 파일 ({시나리오: {p95_ms, error_rate}}), 기본값을 덮어씀")
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--output', help="결과 JSON 경로 (기본 bench/results/loadtest_<시각>.json)")
+    args = parser.parse_args()
+
+    names = list(SCENARIOS) if args.scenarios == 'all' else [n.strip() for n in args.scenarios.split(',') if n.strip()]
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"알 수 없는 시나리오: {', '.join(unknown)}")
+    levels = [int(level) for level in args.concurrency.split(',') if level.strip()]
+
+    slo = {name: dict(values) for name, values in DEFAULT_SLO.items()}
+    if args.slo:
+        with open(args.slo, encoding='utf-8') as f:
+            for name, values in json.load(f).items():
+                slo.setdefault(name, {}).update(values)
+
+    traffic = Traffic(fixtures.make_corps(args.corps), args.seed)
+    process = None
+    if args.url:
+        base_url = args.url.rstrip('/')
+    else:
+        print("부하 테스트 서버 준비 중 (합성 데이터 저장)...")
+        process, base_url = start_server(args)
+
+    results = {}
+    violations = []
+    try:
+        for name in names:
+            results[name] = []
+            for concurrency in levels:
+                level = run_level(SCENARIOS[name], base_url, traffic, concurrency, args.duration, args.seed)
+                results[name].append(level)
+                print(f"[{name}] 동시성 {concurrency:>3}: {level['throughput_per_s']:8.1f} req/s  "
+                      f"p50 {level['p50_ms']:7.1f}ms  p95 {level['p95_ms']:7.1f}ms  p99 {level['p99_ms']:7.1f}ms  "
+                      f"오류 {level['errors']}/{level['requests']}")
+                for route, stats in level['routes'].items():
+                    if len(level['routes']) > 1:
+                        print(f"      {route:<20} p50 {stats['p50_ms']:7.1f}ms  p95 {stats['p95_ms']:7.1f}ms  "
+                              f"p99 {stats['p99_ms']:7.1f}ms")
+            violations.extend(check_slo(name, results[name][-1], slo.get(name)))
+    finally:
+        if process:
+            process.terminate()
+            process.wait(timeout=10)
+
+    report = {
+        'meta': {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'corps': args.corps,
+            'duration': args.duration,
+            'concurrency': levels,
+            'dart_latency': args.dart_latency,
+            'backend': args.backend,
+            'url': args.url,
+        },
+        'slo': {name: slo.get(name) for name in names},
+        'results': results,
+        'violations': violations,
+    }
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    output = args.output or os.path.join(RESULTS_DIR, f"loadtest_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {output}")
+
+    if violations:
+        print(f"\nSLO 위반 {len(violations)}건")
+        for violation in violations:
+            print(f"  ✗ {violation}")
+        sys.exit(1)
+    print("모든 SLO 충족")
+
+
+if __name__ == '__main__':
+    main()
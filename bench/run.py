@@ -0,0 +1,214 @@
+"""
+벤치마크 실행기
+가짜 DART 서버와 임시 임베디드 DB(기본 SQLite)를 준비하고 시나리오를 실행한 뒤,
+결과를 JSON으로 저장하고 기준선(baseline) 결과와 비교합니다.
+
+    python -m bench.run                                   # 전체 시나리오, 기업 30개
+    python -m bench.run --scenarios ingest,compare --corps 100
+    python -m bench.run --save-baseline                   # 결과를 이 환경의 기준선으로 저장 (git에서 제외)
+    python -m bench.run --baseline bench/results/baseline.json --threshold 0.2
+                                                          # 기준선보다 20% 넘게 나빠지면 종료 코드 1
+"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import traceback
+from datetime import datetime
+
+from bench import fixtures
+from bench.fake_dart import FakeDart
+from bench.scenarios import SCENARIOS
+
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+BASELINE_PATH = os.path.join(RESULTS_DIR, 'baseline.json')
+
+
+class BenchContext:
+    """시나리오가 공유하는 실행 환경 (합성 기업 목록, 가짜 DART 서버, 임시 DB)"""
+
+    def __init__(self, corps, dart, quick=False):
+        self.corps = corps
+        self.dart = dart
+        self.quick = quick
+        self.latest_year = fixtures.latest_business_year()
+        self._ingested = False
+
+    def repeat(self, count):
+        """빠른 실행(--quick)이면 반복 횟수를 1회로 줄임"""
+        return 1 if self.quick else count
+
+    def reset_database(self):
+        from app import db
+        db.drop_table()
+        db.create_table()
+        self._ingested = False
+
+    def ensure_ingested(self):
+        """전체 합성 기업 데이터가 DB에 저장되어 있도록 합니다. (ingest 시나리오 없이 실행할 때)"""
+        if self._ingested:
+            return
+        from app import api_service, db
+        from app.finance_service import prepare_data_for_insert
+
+        if api_service.get_directory() is None:
+            api_service.load_corp_code_cache()
+        self.reset_database()
+        for corp in self.corps:
+            success, message, values, _ = prepare_data_for_insert(corp['corp_name'])
+            if not success or not db.insert_data(values):
+                raise RuntimeError(f"{corp['corp_name']} 데이터 저장 실패: {message}")
+        self._ingested = True
+
+    def mark_ingested(self):
+        self._ingested = True
+
+
+def configure_app(workdir, backend, dart):
+    """앱 모듈이 가짜 DART 서버와 임시 저장소를 사용하도록 설정합니다."""
+    # 모듈 로드 시점에 읽는 설정은 import 전에 환경변수로 지정
+    os.environ['DATA_VERSION_SIGNAL_FILE'] = os.path.join(workdir, 'data_version')
+    os.environ['OUTPUT_CACHE_DIR'] = os.path.join(workdir, 'output_cache')
+    os.environ['DB_BACKEND'] = backend
+
+    from app import api_service, data_version, db, output_cache
+
+    # api_service는 .env를 override=True로 읽으므로 모듈 속성을 직접 덮어씀
+    api_service.API_KEY = 'bench'
+    api_service.BASE_URL = dart.base_url
+    api_service.SNAPSHOT_PATH = os.path.join(workdir, 'corp_codes.json')
+    data_version.SIGNAL_FILE = os.environ['DATA_VERSION_SIGNAL_FILE']
+    output_cache.CACHE_DIR = os.environ['OUTPUT_CACHE_DIR']
+
+    options = {} if backend == 'mysql' else {'path': os.path.join(workdir, f"bench.{backend}")}
+    db.configure(backend, **options)
+    db.create_database()
+
+
+def compare_with_baseline(results, baseline, threshold):
+    """
+    기준선 대비 나빠진 지표를 찾습니다.
+
+    Returns:
+        list: [(시나리오, 지표, 기준값, 현재값, 변화율), ...] threshold를 넘게 나빠진 항목
+    """
+    regressions = []
+    print(f"\n[기준선 비교] 허용 범위 {threshold * 100:.0f}%")
+    for name, metrics in results.items():
+        base_metrics = baseline.get('results', {}).get(name)
+        if not base_metrics or 'error' in metrics or 'skipped' in metrics:
+            continue
+        for metric, value in metrics.items():
+            base = base_metrics.get(metric)
+            if not isinstance(value, (int, float)) or not isinstance(base, (int, float)) or base == 0:
+                continue
+            if metric.endswith('_per_s'):
+                change = (base - value) / base
+            elif metric.endswith('_ms') or metric.endswith('_s'):
+                change = (value - base) / base
+            else:
+                continue
+            mark = '✗' if change > threshold else ' '
+            print(f"  {mark} {name}.{metric:<24} {base:12.2f} -> {value:12.2f} ({-change * 100 if metric.endswith('_per_s') else change * 100:+.1f}%)")
+            if change > threshold:
+                regressions.append((name, metric, base, value, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 DART 데이터로 주요 경로의 성능을 측정합니다.")
+    parser.add_argument('--scenarios', default='all', help=f"쉼표로 구분 ({', '.join(SCENARIOS)}) 또는 all")
+    parser.add_argument('--corps', type=int, default=30, help="재무 데이터를 제공할 합성 기업 수 (기업당 10년치)")
+    parser.add_argument('--directory-size', type=int, default=20000, help="corpCode.xml 전체 항목 수")
+    parser.add_argument('--latency', type=float, default=0.0, help="가짜 DART 응답 지연 (초)")
+    parser.add_argument('--backend', default='sqlite', choices=['sqlite', 'duckdb', 'mysql'],
+                        help="저장소 백엔드 (mysql은 .env의 DB를 초기화하므로 주의)")
+    parser.add_argument('--quick', action='store_true', help="반복 없이 한 번씩만 측정")
+    parser.add_argument('--output', help="결과 JSON 경로 (기본 bench/results/<시각>.json)")
+    parser.add_argument('--baseline', help="비교할 기준선 결과 JSON")
+    parser.add_argument('--threshold', type=float, default=0.2, help="허용하는 성능 저하 비율 (기본 0.2 = 20%%)")
+    parser.add_argument('--save-baseline', action='store_true', help=f"결과를 {BASELINE_PATH}에도 저장")
+    args = parser.parse_args()
+
+    names = list(SCENARIOS) if args.scenarios == 'all' else [n.strip() for n in args.scenarios.split(',') if n.strip()]
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"알 수 없는 시나리오: {', '.join(unknown)}")
+
+    workdir = tempfile.mkdtemp(prefix='bench_')
+    corps = fixtures.make_corps(args.corps)
+    results = {}
+    try:
+        with FakeDart(corps, args.directory_size, args.latency) as dart:
+            configure_app(workdir, args.backend, dart)
+            ctx = BenchContext(corps, dart, args.quick)
+
+            for name in names:
+                func, requires = SCENARIOS[name]
+                missing = [module for module in requires if importlib.util.find_spec(module) is None]
+                if missing:
+                    results[name] = {'skipped': f"패키지 없음: {', '.join(missing)}"}
+                    print(f"[{name}] 건너뜀 ({results[name]['skipped']})")
+                    continue
+
+                print(f"[{name}] 실행 중...")
+                started = time.perf_counter()
+                try:
+                    results[name] = func(ctx)
+                    if name == 'ingest':
+                        ctx.mark_ingested()
+                except Exception as e:
+                    traceback.print_exc()
+                    results[name] = {'error': str(e)}
+                    continue
+                for metric, value in results[name].items():
+                    print(f"    {metric:<24} {value:,.2f}" if isinstance(value, float) else f"    {metric:<24} {value}")
+                print(f"    ({time.perf_counter() - started:.1f}초)")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        'meta': {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'corps': args.corps,
+            'years_per_corp': fixtures.YEARS_PER_CORP,
+            'directory_size': args.directory_size,
+            'latency': args.latency,
+            'backend': args.backend,
+            'quick': args.quick,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+        },
+        'results': results,
+    }
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    output = args.output or os.path.join(RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {output}")
+    if args.save_baseline:
+        shutil.copyfile(output, BASELINE_PATH)
+        print(f"기준선 저장: {BASELINE_PATH}")
+
+    failed = [name for name, metrics in results.items() if 'error' in metrics]
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare_with_baseline(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n성능 저하 {len(regressions)}건 (허용 범위 {args.threshold * 100:.0f}% 초과)")
+
+    if failed:
+        print(f"실패한 시나리오: {', '.join(failed)}")
+    sys.exit(1 if failed or regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
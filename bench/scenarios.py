@@ -0,0 +1,391 @@
+"""
+벤치마크 시나리오
+각 시나리오는 BenchContext를 받아 {지표 이름: 값} 딕셔너리를 반환합니다.
+
+지표 이름 규칙 (bench.run의 기준선 비교에 사용):
+    *_ms, *_s       : 작을수록 좋음
+    *_per_s         : 클수록 좋음
+    그 밖의 이름     : 참고용 (비교하지 않음)
+"""
+import statistics
+import time
+from io import BytesIO
+
+
+SCENARIOS = {}
+
+
+def scenario(name, requires=()):
+    """시나리오 등록 데코레이터 (requires: 없으면 건너뛸 선택 패키지)"""
+    def decorator(func):
+        SCENARIOS[name] = (func, tuple(requires))
+        return func
+    return decorator
+
+
+def measure(func, repeat, warmup=True):
+    """func를 repeat번 실행하여 각 실행 시간(초) 리스트를 반환합니다. (warmup이면 측정 전 한 번 실행)"""
+    if warmup:
+        func()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def percentile(values, q):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, int(round(q / 100 * (len(values) - 1)))))
+    return values[index]
+
+
+def summarize_ms(prefix, timings):
+    return {
+        f"{prefix}p50_ms": statistics.median(timings) * 1000,
+        f"{prefix}p95_ms": percentile(timings, 95) * 1000,
+    }
+
+
+@scenario('startup')
+def startup(ctx):
+    """새 프로세스에서 app import + create_app() 시간 (cold start, bench.startup 참고)"""
+    from bench.startup import measure_startup
+
+    result = measure_startup(ctx.repeat(5))
+    return {
+        'import_ms': result['import_ms'],
+        'create_app_ms': result['create_app_ms'],
+        'total_ms': result['total_ms'],
+        'heavy_modules': ','.join(result['heavy_modules']) or '-',
+    }
+
+
+@scenario('cache_load')
+def cache_load(ctx):
+    """corpCode.xml ZIP 다운로드 + XML 파싱으로 기업 코드 캐시를 만드는 시간"""
+    from app import api_service
+
+    timings = measure(api_service.load_corp_code_cache, ctx.repeat(3), warmup=False)
+    return {
+        'load_ms': statistics.median(timings) * 1000,
+        'directory_size': len(api_service.get_directory()),
+    }
+
+
+@scenario('search_corps')
+def search_corps(ctx):
+    """기업 검색 API가 쓰는 부분 일치 검색 지연 시간"""
+    from app import api_service
+
+    if api_service.get_directory() is None:
+        api_service.load_corp_code_cache()
+
+    terms = [corp['corp_name'][:2] for corp in ctx.corps[:10]] + ['전자', '비상장', '없는기업이름']
+    timings = []
+    for term in terms:
+        timings.extend(measure(lambda: api_service.search_corps(term, limit=50), ctx.repeat(20)))
+    return summarize_ms('', timings)
+
+
+@scenario('corp_lookup')
+def corp_lookup(ctx):
+    """기업명/종목코드/영문명/기업코드 정확 일치 조회 지연 시간 (보조 인덱스)"""
+    from app import api_service
+
+    if api_service.get_directory() is None:
+        api_service.load_corp_code_cache()
+
+    directory = api_service.get_directory()
+    queries = []
+    for corp in directory.listed[:10]:
+        queries.extend([corp.corp_name, corp.stock_code, corp.corp_eng_name, corp.corp_code])
+    queries.append('없는기업이름')
+    timings = []
+    for query in queries:
+        timings.extend(measure(lambda: api_service.get_corp_code(query), ctx.repeat(50)))
+    return summarize_ms('', timings)
+
+
+@scenario('insert_rows')
+def insert_rows(ctx):
+    """재무제표 DataFrame 10만 행을 DB 삽입용 행으로 변환하는 처리량 (prepare_data_for_insert의 변환 단계)"""
+    import numpy as np
+    import pandas as pd
+    from app.finance_service import make_insert_rows
+
+    count = 100_000
+    rng = np.random.default_rng(42)
+    amounts = rng.integers(-10 ** 12, 10 ** 13, count).astype(float)
+    amounts[rng.random(count) < 0.05] = np.nan
+    account_ids = np.array([f"ifrs-full_Account{index % 60}" for index in range(count)], dtype=object)
+    account_ids[rng.random(count) < 0.1] = ''
+    df = pd.DataFrame({
+        'corp_name': '벤치기업',
+        'corp_code': '10000000',
+        'account_id': account_ids,
+        'account_nm': [f"계정{index % 60}" for index in range(count)],
+        'amount': amounts,
+        'year': 2015 + np.arange(count) % 10,
+    })
+
+    timings = measure(lambda: make_insert_rows(df), ctx.repeat(5))
+    return {
+        'rows_per_s': count / statistics.median(timings),
+        'p50_ms': statistics.median(timings) * 1000,
+        'rows': count,
+    }
+
+
+@scenario('finance_parse')
+def finance_parse(ctx):
+    """DART 재무제표 응답(10년치, 4회 조회)을 DataFrame으로 만드는 기업당 시간과 최대 메모리 (HTTP 제외)"""
+    import tracemalloc
+    from app.api_service import build_finance_dataframe
+    from bench.fixtures import build_finance_response, latest_business_year
+
+    start_year = latest_business_year()
+    query_years = [start_year - offset for offset in (0, 3, 6, 9)]
+    workloads = []
+    for corp in ctx.corps:
+        responses = [(year, build_finance_response(corp, year)) for year in query_years]
+        workloads.append((corp['corp_name'], [(year, data) for year, data in responses if data.get('status') == '000']))
+
+    def parse_all():
+        for corp_name, responses in workloads:
+            build_finance_dataframe(responses, corp_name, start_year, start_year - 9)
+
+    timings = measure(parse_all, ctx.repeat(5))
+
+    # 메모리는 측정 오버헤드가 크므로 시간과 따로 한 번 측정
+    peak = 0
+    for corp_name, responses in workloads:
+        tracemalloc.start()
+        build_finance_dataframe(responses, corp_name, start_year, start_year - 9)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    return {
+        'per_corp_ms': statistics.median(timings) / len(workloads) * 1000,
+        'peak_kb': peak / 1024,
+        'corps': len(workloads),
+    }
+
+
+@scenario('ingest')
+def ingest(ctx):
+    """DART 10년치 조회 + 삽입 데이터 준비 + DB 저장 처리량"""
+    from app import api_service, db
+    from app.finance_service import prepare_data_for_insert
+
+    if api_service.get_directory() is None:
+        api_service.load_corp_code_cache()
+    ctx.reset_database()
+
+    requests_before = sum(ctx.dart.requests.values())
+    rows = 0
+    prepare_time = insert_time = 0.0
+    started = time.perf_counter()
+    for corp in ctx.corps:
+        t0 = time.perf_counter()
+        success, message, values, _ = prepare_data_for_insert(corp['corp_name'])
+        t1 = time.perf_counter()
+        if not success:
+            raise RuntimeError(f"{corp['corp_name']} 데이터 준비 실패: {message}")
+        if not db.insert_data(values):
+            raise RuntimeError(f"{corp['corp_name']} 저장 실패")
+        t2 = time.perf_counter()
+        prepare_time += t1 - t0
+        insert_time += t2 - t1
+        rows += len(values)
+    elapsed = time.perf_counter() - started
+
+    return {
+        'total_s': elapsed,
+        'corps_per_s': len(ctx.corps) / elapsed,
+        'rows_per_s': rows / elapsed,
+        'prepare_per_corp_ms': prepare_time / len(ctx.corps) * 1000,
+        'insert_per_corp_ms': insert_time / len(ctx.corps) * 1000,
+        'rows': rows,
+        'dart_requests': sum(ctx.dart.requests.values()) - requests_before,
+    }
+
+
+@scenario('sync')
+def sync(ctx):
+    """최근 사업연도가 빠진 기업들을 증분 동기화하는 처리량과 기업당 DART 요청 수"""
+    from app import api_service, db
+    from app.finance_service import prepare_data_for_insert, save_finance_rows
+
+    if api_service.get_directory() is None:
+        api_service.load_corp_code_cache()
+
+    # 최근 사업연도만 빠진 상태를 만듦 (새 사업보고서가 나온 직후)
+    ctx.reset_database()
+    for corp in ctx.corps:
+        success, message, values, _ = prepare_data_for_insert(corp['corp_name'])
+        if not success or not db.insert_data([row for row in values if row[5] < ctx.latest_year]):
+            raise RuntimeError(f"{corp['corp_name']} 데이터 준비 실패: {message}")
+
+    requests_before = sum(ctx.dart.requests.values())
+    rows = 0
+    started = time.perf_counter()
+    for corp in ctx.corps:
+        success, message, values, is_update = prepare_data_for_insert(corp['corp_name'])
+        if not success or not is_update or not save_finance_rows(values, is_update):
+            raise RuntimeError(f"{corp['corp_name']} 동기화 실패: {message}")
+        rows += len(values)
+    elapsed = time.perf_counter() - started
+    ctx.mark_ingested()
+
+    return {
+        'per_corp_ms': elapsed / len(ctx.corps) * 1000,
+        'corps_per_s': len(ctx.corps) / elapsed,
+        'dart_requests_per_corp': (sum(ctx.dart.requests.values()) - requests_before) / len(ctx.corps),
+        'rows': rows,
+    }
+
+
+@scenario('filings_sync')
+def filings_sync(ctx):
+    """공시 목록 변경 감지로 새 사업보고서를 낸 기업만 갱신하는 야간 동기화 (재무제표 요청 수 = 새 공시 수)"""
+    import tempfile
+    from datetime import date, timedelta
+    from bench import fixtures
+    from app import api_service, db, refresher
+    from app.finance_service import prepare_data_for_insert
+
+    if api_service.get_directory() is None:
+        api_service.load_corp_code_cache()
+
+    # 모든 기업의 최근 사업연도가 빠진 상태에서 4곳 중 1곳만 오늘 사업보고서를 제출
+    ctx.reset_database()
+    for corp in ctx.corps:
+        success, message, values, _ = prepare_data_for_insert(corp['corp_name'])
+        if not success or not db.insert_data([row for row in values if row[5] < ctx.latest_year]):
+            raise RuntimeError(f"{corp['corp_name']} 데이터 준비 실패: {message}")
+    filed = ctx.corps[::4]
+    today = date.today()
+    filings = fixtures.make_filings(filed, ctx.latest_year, today.strftime('%Y%m%d'))
+    # 저장하지 않은 기업의 공시와 반기보고서는 갱신 대상이 아님
+    others = [{'corp_code': f"9{corp['corp_code'][1:]}", 'corp_name': f"비상장{index}", 'stock_code': ''}
+              for index, corp in enumerate(ctx.corps)]
+    filings += fixtures.make_filings(others, ctx.latest_year, today.strftime('%Y%m%d'), start_no=len(filed))
+    filings += fixtures.make_filings(ctx.corps, ctx.latest_year, today.strftime('%Y%m%d'), detail_ty='A002',
+                                     start_no=len(filed) + len(ctx.corps))
+    ctx.dart.filings[:] = filings
+
+    saved = refresher.STATE_PATH, refresher.REQUESTS_PER_MINUTE, refresher.POLL_FILINGS
+    with tempfile.TemporaryDirectory(prefix='bench_refresher_') as workdir:
+        refresher.STATE_PATH = f"{workdir}/refresher_state.json"
+        refresher.REQUESTS_PER_MINUTE = 0
+        refresher.POLL_FILINGS = True
+        try:
+            # 어제까지 공시 목록을 확인한 상태 (지난 야간 동기화)
+            state = refresher.load_state()
+            state['filings'].update(cursor=(today - timedelta(days=1)).strftime('%Y%m%d'), seen=[])
+            refresher.save_state(state)
+
+            finance_before = ctx.dart.requests['/api/fnlttSinglAcntAll.json']
+            list_before = ctx.dart.requests['/api/list.json']
+            started = time.perf_counter()
+            cycle = refresher.run_cycle(today=today)
+            elapsed = time.perf_counter() - started
+        finally:
+            refresher.STATE_PATH, refresher.REQUESTS_PER_MINUTE, refresher.POLL_FILINGS = saved
+            ctx.dart.filings[:] = []
+
+    finance_requests = ctx.dart.requests['/api/fnlttSinglAcntAll.json'] - finance_before
+    if cycle is None or cycle['updated'] != len(filed) or finance_requests != len(filed):
+        raise RuntimeError(f"공시 {len(filed)}건에 재무제표 요청 {finance_requests}회 (주기 결과: {cycle})")
+
+    return {
+        'total_s': elapsed,
+        'per_filing_ms': elapsed / len(filed) * 1000,
+        'filings': len(filed),
+        'stale_corps': len(ctx.corps),
+        'finance_requests': finance_requests,
+        'list_requests': ctx.dart.requests['/api/list.json'] - list_before,
+    }
+
+
+@scenario('compare')
+def compare(ctx):
+    """기업 비교표(make_compare_table) 생성 시간 (비교 대상 2~20개)"""
+    from app.finance_service import make_compare_table
+
+    ctx.ensure_ingested()
+    year = str(ctx.latest_year)
+    results = {}
+    for count in (2, 5, 10, 20):
+        targets = [{'corp': corp['corp_name'], 'year': year} for corp in ctx.corps[:count]]
+        if len(targets) < count:
+            break
+        timings = measure(lambda: make_compare_table(targets), ctx.repeat(5))
+        results[f'targets_{count}_ms'] = statistics.median(timings) * 1000
+    return results
+
+
+@scenario('export')
+def export(ctx):
+    """전체 데이터 CSV/JSON 내보내기 처리량"""
+    from app.finance_service import export_data_to_csv, export_data_to_json
+
+    ctx.ensure_ingested()
+
+    def to_csv():
+        df = export_data_to_csv()
+        output = BytesIO()
+        df.to_csv(output, index=False, encoding='utf-8-sig')
+        return len(df)
+
+    rows = len(export_data_to_csv())
+    csv_timings = measure(to_csv, ctx.repeat(3))
+    json_timings = measure(export_data_to_json, ctx.repeat(3))
+    return {
+        'csv_ms': statistics.median(csv_timings) * 1000,
+        'json_ms': statistics.median(json_timings) * 1000,
+        'csv_rows_per_s': rows / statistics.median(csv_timings),
+        'json_rows_per_s': rows / statistics.median(json_timings),
+        'rows': rows,
+    }
+
+
+@scenario('train', requires=('sklearn',))
+def train(ctx):
+    """예측 모델 학습 데이터 준비(scikit) + 학습(train_model) 시간"""
+    from app.ml_service import scikit, train_model
+
+    ctx.ensure_ingested()
+    prepare_timings = measure(scikit, ctx.repeat(3))
+    pivot, target_df = scikit()
+    train_timings = measure(lambda: train_model(pivot, target_df), ctx.repeat(3))
+    return {
+        'prepare_ms': statistics.median(prepare_timings) * 1000,
+        'train_ms': statistics.median(train_timings) * 1000,
+        'samples': len(pivot),
+    }
+
+
+@scenario('pdf_render', requires=('matplotlib', 'reportlab'))
+def pdf_render(ctx):
+    """단일 기업 재무상태표 PDF(차트 렌더링 + 문서 생성) 시간 (렌더링 결과 캐시 미사용)"""
+    from app import db
+    from app.pdf_service import generate_pdf_chart_image, generate_pdf_document
+
+    ctx.ensure_ingested()
+    corp_name = ctx.corps[0]['corp_name']
+    year = str(ctx.latest_year)
+    rows = db.get_account_data_by_year(corp_name, year)
+
+    # 첫 실행의 폰트 등록/matplotlib 초기화는 warmup으로 제외
+    chart_timings = measure(lambda: generate_pdf_chart_image(rows, corp_name, year), ctx.repeat(3))
+    chart = generate_pdf_chart_image(rows, corp_name, year)
+    document_timings = measure(lambda: generate_pdf_document(rows, corp_name, year, BytesIO(chart.getvalue())), ctx.repeat(3))
+    return {
+        'chart_ms': statistics.median(chart_timings) * 1000,
+        'document_ms': statistics.median(document_timings) * 1000,
+    }
@@ -0,0 +1,54 @@
+"""
+부하 테스트용 앱 서버
+가짜 DART 서버와 합성 데이터로 채운 임시 DB를 준비한 뒤 Flask 앱을 멀티스레드 WSGI 서버로 실행합니다.
+준비가 끝나면 표준 출력에 "READY <주소>" 한 줄을 출력합니다. (bench.loadtest가 하위 프로세스로 사용)
+
+    python -m bench.serve --corps 30 --port 5055
+"""
+import argparse
+import logging
+import shutil
+import sys
+import tempfile
+
+from bench import fixtures
+from bench.fake_dart import FakeDart
+from bench.run import BenchContext, configure_app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 데이터로 채운 부하 테스트용 앱 서버를 실행합니다.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=0, help="0이면 빈 포트를 자동으로 선택")
+    parser.add_argument('--corps', type=int, default=30)
+    parser.add_argument('--directory-size', type=int, default=20000)
+    parser.add_argument('--latency', type=float, default=0.0, help="가짜 DART 응답 지연 (초)")
+    parser.add_argument('--backend', default='sqlite', choices=['sqlite', 'duckdb', 'mysql'])
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench_serve_')
+    corps = fixtures.make_corps(args.corps)
+    try:
+        with FakeDart(corps, args.directory_size, args.latency) as dart:
+            configure_app(workdir, args.backend, dart)
+            BenchContext(corps, dart).ensure_ingested()
+
+            from werkzeug.serving import make_server
+            from app import create_app
+
+            app = create_app()
+            # 요청마다 남는 접근 로그가 측정을 방해하지 않도록 경고 이상만 출력
+            logging.getLogger('werkzeug').setLevel(logging.WARNING)
+            server = make_server(args.host, args.port, app, threaded=True)
+            print(f"READY http://{args.host}:{server.server_port}", flush=True)
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()
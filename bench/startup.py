@@ -0,0 +1,135 @@
+"""
+앱 시작(cold start) 시간 측정
+새 파이썬 프로세스에서 `python -X importtime`으로 app 패키지 import와 create_app()을 실행하여
+시작 시간과 import 시간이 큰 모듈을 보고합니다.
+시작 시간이 상한을 넘거나 무거운 라이브러리(pandas, numpy, sklearn, matplotlib, reportlab, easyocr 등)가
+시작 시점에 로드되면 종료 코드 1로 끝납니다.
+
+    python -m bench.startup
+    python -m bench.startup --ceiling-ms 500 --repeat 10 --top 30
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 첫 사용 시에만 로드되어야 하는 무거운 라이브러리
+HEAVY_MODULES = ['pandas', 'numpy', 'sklearn', 'matplotlib', 'reportlab', 'easyocr', 'cv2']
+
+# 시작 시간 상한 (app import + create_app, 밀리초)
+DEFAULT_CEILING_MS = 800
+
+# 하위 프로세스에서 실행하는 코드 (측정 결과를 인자로 받은 파일에 JSON으로 저장)
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+from app import api_service, create_app
+imported = time.perf_counter()
+api_service.API_KEY = ''  # 측정 중 백그라운드 기업 코드 로딩이 DART를 호출하지 않도록 함
+create_app()
+finished = time.perf_counter()
+with open(sys.argv[1], 'w') as f:
+    json.dump({
+        'import_ms': (imported - started) * 1000,
+        'create_app_ms': (finished - imported) * 1000,
+        'total_ms': (finished - started) * 1000,
+        'heavy_modules': [name for name in %r if name in sys.modules],
+    }, f)
+""" % (HEAVY_MODULES,)
+
+
+def parse_importtime(stderr):
+    """
+    -X importtime 출력을 {모듈: (자체 시간 us, 누적 시간 us)}로 변환합니다.
+    같은 모듈은 처음 import된 위치의 값만 사용합니다.
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        name = parts[2].strip()
+        modules.setdefault(name, (int(parts[0]), int(parts[1])))
+    return modules
+
+
+def run_probe():
+    """새 프로세스에서 한 번 시작 시간을 측정합니다."""
+    env = dict(os.environ, PYTHONPATH=ROOT_DIR, PYTHONWARNINGS='ignore')
+    with tempfile.TemporaryDirectory(prefix='bench_startup_') as workdir:
+        output = os.path.join(workdir, 'result.json')
+        completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', _PROBE, output], cwd=ROOT_DIR,
+                                   env=env, capture_output=True, text=True, timeout=120)
+        if completed.returncode != 0:
+            raise RuntimeError(f"시작 시간 측정 실패 (종료 코드 {completed.returncode}):\n{completed.stderr[-2000:]}")
+        with open(output, encoding='utf-8') as f:
+            result = json.load(f)
+    result['modules'] = parse_importtime(completed.stderr)
+    return result
+
+
+def measure_startup(repeat=5):
+    """
+    repeat번 새 프로세스로 시작 시간을 측정합니다. (바이트코드 컴파일 영향을 빼기 위해 한 번 먼저 실행)
+
+    Returns:
+        dict: {'import_ms', 'create_app_ms', 'total_ms'(중앙값), 'heavy_modules', 'modules'(마지막 실행의 import 시간)}
+    """
+    run_probe()
+    runs = [run_probe() for _ in range(repeat)]
+    return {
+        'import_ms': statistics.median(run['import_ms'] for run in runs),
+        'create_app_ms': statistics.median(run['create_app_ms'] for run in runs),
+        'total_ms': statistics.median(run['total_ms'] for run in runs),
+        'heavy_modules': sorted(set().union(*(run['heavy_modules'] for run in runs))),
+        'modules': runs[-1]['modules'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="app 패키지 cold start 시간과 import 비용을 측정합니다.")
+    parser.add_argument('--repeat', type=int, default=5, help="측정 횟수 (중앙값 사용)")
+    parser.add_argument('--ceiling-ms', type=float, default=DEFAULT_CEILING_MS, help="시작 시간 상한 (밀리초)")
+    parser.add_argument('--top', type=int, default=15, help="누적 import 시간이 큰 모듈 출력 개수")
+    parser.add_argument('--output', help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    result = measure_startup(args.repeat)
+    print(f"app import     {result['import_ms']:8.1f}ms")
+    print(f"create_app()   {result['create_app_ms']:8.1f}ms")
+    print(f"합계           {result['total_ms']:8.1f}ms (상한 {args.ceiling_ms:.0f}ms)")
+
+    print(f"\n누적 import 시간 상위 {args.top}개 (app 제외)")
+    ranked = sorted(((cumulative, name) for name, (_, cumulative) in result['modules'].items()
+                     if name != 'app' and not name.startswith('app.')), reverse=True)
+    for cumulative, name in ranked[:args.top]:
+        print(f"  {cumulative / 1000:8.1f}ms  {name}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"\n결과 저장: {args.output}")
+
+    failures = []
+    if result['total_ms'] > args.ceiling_ms:
+        failures.append(f"시작 시간 {result['total_ms']:.0f}ms > 상한 {args.ceiling_ms:.0f}ms")
+    if result['heavy_modules']:
+        failures.append(f"시작 시점에 로드된 무거운 모듈: {', '.join(result['heavy_modules'])}")
+    if failures:
+        print()
+        for failure in failures:
+            print(f"  ✗ {failure}")
+        sys.exit(1)
+    print("\n시작 시간 상한 충족")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+gunicorn 설정 (운영 서버 진입점, Linux/macOS)
+
+    gunicorn -c gunicorn.conf.py
+
+preload_app으로 마스터 프로세스에서 앱과 읽기 전용 캐시(기업 코드 목록, 한글 폰트, pandas 등)를 한 번만 로드한 뒤
+워커를 fork하여 copy-on-write로 공유합니다. (app/prefork.py)
+워커별 고유/공유 메모리는 /metrics의 process_memory_bytes 또는 `python -m app.prefork <마스터 PID>`로 확인합니다.
+"""
+import gc
+import multiprocessing
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 앱 로드 중 생긴 객체가 해제되며 공유할 메모리 페이지에 빈 곳이 생기지 않도록 fork 전까지 GC를 멈춤
+# (prefork.preload에서 객체를 고정한 뒤 다시 켬, 미리 로드가 실패해도 finally에서 켬)
+gc.disable()
+
+wsgi_app = 'app:create_app()'
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+preload_app = True
+
+if os.environ.get('DB_BACKEND', 'mysql').strip().lower() == 'duckdb' and workers > 1:
+    # DuckDB 파일은 한 프로세스만 쓰기 모드로 열 수 있음
+    print("경고: DuckDB 백엔드는 여러 프로세스에서 열 수 없어 워커를 1개로 실행합니다.")
+    workers = 1
+
+
+def when_ready(server):
+    """마스터: 워커를 fork하기 전에 읽기 전용 캐시를 로드"""
+    from app import prefork
+    prefork.preload()
+
+
+def post_fork(server, worker):
+    """워커: fork 직후 백그라운드 스레드와 DB 핸들을 다시 준비"""
+    from app import prefork
+    prefork.after_fork()
+
+
+def post_worker_init(worker):
+    """워커: 초기화가 끝난 시점의 고유/공유 메모리 기록"""
+    from app import prefork
+    prefork.log_memory(f"워커 {worker.pid}")
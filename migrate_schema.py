@@ -0,0 +1,183 @@
+"""
+corp_finance 단일 테이블을 정규화 저장 구조(기업/계정 차원 + 금액 팩트 테이블)로 옮기는 스크립트
+기존 테이블은 corp_finance_flat으로 이름을 바꿔 보관하고, 같은 이름의 호환 뷰를 만들어
+db.py의 기존 조회 쿼리가 그대로 동작하도록 합니다.
+
+이전/이후의 테이블 크기와 대표 쿼리 응답 시간을 비교하여 출력합니다.
+마이그레이션 후에는 .env에 SCHEMA_LAYOUT=normalized를 설정해야 새 데이터가 정규화 테이블에 저장됩니다.
+
+    python migrate_schema.py            # 마이그레이션 + 벤치마크
+    python migrate_schema.py --bench    # 현재 구조 벤치마크만
+
+MySQL 백엔드(DB_BACKEND=mysql) 전용입니다.
+"""
+import argparse
+import statistics
+import time
+
+from app import db
+
+
+FLAT_BACKUP_TABLE_NAME = f"{db.TABLE_NAME}_flat"
+BENCH_REPEAT = 20
+
+
+def get_table_sizes(cursor, table_names):
+    """테이블별 (행 수, 데이터 크기, 인덱스 크기)를 바이트 단위로 조회합니다."""
+    placeholders = ", ".join(["%s"] * len(table_names))
+    cursor.execute("ANALYZE TABLE " + ", ".join(table_names))
+    cursor.fetchall()
+    cursor.execute(f"""
+        SELECT TABLE_NAME, TABLE_ROWS, DATA_LENGTH, INDEX_LENGTH FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = %s AND TABLE_NAME IN ({placeholders})
+    """, (db.DB_NAME, *table_names))
+    return {row[0]: (row[1], row[2], row[3]) for row in cursor.fetchall()}
+
+
+def print_sizes(title, sizes):
+    print(f"\n[{title}] 테이블 크기")
+    total = 0
+    for name, (rows, data_length, index_length) in sizes.items():
+        total += data_length + index_length
+        print(f"  {name:<20} 행 {rows:>10,}  데이터 {data_length / 1024 / 1024:8.2f}MB  인덱스 {index_length / 1024 / 1024:8.2f}MB")
+    print(f"  {'합계':<20} {total / 1024 / 1024:.2f}MB")
+    return total
+
+
+def bench_queries():
+    """대표 조회 쿼리의 응답 시간(중앙값, ms)을 측정합니다."""
+    corp_list = db.get_corp_list()
+    if not corp_list:
+        print("  저장된 데이터가 없어 쿼리 벤치마크를 건너뜁니다.")
+        return {}
+
+    corp_name = corp_list[0][0]
+    years = db.get_year_list(corp_name)
+    year = years[0][0] if years else None
+
+    queries = {
+        'get_year_list': lambda: db.get_year_list(corp_name),
+        'get_jasan_data': lambda: db.get_jasan_data(corp_name),
+        'get_account_data_by_year': lambda: db.get_account_data_by_year(corp_name, year),
+        'get_pie_data': lambda: db.get_pie_data(corp_name, year),
+        'get_all_data': db.get_all_data,
+    }
+
+    results = {}
+    for name, query in queries.items():
+        timings = []
+        for _ in range(BENCH_REPEAT):
+            started = time.perf_counter()
+            query()
+            timings.append((time.perf_counter() - started) * 1000)
+        results[name] = statistics.median(timings)
+        print(f"  {name:<26} {results[name]:8.2f}ms")
+    return results
+
+
+def migrate(cursor):
+    """기존 단일 테이블 데이터를 정규화 테이블로 복사하고 호환 뷰를 만듭니다."""
+    cursor.execute(f"RENAME TABLE {db.TABLE_NAME} TO {FLAT_BACKUP_TABLE_NAME}")
+    db._create_normalized_tables(cursor)
+
+    cursor.execute(f"""
+        INSERT INTO {db.CORP_DIM_TABLE_NAME} (corp_code, corp_name)
+        SELECT corp_code, MAX(corp_name) FROM {FLAT_BACKUP_TABLE_NAME}
+        WHERE corp_code IS NOT NULL
+        GROUP BY corp_code
+    """)
+
+    cursor.execute(f"""
+        INSERT INTO {db.ACCOUNT_DIM_TABLE_NAME} (account_id, account_nm, canonical_nm)
+        SELECT COALESCE(account_id, ''), COALESCE(account_nm, ''), COALESCE(account_nm, '')
+        FROM {FLAT_BACKUP_TABLE_NAME}
+        GROUP BY COALESCE(account_id, ''), COALESCE(account_nm, '')
+        ORDER BY MIN(id)
+    """)
+
+    # account_id별 대표 이름: 가장 먼저 등록된 이름
+    cursor.execute(f"""
+        UPDATE {db.ACCOUNT_DIM_TABLE_NAME} a
+        JOIN (
+            SELECT account_id, MIN(account_key) AS first_key FROM {db.ACCOUNT_DIM_TABLE_NAME}
+            WHERE account_id <> '' GROUP BY account_id
+        ) f ON f.account_id = a.account_id
+        JOIN {db.ACCOUNT_DIM_TABLE_NAME} c ON c.account_key = f.first_key
+        SET a.canonical_nm = c.account_nm
+    """)
+
+    cursor.execute(f"""
+        INSERT INTO {db.FACT_TABLE_NAME} (id, corp_key, account_key, year, amount)
+        SELECT f.id, c.corp_key, a.account_key, f.year, f.amount
+        FROM {FLAT_BACKUP_TABLE_NAME} f
+        JOIN {db.CORP_DIM_TABLE_NAME} c ON c.corp_code = f.corp_code
+        JOIN {db.ACCOUNT_DIM_TABLE_NAME} a
+          ON a.account_id = COALESCE(f.account_id, '') AND a.account_nm = COALESCE(f.account_nm, '')
+        ORDER BY f.id
+    """)
+
+    db._create_compat_view(cursor)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="corp_finance를 정규화 저장 구조로 마이그레이션합니다.")
+    parser.add_argument('--bench', action='store_true', help="마이그레이션 없이 현재 구조의 벤치마크만 실행")
+    args = parser.parse_args()
+
+    # 이후 추가된 테이블/컬럼은 백엔드와 저장 구조에 관계없이 먼저 반영
+    if not args.bench and db.ensure_schema():
+        print("✓ 테이블/컬럼 구성 확인 완료")
+
+    if db.backend.name != 'mysql':
+        # 테이블 크기 조회와 RENAME/UPDATE JOIN 문이 MySQL 전용
+        print(f"이 스크립트는 MySQL 백엔드 전용입니다. (현재 DB_BACKEND={db.backend.name})")
+        return
+
+    conn = db.get_conn()
+    cursor = conn.cursor()
+    try:
+        is_normalized = db.backend.relation_type(cursor, db.TABLE_NAME) == 'view'
+
+        normalized_tables = [db.CORP_DIM_TABLE_NAME, db.ACCOUNT_DIM_TABLE_NAME, db.FACT_TABLE_NAME]
+
+        if args.bench:
+            print_sizes("현재", get_table_sizes(cursor, normalized_tables if is_normalized else [db.TABLE_NAME]))
+            print("\n[현재] 쿼리 응답 시간 (중앙값)")
+            bench_queries()
+            return
+
+        if is_normalized:
+            print("이미 정규화 저장 구조입니다.")
+            return
+
+        before_size = print_sizes("이전", get_table_sizes(cursor, [db.TABLE_NAME]))
+        print("\n[이전] 쿼리 응답 시간 (중앙값)")
+        before = bench_queries()
+
+        print("\n마이그레이션 중...")
+        migrate(cursor)
+        conn.commit()
+        print(f"✓ 마이그레이션 완료 (기존 테이블은 {FLAT_BACKUP_TABLE_NAME}에 보관)")
+
+        after_size = print_sizes("이후", get_table_sizes(cursor, normalized_tables))
+        print("\n[이후] 쿼리 응답 시간 (중앙값)")
+        after = bench_queries()
+
+        print("\n[비교]")
+        if before_size:
+            print(f"  저장 공간 {before_size / 1024 / 1024:.2f}MB -> {after_size / 1024 / 1024:.2f}MB "
+                  f"({(after_size - before_size) / before_size * 100:+.1f}%)")
+        for name in before:
+            if before[name]:
+                print(f"  {name:<26} {before[name]:8.2f}ms -> {after[name]:8.2f}ms "
+                      f"({(after[name] - before[name]) / before[name] * 100:+.1f}%)")
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,231 @@
+"""
+저장소 백엔드 적합성 테스트
+같은 검사 항목을 SQLite, DuckDB(임시 파일)와 MySQL(설정된 경우)에 차례로 실행하여
+db.py의 모든 조회/쓰기 함수가 백엔드와 저장 구조(flat/normalized)에 관계없이 같은 결과를 내는지 확인합니다.
+
+    python -m pytest tests/test_storage_conformance.py                    # sqlite, duckdb(설치된 경우)
+    CONFORMANCE_MYSQL=true python -m pytest tests/test_storage_conformance.py  # .env의 MySQL 설정도 사용 (테이블을 다시 만듦)
+"""
+import os
+
+import pytest
+
+from app import db, data_version
+
+
+SAMPLE_ROWS = [
+    ('가나전자', '00000001', 'ifrs-full_Assets', '자산총계', 1000, 2023),
+    ('가나전자', '00000001', 'ifrs-full_Liabilities', '부채총계', 400, 2023),
+    ('가나전자', '00000001', 'ifrs-full_Equity', '자본총계', 600, 2023),
+    ('가나전자', '00000001', 'ifrs-full_Inventories', '재고자산', 150, 2023),
+    ('가나전자', '00000001', None, '기타항목', 7, 2023),
+    ('가나전자', '00000001', 'ifrs-full_Assets', '자산총계', 900, 2022),
+    ('가나전자', '00000001', 'ifrs-full_Equity', '자본총계', 500, 2022),
+    ('다라화학', '00000002', 'ifrs-full_Assets', '자산 총계', 300, 2024),
+    ('다라화학', '00000002', 'ifrs-full_Inventories', '재고 자산', 40, 2024),
+]
+
+
+def check_schema():
+    assert db.create_database(), "create_database 실패"
+    assert db.drop_table(), "drop_table 실패"
+    assert db.create_table(), "create_table 실패"
+    # 다시 삭제/생성해도 시퀀스·인덱스 이름이 충돌하지 않아야 함
+    assert db.drop_table(), "drop_table(재실행) 실패"
+    assert db.create_table(), "create_table(재실행) 실패"
+
+
+def check_insert_and_read():
+    assert db.insert_data(SAMPLE_ROWS), "insert_data 실패"
+
+    assert [row[0] for row in db.get_corp_list()] == ['가나전자', '다라화학']
+    assert [str(row[0]) for row in db.get_year_list('가나전자')] == ['2023', '2022']
+    assert db.get_latest_year_by_corp_code('00000001') == 2023
+    assert db.get_latest_year_by_corp_code('99999999') is None
+
+    rows = db.get_account_data_by_year('가나전자', 2023)
+    assert len(rows) == 5 and ('ifrs-full_Assets', '자산총계', 1000) in [tuple(row) for row in rows]
+
+    pie = db.get_pie_data('가나전자', 2023)
+    assert pie['ifrs-full_Equity']['amount'] == 600 and pie['ifrs-full_Liabilities']['amount'] == 400
+
+    compare = db.get_data_for_compare('다라화학', 2024)
+    assert sorted(row['amount'] for row in compare) == [40, 300]
+
+    batch = db.get_account_data_for_corps(['가나전자', '다라화학'], ['2022', '2024'])
+    assert len(batch) == 4 and batch[0][0] == '가나전자'
+
+    assert len(db.get_all_data()) == len(SAMPLE_ROWS)
+
+
+def check_frames():
+    df = db.get_all_data_frame()
+    assert list(df.columns) == ['corp_name', 'account_id', 'account_nm', 'amount', 'year']
+    assert len(df) == len(SAMPLE_ROWS)
+
+    pivot = db.get_account_pivot(['ifrs-full_Inventories', 'ifrs-full_Assets', 'ifrs-full_Cash'])
+    assert list(pivot.columns) == ['corp_name', 'year', 'ifrs-full_Assets', 'ifrs-full_Inventories'], list(pivot.columns)
+    records = {(row.corp_name, int(row.year)): row for row in pivot.itertuples(index=False)}
+    assert records[('가나전자', 2023)][2] == 1000 and records[('가나전자', 2023)][3] == 150
+    assert records[('가나전자', 2022)][3] != records[('가나전자', 2022)][3]  # NaN
+
+    targets = db.get_account_frame(['ifrs-full_Equity'])
+    assert sorted(targets['amount'].tolist()) == [500, 600]
+
+
+def check_directory_and_versions():
+    directory = {row[0]: row for row in db.get_corp_directory()}
+    assert directory['00000001'][2] == [2023, 2022] and directory['00000001'][3] == 2023
+
+    versions = db.get_data_versions_since(0)
+    assert [row[0] for row in versions] == ['가나전자', '다라화학']
+    latest = versions[-1][1]
+
+    assert db.delete_data_by_corp_code('00000002'), "delete_data_by_corp_code 실패"
+    assert [row[0] for row in db.get_corp_list()] == ['가나전자']
+    assert '00000002' not in {row[0] for row in db.get_corp_directory()}
+    changed = db.get_data_versions_since(latest)
+    assert [row[0] for row in changed] == ['다라화학'] and changed[0][1] > latest
+
+    assert db.rebuild_corp_directory()
+    assert [row[0] for row in db.get_corp_directory()] == ['00000001']
+
+
+def check_normalized_accounts():
+    if db.SCHEMA_LAYOUT != 'normalized':
+        return
+    # 같은 account_id를 다른 이름으로 저장해도 계정 차원은 한 행씩만 늘어나야 함
+    assert db.insert_data([('마바식품', '00000003', 'ifrs-full_Assets', '자산 합계', 50, 2024)])
+    rows = db.get_account_data_by_year('마바식품', 2024)
+    assert [tuple(row) for row in rows] == [('ifrs-full_Assets', '자산 합계', 50)]
+
+
+def check_report_data():
+    rows = [
+        ('가나전자', '00000001', 'ifrs-full_Revenue', '매출액', 500, 2023, 'H1', 'CFS', 'IS'),
+        ('가나전자', '00000001', 'ifrs-full_Assets', '자산총계', 980, 2023, 'H1', 'CFS', 'BS'),
+        ('가나전자', '00000001', 'ifrs-full_Revenue', '매출액', 450, 2022, 'H1', 'CFS', 'IS'),
+        ('가나전자', '00000001', 'ifrs-full_Revenue', '매출액', 420, 2023, 'H1', 'OFS', 'IS'),
+    ]
+    assert db.get_latest_year_by_corp_code('00000001', 'H1', 'CFS') is None
+    finance_rows = len(db.get_all_data())
+    assert db.insert_report_data(rows), "insert_report_data 실패"
+    assert db.get_latest_year_by_corp_code('00000001', 'H1', 'CFS') == 2023
+    assert db.get_latest_year_by_corp_code('00000001', 'Q1', 'CFS') is None
+    # 보고서별 데이터는 corp_finance(사업보고서 연결 재무상태표)에 섞이지 않음
+    assert db.get_latest_year_by_corp_code('00000001') == 2023
+    assert len(db.get_all_data()) == finance_rows
+
+    assert [row[4] for row in db.get_report_data('00000001', 'H1', 'CFS', 'IS')] == [500, 450]
+    assert [row[4] for row in db.get_report_data('00000001', 'H1', 'OFS')] == [420]
+
+    # 같은 기업/기간/연도를 다시 저장하면 교체
+    assert db.insert_report_data([('가나전자', '00000001', 'ifrs-full_Revenue', '매출액', 510, 2023, 'H1', 'CFS', 'IS')])
+    assert [row[4] for row in db.get_report_data('00000001', 'H1', 'CFS', year=2023)] == [510]
+    assert len(db.get_report_data('00000001', 'H1', 'CFS')) == 2
+
+
+def check_replace_data():
+    latest = db.get_data_versions_since(0)[-1][1]
+    # 지정한 연도만 교체하고 다른 연도는 그대로 둠
+    assert db.replace_data_by_corp_code('00000001', [
+        ('가나전자', '00000001', 'ifrs-full_Assets', '자산총계', 1100, 2023),
+        ('가나전자', '00000001', 'ifrs-full_Assets', '자산총계', 1200, 2024),
+    ], [2023, 2024]), "replace_data_by_corp_code 실패"
+    assert [tuple(row) for row in db.get_account_data_by_year('가나전자', 2023)] == [('ifrs-full_Assets', '자산총계', 1100)]
+    assert len(db.get_account_data_by_year('가나전자', 2022)) == 2
+    assert db.get_latest_year_by_corp_code('00000001') == 2024
+    directory = {row[0]: row for row in db.get_corp_directory()}
+    assert directory['00000001'][2] == [2024, 2023, 2022] and directory['00000001'][3] == 2024
+    changed = db.get_data_versions_since(latest)
+    assert [row[0] for row in changed] == ['가나전자']
+
+    # 넣을 행이 없어도 해당 연도는 지워지고 버전은 올라감 (캐시 무효화)
+    latest = db.get_data_versions_since(0)[-1][1]
+    assert db.replace_data_by_corp_code('00000001', [], [2022])
+    assert len(db.get_account_data_by_year('가나전자', 2022)) == 0
+    assert [row[0] for row in db.get_data_versions_since(latest)] == ['가나전자']
+
+    # min_year를 주면 교체할 연도 외에 보관 범위보다 오래된 연도도 삭제
+    assert db.replace_data_by_corp_code('00000001', [
+        ('가나전자', '00000001', 'ifrs-full_Assets', '자산총계', 1250, 2024),
+    ], [2024], min_year=2024)
+    assert [str(row[0]) for row in db.get_year_list('가나전자')] == ['2024']
+
+    # 연도를 주지 않으면 기업의 모든 행을 교체
+    assert db.replace_data_by_corp_code('00000001', [('가나전자', '00000001', 'ifrs-full_Assets', '자산총계', 1300, 2024)])
+    assert [str(row[0]) for row in db.get_year_list('가나전자')] == ['2024']
+    assert [tuple(row) for row in db.get_account_data_by_year('가나전자', 2024)] == [('ifrs-full_Assets', '자산총계', 1300)]
+
+
+def _drop_tables(*tables):
+    conn = db.get_conn()
+    cursor = conn.cursor()
+    try:
+        for table in tables:
+            cursor.execute(f"DROP TABLE IF EXISTS {table}")
+        conn.commit()
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def check_ensure_schema():
+    # 데이터 버전/기업 목록 테이블 추가 이전에 만든 DB: 시작 시 ensure_schema가 만들어 쓰기가 다시 동작해야 함
+    directory = db.get_corp_directory()
+    _drop_tables(db.VERSION_TABLE_NAME, db.DIRECTORY_TABLE_NAME)
+    assert db.ensure_schema(), "ensure_schema 실패"
+    # 기존 데이터로 기업 목록을 채움
+    assert db.get_corp_directory() == directory
+    assert db.ensure_schema(), "ensure_schema(재실행) 실패"
+    assert db.insert_data([('마바식품', '00000003', 'ifrs-full_Assets', '자산총계', 80, 2024)]), "insert_data 실패"
+    assert [row[0] for row in db.get_data_versions_since(0)] == ['마바식품']
+    assert '00000003' in {row[0] for row in db.get_corp_directory()}
+
+
+CHECKS = [
+    check_schema,
+    check_insert_and_read,
+    check_frames,
+    check_directory_and_versions,
+    check_normalized_accounts,
+    check_report_data,
+    check_replace_data,
+    check_ensure_schema,
+]
+
+
+_SKIP_MYSQL = pytest.mark.skipif(os.environ.get('CONFORMANCE_MYSQL', 'False').lower() != 'true',
+                                 reason="CONFORMANCE_MYSQL=true 일 때만 실행 (MySQL 테이블을 다시 만듦)")
+STORAGES = [
+    pytest.param((backend_name, schema_layout), id=f"{backend_name}-{schema_layout}",
+                 marks=[_SKIP_MYSQL] if backend_name == 'mysql' else [])
+    for backend_name in ('sqlite', 'duckdb', 'mysql')
+    for schema_layout in ('flat', 'normalized')
+]
+
+
+@pytest.fixture
+def storage(request, tmp_path, monkeypatch):
+    """검사할 백엔드/저장 구조로 db를 설정하고, 끝나면 원래 백엔드로 되돌립니다."""
+    backend_name, schema_layout = request.param
+    if backend_name == 'duckdb':
+        pytest.importorskip('duckdb')
+    # 다른 실행 중인 서버에 변경 신호를 보내지 않도록 임시 신호 파일 사용
+    monkeypatch.setattr(data_version, 'SIGNAL_FILE', str(tmp_path / 'data_version'))
+    for name in ('backend', 'DBError', 'SCHEMA_LAYOUT'):
+        monkeypatch.setattr(db, name, getattr(db, name))
+
+    options = {}
+    if backend_name != 'mysql':
+        options['path'] = str(tmp_path / f"conformance_{schema_layout}.{backend_name}")
+    db.configure(backend_name, schema_layout, **options)
+
+
+@pytest.mark.parametrize('storage', STORAGES, indirect=True)
+@pytest.mark.parametrize('check', CHECKS, ids=lambda check: check.__name__)
+def test_conformance(storage, check):
+    # 검사 항목은 앞 항목이 만든 데이터를 이어서 사용하므로 대상 항목까지 순서대로 실행
+    for previous in CHECKS[:CHECKS.index(check)]:
+        previous()
+    check()